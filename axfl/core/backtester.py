@@ -9,6 +9,8 @@ from datetime import timedelta
 from .execution import apply_slippage, calculate_commission
 from .metrics import compute_metrics
 from .utils import compute_atr
+from ..ta.cache import cached_atr
+from ..strategies.base import format_notes
 from .sessions import pip_size
 from .risk import RiskManager, RiskRules
 
@@ -65,10 +67,15 @@ class Backtester:
             Tuple of (trades_df, equity_curve_df, metrics_dict)
         """
         # Prepare data (add indicators, etc.)
-        df = strategy.prepare(df)
+        prepared = strategy.prepare(df)
         
-        # Compute ATR for slippage model
-        df['ATR'] = compute_atr(df, period=14)
+        # Compute ATR for slippage model (reuses the strategy's ATR when it
+        # was derived from the same frame)
+        if prepared.index.equals(df.index):
+            prepared['ATR'] = cached_atr(df, period=14)
+        else:
+            prepared['ATR'] = compute_atr(prepared, period=14)
+        df = prepared
         
         # Reset state
         self.equity = self.initial_capital
@@ -275,7 +282,7 @@ class Backtester:
             'tp': self.position['tp'],
             'pnl': pnl,
             'r_multiple': r_multiple,
-            'notes': f"{self.position['notes']} | exit: {reason}"
+            'notes': f"{format_notes(self.position['notes'])} | exit: {reason}"
         }
         
         self.trades.append(trade)
@@ -0,0 +1,24 @@
+"""
+Optional Numba JIT support.
+
+Numerical kernels are decorated with ``njit`` from this module. When numba is
+installed they are compiled to machine code; otherwise the decorator is a
+no-op and the same kernels run as plain Python over NumPy arrays, so results
+are identical either way.
+"""
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator: return the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -3,6 +3,7 @@ FX trading session helpers and utilities.
 Handles session windows in UTC timezone.
 """
 from typing import Tuple
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -11,6 +12,9 @@ import pytz
 ASIA_RANGE = (0, 6, 59)  # 00:00 to 06:59 UTC
 LONDON_OPEN = (7, 0, 10, 0)  # 07:00 to 10:00 UTC
 
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_DAY = 24 * 60 * NS_PER_MINUTE
+
 
 def is_in_window(ts: pd.Timestamp, start_h: int, end_h: int) -> bool:
     """
@@ -84,6 +88,39 @@ def day_range(df: pd.DataFrame, start_h: int, end_h: int) -> pd.DataFrame:
     return result
 
 
+def index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Epoch nanoseconds for each timestamp as int64.
+    
+    Differences between entries are exact elapsed times, so window checks
+    can compare integers instead of Timedelta objects.
+    """
+    return index.values.astype('datetime64[ns]').view('i8')
+
+
+def utc_hours(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    UTC hour of each timestamp, matching is_in_window()'s conversion.
+    
+    Naive timestamps are treated as UTC.
+    """
+    if index.tz is not None:
+        index = index.tz_convert('UTC')
+    return np.asarray(index.hour, dtype=np.int64)
+
+
+def day_keys(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Integer day key per timestamp (days since epoch of the wall-clock date).
+    
+    Two timestamps share a key exactly when ``ts.date()`` is equal, without
+    creating Python date objects.
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index_ns(index) // NS_PER_DAY
+
+
 def pip_size(symbol: str) -> float:
     """
     Get pip size for a given symbol.
@@ -5,6 +5,44 @@ import pandas as pd
 import numpy as np
 from typing import Optional
 
+from .jit import njit
+
+
+@njit(cache=True)
+def _atr_nb(high: np.ndarray, low: np.ndarray, close: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    True range and its adjust=False EMA in a single pass.
+    
+    The true range skips NaN components like a row-wise max, and the EMA
+    follows pandas' ewm recurrence (including the decay of the old weight
+    across NaN gaps), so the result is bit-identical to the pandas version.
+    """
+    n = len(high)
+    out = np.empty(n)
+    prev_close = np.nan
+    weighted = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        tr = high[i] - low[i]
+        tr2 = abs(high[i] - prev_close)
+        tr3 = abs(low[i] - prev_close)
+        if tr2 == tr2 and not tr2 <= tr:
+            tr = tr2
+        if tr3 == tr3 and not tr3 <= tr:
+            tr = tr3
+        prev_close = close[i]
+        
+        if i == 0 or weighted != weighted:
+            weighted = tr
+        else:
+            old_wt *= 1.0 - alpha
+            if tr == tr:
+                if weighted != tr:
+                    weighted = (old_wt * weighted + alpha * tr) / (old_wt + alpha)
+                old_wt = 1.0
+        out[i] = weighted
+    return out
+
 
 def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
@@ -17,21 +55,14 @@ def compute_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         Series with ATR values
     """
-    high = df['High']
-    low = df['Low']
-    close = df['Close']
-    
-    # True Range calculation
-    tr1 = high - low
-    tr2 = abs(high - close.shift(1))
-    tr3 = abs(low - close.shift(1))
-    
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    close = df['Close'].to_numpy(dtype=np.float64)
     
-    # ATR is exponential moving average of TR
-    atr = tr.ewm(span=period, adjust=False).mean()
+    # ATR is exponential moving average of TR (span=period, adjust=False)
+    alpha = 1.0 / (1.0 + (period - 1) / 2.0)
     
-    return atr
+    return pd.Series(_atr_nb(high, low, close, alpha), index=df.index)
 
 
 def to_utc(df: pd.DataFrame) -> pd.DataFrame:
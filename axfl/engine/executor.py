@@ -1,8 +1,9 @@
 from __future__ import annotations
 import json, os
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
-from axfl.strategies.registry import REGISTRY
+from axfl.strategies.registry import get
 from axfl.strategies.utils import position_units_from_risk
 from .broker_sim import SimBroker
 from .broker_base import Order, Fill
@@ -61,8 +62,22 @@ def run_sim(
     risk_cfg: Optional[RiskConfig] = None,
 ):
     risk_cfg = risk_cfg or RiskConfig(risk_pct=risk_pct)
-    strategies = {n: REGISTRY[n]() for n in strat_names}
+    strategies = {n: get(n)() for n in strat_names}
     sigs = {n: s.generate(df).reindex(df.index) for n, s in strategies.items()}
+    # Each strategy's signals are generated once for the whole frame; the bar
+    # loop below only reads plain arrays. A bar is actionable when some
+    # strategy has a signal with both levels set.
+    sig_arrays = {}
+    actionable = np.zeros(len(df), dtype=bool)
+    for n, g in sigs.items():
+        side_arr = g["signal"].to_numpy(dtype=np.float64)
+        sl_arr = g["sl"].to_numpy(dtype=np.float64)
+        tp_arr = g["tp"].to_numpy(dtype=np.float64)
+        sig_arrays[n] = (side_arr, sl_arr, tp_arr)
+        actionable |= (side_arr != 0) & ~np.isnan(sl_arr) & ~np.isnan(tp_arr)
+    high = df["high"].to_numpy()
+    low = df["low"].to_numpy()
+    close = df["close"].to_numpy()
     spread_pips = float(os.environ.get("AXFL_SPREAD_PIPS","0.2"))
     slippage_pips = float(os.environ.get("AXFL_SLIPPAGE_PIPS","0.1"))
     broker = SimBroker(risk_dollars=balance*risk_pct, spread_pips=spread_pips, slippage_pips=slippage_pips)
@@ -72,10 +87,9 @@ def run_sim(
     open_positions = 0
 
     for i in range(2, len(df)):
-        row = df.iloc[i]
         # advance any open pos
         if broker.pos is not None:
-            newfills = broker.step_bar(row["high"], row["low"], row["close"])
+            newfills = broker.step_bar(high[i], low[i], close[i])
             if newfills:
                 for f in newfills:
                     eq_R += f.r_multiple
@@ -83,27 +97,31 @@ def run_sim(
             fills_all += newfills
             continue
 
+        # nothing to enter on this bar
+        if not actionable[i]:
+            continue
+
         # risk guard
         if not allow_entry(df, i, eq_R, open_positions, risk_cfg):
             continue
 
         for name in strat_names:
-            sig = sigs[name].iloc[i]
-            if sig["signal"] == 0 or pd.isna(sig["sl"]) or pd.isna(sig["tp"]):
+            side_arr, sl_arr, tp_arr = sig_arrays[name]
+            if side_arr[i] == 0 or np.isnan(sl_arr[i]) or np.isnan(tp_arr[i]):
                 continue
-            entry = float(row["close"]); sl = float(sig["sl"]); tp = float(sig["tp"])
+            entry = float(close[i]); sl = float(sl_arr[i]); tp = float(tp_arr[i])
             units = position_units_from_risk(balance=balance, risk_pct=risk_cfg.risk_pct,
                                              entry=entry, sl=sl, pip_value_per_unit=pip_value_per_unit)
             if units <= 0:
                 continue
-            side = int(sig["signal"])
+            side = int(side_arr[i])
             pos = broker.place(Order(side=side, units=units, entry=entry, sl=sl, tp=tp, tag=name))
             open_positions = 1
             if first_order_marker and first_order_line is None:
                 first_order_line = f"FIRST_ORDER id={pos.order_id} side={side} units={units} entry={entry:.5f} sl={sl:.5f} tp={tp:.5f} tag={name}"
             break
 
-        fills_all += broker.step_bar(row["high"], row["low"], row["close"])
+        fills_all += broker.step_bar(high[i], low[i], close[i])
         if fills_all and fills_all[-1].order_id:
             # update equity when fills happen
             pass
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
 
 @dataclass
@@ -10,9 +11,16 @@ class RiskConfig:
     atr_guard_len: int = 14
     atr_guard_min_pips: float = 3.0  # if ATR below this, skip entries (too quiet)
 
+def _pairwise_max(a: pd.Series, b: pd.Series) -> pd.Series:
+    # Element-wise builtin max(a, b): b only where it compares greater, so a
+    # NaN on the left is kept and a NaN on the right is ignored
+    return pd.Series(np.where(b.to_numpy() > a.to_numpy(), b.to_numpy(), a.to_numpy()), index=a.index)
+
 def atr(df: pd.DataFrame, n: int = 14) -> pd.Series:
     h, l, c = df["high"], df["low"], df["close"]
-    tr = (h - l).abs().combine((h - c.shift()).abs(), max).combine((l - c.shift()).abs(), max)
+    pc = c.shift()
+    tr = _pairwise_max((h - l).abs(), (h - pc).abs())
+    tr = _pairwise_max(tr, (l - pc).abs())
     return tr.rolling(n).mean()
 
 def allow_entry(df: pd.DataFrame, i: int, eq_R: float, open_positions: int, cfg: RiskConfig) -> bool:
@@ -15,6 +15,7 @@ from ..data.symbols import normalize, pip_size
 from ..core.execution import apply_costs
 from ..core.risk import RiskManager, RiskRules
 from ..config.defaults import resolve_params
+from ..strategies.base import format_notes
 
 
 class LivePaperEngine:
@@ -213,7 +214,7 @@ class LivePaperEngine:
             'pnl': pnl,
             'r_multiple': r_multiple,
             'reason': reason,
-            'notes': self.position['notes'],
+            'notes': format_notes(self.position['notes']),
         }
         self.trades.append(trade)
         
@@ -284,9 +284,9 @@ class PortfolioEngine:
                     base_params=params,
                 )
                 
-                # Override with shared warmup data
-                engine.df = warmup_data[symbol].copy()
-                engine.df = strategy.prepare(engine.df)
+                # Override with shared warmup data (prepare() never mutates its
+                # input, so engines share the frame and its cached indicators)
+                engine.df = strategy.prepare(warmup_data[symbol])
                 engine.strategy = strategy
                 engine.risk_manager = risk_manager
                 engine.first_bar_time = self.first_bar_time
@@ -1 +1 @@
-from .registry import REGISTRY
+from .registry import REGISTRY, get
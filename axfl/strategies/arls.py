@@ -13,7 +13,7 @@ from typing import List, Dict, Any
 
 from .base import Strategy
 from ..core.sessions import day_range, is_in_window
-from ..core.utils import compute_atr
+from ..ta.cache import cached_atr
 from ..data.symbols import pip_size
 
 
@@ -65,10 +65,11 @@ class ARLSStrategy(Strategy):
     
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add Asia range and ATR to the dataframe."""
-        df = df.copy()
+        # Compute ATR (shared with other strategies run on the same frame)
+        atr = cached_atr(df, period=14)
         
-        # Compute ATR
-        df['ATR'] = compute_atr(df, period=14)
+        df = df.copy()
+        df['ATR'] = atr
         
         # Get Asia range for each day (00:00 to 06:59 UTC)
         asia_ranges = day_range(df, start_h=0, end_h=6)
@@ -1,8 +1,20 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from typing import Any
 import pandas as pd
 
+def format_notes(notes: Any) -> str:
+    """
+    Render signal notes for trade records.
+    Strategies may emit (tag, field, pips) tuples instead of preformatted
+    strings so formatting only happens for trades that are actually recorded.
+    """
+    if isinstance(notes, tuple):
+        tag, field, pips = notes
+        return f"{tag}|{field}={pips:.1f}pips"
+    return notes
+
 @dataclass
 class OrderPlan:
     side: int          # +1 long, -1 short, 0 flat
@@ -5,6 +5,8 @@ from .utils import bbands, atr
 
 class BollingerMeanRev(Strategy):
     name = "bollinger_mean_rev"
+    # reason codes: 0 = no signal, 1 = long, 2 = short
+    REASONS = ["", "BB low breach", "BB upper breach"]
 
     def __init__(
         self, n:int=20, k:float=2.0,
@@ -57,37 +59,43 @@ class BollingerMeanRev(Strategy):
         return None
 
     def generate(self, df: pd.DataFrame, **_) -> pd.DataFrame:
-        out = df.copy()
-        ma, up, lo, width = bbands(out['close'], self.n, self.k)
-        out['ma'], out['up'], out['lo'], out['width'] = ma, up, lo, width
-        out['A'] = atr(out, self.atr_len)
+        close = df['close']
+        ma, up, lo, width = bbands(close, self.n, self.k)
+        A = atr(df, self.atr_len)
 
-        long_trig  = out['close'] < out['lo']
-        short_trig = out['close'] > out['up']
+        long_trig  = close < lo
+        short_trig = close > up
 
         # Kill when volatility is expanding fast (trend resuming)
-        band_expanding = out['width'] > out['width'].rolling(10).mean() * 1.25
+        band_expanding = width > width.rolling(10).mean() * 1.25
         long_trig  &= ~band_expanding
         short_trig &= ~band_expanding
 
         # Add width contraction filter for better entries
-        width_med = out['width'].rolling(20).median()
-        contract = out['width'] <= width_med * 1.10
+        width_med = width.rolling(20).median()
+        contract = width <= width_med * 1.10
         long_trig &= contract
         short_trig &= contract
 
-        out['signal'] = 0
-        out.loc[long_trig, 'signal']  = 1
-        out.loc[short_trig, 'signal'] = -1
-
-        out['sl'] = np.where(out['signal']==1, out['close'] - self.sl_atr*out['A'],
-                       np.where(out['signal']==-1, out['close'] + self.sl_atr*out['A'], np.nan))
+        # Assemble outputs in one pass from the signed direction (+1/-1/0)
+        sig = np.zeros(len(df), dtype=np.int8)
+        sig[long_trig.to_numpy()] = 1
+        sig[short_trig.to_numpy()] = -1
+        direction = sig.astype(np.float64)
+        flat = sig == 0
+        c = close.to_numpy(dtype=np.float64)
+        a = A.to_numpy(dtype=np.float64)
+        sl_px = c - direction*self.sl_atr*a
         if self.tp_to_mid:
-            out['tp'] = np.where(out['signal']!=0, out['ma'], np.nan)
+            tp_px = ma.to_numpy(dtype=np.float64, copy=True)
         else:
-            out['tp'] = np.where(out['signal']==1, out['close'] + 1.8*out['A'],
-                           np.where(out['signal']==-1, out['close'] - 1.8*out['A'], np.nan))
-        out['units'] = np.nan
-        out['reason'] = np.where(out['signal']==1, "BB low breach",
-                          np.where(out['signal']==-1, "BB upper breach", ""))
-        return out[['signal','sl','tp','units','reason']]
+            tp_px = c + direction*1.8*a
+        sl_px[flat] = np.nan
+        tp_px[flat] = np.nan
+        reason = np.zeros(len(df), dtype=np.int8)
+        reason[sig==1] = 1
+        reason[sig==-1] = 2
+        # units are left to the sizer; reason is categorical (1 byte per row)
+        return pd.DataFrame({'signal': sig, 'sl': sl_px, 'tp': tp_px,
+                             'units': np.nan,
+                             'reason': pd.Categorical.from_codes(reason, self.REASONS)}, index=df.index)
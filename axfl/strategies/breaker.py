@@ -8,12 +8,154 @@ import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 
 from .base import Strategy
-from ..ta.structure import swings, in_zone
-from ..core.sessions import is_in_window
-from ..core.utils import compute_atr
+from ..ta.cache import cached_atr, cached_swing_arrays
+from ..core.sessions import index_ns, utc_hours, day_keys, NS_PER_MINUTE
+from ..core.jit import njit
 from ..data.symbols import pip_size
 
 
+# Zone bookkeeping for the compiled scan
+ZONE_LOOKBACK_BARS = 50
+SUPPORT = 0
+RESISTANCE = 1
+BREAK_DOWN = -1
+BREAK_UP = 1
+NO_DAY = np.iinfo(np.int64).min
+
+# London session (07:00-16:00 UTC)
+SESSION_START_H = 7
+SESSION_END_H = 16
+
+
+@njit(cache=True)
+def _zone_break_levels(n_zones, zone_lo, zone_hi, zone_type):
+    """
+    Reduce the zone arrays to the two levels that decide whether any zone
+    breaks: highest support low and lowest resistance high.
+    """
+    support_lo_max = -np.inf
+    resistance_hi_min = np.inf
+    for z in range(n_zones):
+        if zone_type[z] == SUPPORT:
+            support_lo_max = max(support_lo_max, zone_lo[z])
+        else:
+            resistance_hi_min = min(resistance_hi_min, zone_hi[z])
+    return support_lo_max, resistance_hi_min
+
+
+@njit(cache=True)
+def _breaker_scan(start, stop, open_, high, low, close, ts_ns, day_key, hour,
+                  swing_high, swing_low, inv_pip, min_zone_height_pips, buffer,
+                  retest_window_ns, tp1_r,
+                  cur_day, n_zones, zone_lo, zone_hi, zone_type,
+                  bz_dir, bz_lo, bz_hi, bz_ns, entry_taken):
+    """
+    Run the breaker state machine over bars [start, stop).
+    
+    Stops right after the first entry bar. Zone arrays are updated in place;
+    the remaining state is returned as scalars so the caller can resume.
+    Per-bar events (offset from start) drive the debug counters.
+    """
+    m = stop - start
+    ev_zones = np.full(m, -1, np.int64)
+    ev_break = np.zeros(m, np.int8)
+    ev_retest = np.zeros(m, np.bool_)
+    ev_side = np.zeros(m, np.int8)
+    ev_sl = np.full(m, np.nan)
+    ev_tp = np.full(m, np.nan)
+    end = stop
+    support_lo_max, resistance_hi_min = _zone_break_levels(n_zones, zone_lo, zone_hi, zone_type)
+    
+    for i in range(start, stop):
+        k = i - start
+        
+        # Initialize state for new day: find swing zones from recent history
+        if day_key[i] != cur_day:
+            cur_day = day_key[i]
+            bz_dir = 0
+            entry_taken = False
+            n_zones = 0
+            for j in range(max(0, i - ZONE_LOOKBACK_BARS), i):
+                if not (swing_high[j] or swing_low[j]):
+                    continue
+                # Written as not (>=) so NaN heights are rejected too
+                if not ((high[j] - low[j]) * inv_pip >= min_zone_height_pips):
+                    continue
+                if swing_high[j]:
+                    zone_lo[n_zones] = low[j]
+                    zone_hi[n_zones] = high[j]
+                    zone_type[n_zones] = RESISTANCE
+                    n_zones += 1
+                if swing_low[j]:
+                    zone_lo[n_zones] = low[j]
+                    zone_hi[n_zones] = high[j]
+                    zone_type[n_zones] = SUPPORT
+                    n_zones += 1
+            support_lo_max, resistance_hi_min = _zone_break_levels(n_zones, zone_lo, zone_hi, zone_type)
+            ev_zones[k] = n_zones
+        
+        # Only trade during London session
+        if hour[i] < SESSION_START_H or hour[i] > SESSION_END_H:
+            continue
+        
+        # Skip if already entered
+        if entry_taken:
+            continue
+        
+        if bz_dir == 0:
+            # O(1) test against the reduced levels; scan zones only on a break
+            if n_zones == 0 or resistance_hi_min >= close[i] >= support_lo_max:
+                continue
+            
+            # First matching zone wins
+            for z in range(n_zones):
+                if zone_type[z] == SUPPORT and close[i] < zone_lo[z]:
+                    bz_dir = BREAK_DOWN
+                elif zone_type[z] == RESISTANCE and close[i] > zone_hi[z]:
+                    bz_dir = BREAK_UP
+                else:
+                    continue
+                bz_lo = zone_lo[z]
+                bz_hi = zone_hi[z]
+                bz_ns = ts_ns[i]
+                n_zones = 0
+                ev_break[k] = bz_dir
+                break
+        else:
+            # Reset if retest window expired
+            if ts_ns[i] - bz_ns > retest_window_ns:
+                bz_dir = 0
+                continue
+            
+            if bz_dir == BREAK_DOWN:
+                # Broken support retested from below -> SHORT on bearish rejection
+                if bz_lo <= high[i] <= bz_hi:
+                    ev_retest[k] = True
+                    if close[i] < open_[i] and close[i] < bz_lo:
+                        sl = bz_hi + buffer
+                        ev_side[k] = -1
+                        ev_sl[k] = sl
+                        ev_tp[k] = close[i] - ((sl - close[i]) * tp1_r)
+            else:
+                # Broken resistance retested from above -> LONG on bullish rejection
+                if bz_lo <= low[i] <= bz_hi:
+                    ev_retest[k] = True
+                    if close[i] > open_[i] and close[i] > bz_hi:
+                        sl = bz_lo - buffer
+                        ev_side[k] = 1
+                        ev_sl[k] = sl
+                        ev_tp[k] = close[i] + ((close[i] - sl) * tp1_r)
+            
+            if ev_side[k] != 0:
+                entry_taken = True
+                end = i + 1
+                break
+    
+    m = end - start
+    return (end, ev_zones[:m], ev_break[:m], ev_retest[:m], ev_side[:m], ev_sl[:m], ev_tp[:m],
+            cur_day, n_zones, bz_dir, bz_lo, bz_hi, bz_ns, entry_taken)
+
+
 class BreakerStrategy(Strategy):
     """Breaker block strategy implementation."""
     
@@ -48,6 +190,9 @@ class BreakerStrategy(Strategy):
         self.move_be_at = params.get('move_be_at', 1.0)
         
         self.pip = pip_size(symbol)
+        self._inv_pip = 1.0 / self.pip
+        self._buffer = self.buffer_pips * self.pip
+        self._retest_window_ns = self.retest_window_m * NS_PER_MINUTE
         
         # Debug counters
         self.debug = {
@@ -61,169 +206,152 @@ class BreakerStrategy(Strategy):
         }
     
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Store df reference and add swing analysis."""
-        self._df = df.copy()
+        """Store df reference and cache swing analysis as arrays."""
+        self._df = df
         
-        # Compute ATR
-        self._df['ATR'] = compute_atr(self._df, period=14)
+        # Derived series live as ndarrays; the hot path reads these directly
+        self._open = df['Open'].to_numpy(dtype=np.float64)
+        self._high = df['High'].to_numpy(dtype=np.float64)
+        self._low = df['Low'].to_numpy(dtype=np.float64)
+        self._close = df['Close'].to_numpy(dtype=np.float64)
+        self._atr = cached_atr(df, period=14)
+        self._swing_high, self._swing_low = cached_swing_arrays(df, lookback=self.lookback)
+        self._ts_ns = index_ns(df.index)
+        self._day_key = day_keys(df.index)
+        self._hour = utc_hours(df.index)
         
-        # Identify swings
-        self._df = swings(self._df, lookback=self.lookback)
+        # Shallow copy so appended columns never touch the caller's frame
+        out = df.copy(deep=False)
+        out['ATR'] = self._atr
+        out['swing_high'] = self._swing_high
+        out['swing_low'] = self._swing_low
         
         # Add date for daily tracking
-        self._df['date'] = self._df.index.date
+        out['date'] = out.index.date
         
-        return self._df
+        return out
     
-    def _find_recent_swing_zones(self, i: int, lookback_bars: int = 50) -> List[Tuple[float, float, str]]:
+    def _scan(self, data: Tuple, start: int, stop: int, scan_state: Tuple) -> Tuple:
+        """Run the compiled state machine on a private copy of scan_state."""
+        (cur_day, n_zones, zone_lo, zone_hi, zone_type,
+         bz_dir, bz_lo, bz_hi, bz_ns, entry_taken) = scan_state
+        zone_lo, zone_hi, zone_type = zone_lo.copy(), zone_hi.copy(), zone_type.copy()
+        
+        result = _breaker_scan(
+            start, stop, *data,
+            self._inv_pip, float(self.min_zone_height_pips), self._buffer,
+            self._retest_window_ns, float(self.tp1_r),
+            cur_day, n_zones, zone_lo, zone_hi, zone_type,
+            bz_dir, bz_lo, bz_hi, bz_ns, entry_taken,
+        )
+        end, events, scalars = result[0], result[1:7], result[7:]
+        cur_day, n_zones, bz_dir, bz_lo, bz_hi, bz_ns, entry_taken = scalars
+        state_out = (cur_day, n_zones, zone_lo, zone_hi, zone_type,
+                     bz_dir, bz_lo, bz_hi, bz_ns, entry_taken)
+        return end, events, state_out
+    
+    def _bar_data(self, i: int, row: pd.Series) -> Tuple[Tuple, int]:
         """
-        Find recent swing high/low zones.
+        Scan inputs covering bar i, and the offset of bar i in them.
         
-        Returns:
-            List of (zone_low, zone_high, zone_type) tuples
-            zone_type: 'resistance' or 'support'
+        Read from the arrays cached by prepare(); a bar appended after the
+        last prepare() falls back to the row itself, behind the prepared bars
+        still inside its zone lookback (appended bars have no swings yet).
         """
-        zones = []
-        start_i = max(0, i - lookback_bars)
+        data = (self._open, self._high, self._low, self._close, self._ts_ns,
+                self._day_key, self._hour, self._swing_high, self._swing_low)
+        n = len(self._close)
+        if i < n:
+            return data, i
         
-        for j in range(start_i, i):
-            row = self._df.iloc[j]
-            
-            # Swing high = resistance zone
-            if row.get('swing_high', False):
-                zone_low = row['Low']
-                zone_high = row['High']
-                zone_height = (zone_high - zone_low) / self.pip
-                
-                if zone_height >= self.min_zone_height_pips:
-                    zones.append((zone_low, zone_high, 'resistance'))
-            
-            # Swing low = support zone
-            if row.get('swing_low', False):
-                zone_low = row['Low']
-                zone_high = row['High']
-                zone_height = (zone_high - zone_low) / self.pip
-                
-                if zone_height >= self.min_zone_height_pips:
-                    zones.append((zone_low, zone_high, 'support'))
-        
-        return zones
+        lo = min(max(0, i - ZONE_LOOKBACK_BARS), n)
+        idx = pd.DatetimeIndex([row.name])
+        last = (row['Open'], row['High'], row['Low'], row['Close'], index_ns(idx),
+                day_keys(idx), utc_hours(idx), False, False)
+        return tuple(np.append(arr[lo:], v) for arr, v in zip(data, last)), n - lo
+    
+    def _start_run(self, i: int, row: pd.Series, state: Dict) -> Dict:
+        """
+        Scan forward from bar i, resuming from the state after the last
+        bar this strategy was actually called on.
+        """
+        run = state.get('run')
+        last_i = state.get('last_i')
+        
+        if run is None or last_i is None:
+            scan_state = (NO_DAY, 0,
+                          np.empty(2 * ZONE_LOOKBACK_BARS), np.empty(2 * ZONE_LOOKBACK_BARS),
+                          np.empty(2 * ZONE_LOOKBACK_BARS, dtype=np.int8),
+                          0, np.nan, np.nan, 0, False)
+        elif last_i == run['end'] - 1:
+            scan_state = run['state_out']
+        else:
+            # Calls stopped partway through the cached run (e.g. position open)
+            base = run['base']
+            _, _, scan_state = self._scan(run['data'], run['start'] - base, last_i + 1 - base,
+                                          run['state_in'])
+        
+        # base: bar index of element 0 of the scan inputs
+        data, k = self._bar_data(i, row)
+        end, events, state_out = self._scan(data, k, len(data[3]), scan_state)
+        
+        run = {
+            'data': data,
+            'base': i - k,
+            'start': i,
+            'end': end + i - k,
+            'events': events,
+            'state_in': scan_state,
+            'state_out': state_out,
+        }
+        state['run'] = run
+        return run
     
     def generate_signals(self, i: int, row: pd.Series, state: Dict) -> List[Dict]:
         """
         Generate breaker signals.
         
+        The state machine (daily zone tracking, break, retest window, entry)
+        runs in a compiled scan from the current bar to the next entry; later
+        calls read the cached per-bar events while they stay contiguous. Bars
+        appended after the last prepare() are scanned one at a time from row.
+        
         State tracking:
-        - current_date: date being processed
-        - tracked_zones: List of active zones waiting for break/retest
-        - broken_zone: (zone_low, zone_high, break_direction, break_time)
-        - entry_taken: bool
+        - run: cached scan (start/end bars, events, state before/after)
+        - last_i: last bar index this method was called for
         """
         signals = []
         
-        # Extract data
-        current_time = row.name
-        date = current_time.date()
+        run = state.get('run')
+        if (run is None or run['data'][3] is not self._close
+                or i != state.get('last_i', -2) + 1 or not run['start'] <= i < run['end']):
+            run = self._start_run(i, row, state)
+        state['last_i'] = i
         
-        # Initialize state for new day
-        if state.get('current_date') != date:
-            state['current_date'] = date
-            state['tracked_zones'] = []
-            state['broken_zone'] = None
-            state['entry_taken'] = False
-            
-            # Find swing zones from recent history
-            zones = self._find_recent_swing_zones(i)
-            state['tracked_zones'] = zones
-            self.debug['zones_tracked'] += len(zones)
+        k = i - run['start']
+        ev_zones, ev_break, ev_retest, ev_side, ev_sl, ev_tp = run['events']
         
-        # Only trade during London session (07:00-16:00 UTC)
-        if not is_in_window(current_time, 7, 16):
-            return signals
+        if ev_zones[k] >= 0:
+            self.debug['zones_tracked'] += int(ev_zones[k])
+        if ev_break[k] == BREAK_DOWN:
+            self.debug['zones_broken_down'] += 1
+        elif ev_break[k] == BREAK_UP:
+            self.debug['zones_broken_up'] += 1
+        if ev_retest[k]:
+            self.debug['retests'] += 1
         
-        # Skip if already entered
-        if state.get('entry_taken'):
-            return signals
-        
-        # Check for zone breaks
-        if state.get('broken_zone') is None and state.get('tracked_zones'):
-            for zone_low, zone_high, zone_type in state['tracked_zones']:
-                
-                # Support broken downward (becomes resistance)
-                if zone_type == 'support' and row['Close'] < zone_low:
-                    state['broken_zone'] = (zone_low, zone_high, 'down', current_time)
-                    state['tracked_zones'] = []  # Clear tracked zones
-                    self.debug['zones_broken_down'] += 1
-                    break
-                
-                # Resistance broken upward (becomes support)
-                elif zone_type == 'resistance' and row['Close'] > zone_high:
-                    state['broken_zone'] = (zone_low, zone_high, 'up', current_time)
-                    state['tracked_zones'] = []  # Clear tracked zones
-                    self.debug['zones_broken_up'] += 1
-                    break
-        
-        # Check for retest and entry after break
-        elif state.get('broken_zone') is not None:
-            zone_low, zone_high, break_dir, break_time = state['broken_zone']
-            
-            # Check if still within retest window
-            time_since_break = (current_time - break_time).total_seconds() / 60.0
-            if time_since_break > self.retest_window_m:
-                # Reset if window expired
-                state['broken_zone'] = None
-                return signals
-            
-            # Broken support (now resistance) -> SHORT on retest
-            if break_dir == 'down':
-                # Check if price retested the zone from below
-                if in_zone(row['High'], zone_low, zone_high):
-                    self.debug['retests'] += 1
-                    
-                    # Look for bearish rejection (close < open and below zone)
-                    if row['Close'] < row['Open'] and row['Close'] < zone_low:
-                        # Enter SHORT
-                        sl = zone_high + (self.buffer_pips * self.pip)
-                        entry = row['Close']
-                        risk = sl - entry
-                        tp1 = entry - (risk * self.tp1_r)
-                        
-                        signals.append({
-                            'action': 'open',
-                            'side': 'short',
-                            'price': entry,
-                            'sl': sl,
-                            'tp': tp1,
-                            'notes': f'BREAKER_short|zone_height={(zone_high-zone_low)/self.pip:.1f}pips'
-                        })
-                        
-                        state['entry_taken'] = True
-                        self.debug['entries_short'] += 1
-            
-            # Broken resistance (now support) -> LONG on retest
-            elif break_dir == 'up':
-                # Check if price retested the zone from above
-                if in_zone(row['Low'], zone_low, zone_high):
-                    self.debug['retests'] += 1
-                    
-                    # Look for bullish rejection (close > open and above zone)
-                    if row['Close'] > row['Open'] and row['Close'] > zone_high:
-                        # Enter LONG
-                        sl = zone_low - (self.buffer_pips * self.pip)
-                        entry = row['Close']
-                        risk = entry - sl
-                        tp1 = entry + (risk * self.tp1_r)
-                        
-                        signals.append({
-                            'action': 'open',
-                            'side': 'long',
-                            'price': entry,
-                            'sl': sl,
-                            'tp': tp1,
-                            'notes': f'BREAKER_long|zone_height={(zone_high-zone_low)/self.pip:.1f}pips'
-                        })
-                        
-                        state['entry_taken'] = True
-                        self.debug['entries_long'] += 1
+        side = ev_side[k]
+        if side != 0:
+            bz_lo, bz_hi = run['state_out'][6], run['state_out'][7]
+            label = 'long' if side == 1 else 'short'
+            signals.append({
+                'action': 'open',
+                'side': label,
+                'price': run['data'][3][i - run['base']],
+                'sl': ev_sl[k],
+                'tp': ev_tp[k],
+                'notes': (f'BREAKER_{label}', 'zone_height', (bz_hi - bz_lo) * self._inv_pip),
+            })
+            self.debug[f'entries_{label}'] += 1
         
         return signals
@@ -8,9 +8,9 @@ import numpy as np
 from typing import List, Dict, Any
 
 from .base import Strategy
-from ..ta.structure import swings, map_structure, tag_order_block, in_zone
-from ..core.sessions import is_in_window
-from ..core.utils import compute_atr
+from ..ta.structure import map_structure, tag_order_block, in_zone, ohlc_arrays
+from ..ta.cache import cached_atr, cached_swing_arrays
+from ..core.sessions import is_in_window, index_ns, NS_PER_MINUTE
 from ..data.symbols import pip_size
 
 
@@ -50,6 +50,9 @@ class CHOCHOBStrategy(Strategy):
         self.move_be_at = params.get('move_be_at', 1.0)
         
         self.pip = pip_size(symbol)
+        self._inv_pip = 1.0 / self.pip
+        self._buffer = self.buffer_pips * self.pip
+        self._retest_window_ns = self.retest_window_m * NS_PER_MINUTE
         
         # Debug counters
         self.debug = {
@@ -64,22 +67,23 @@ class CHOCHOBStrategy(Strategy):
         }
     
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add structure analysis to dataframe."""
-        df = df.copy()
-        
-        # Compute ATR
-        df['ATR'] = compute_atr(df, period=14)
+        """Store df reference and add structure analysis."""
+        self._df = df
+        self._ohlc = ohlc_arrays(df)
         
-        # Identify swings
-        df = swings(df, lookback=self.lookback)
+        # ATR and swings are shared with other strategies run on the same frame
+        self._atr = cached_atr(df, period=14)
+        self._ts_ns = index_ns(df.index)
         
-        # Map market structure
-        df = map_structure(df)
+        # Identify swings, then map market structure
+        swing_high, swing_low = cached_swing_arrays(df, lookback=self.lookback)
+        out = map_structure(df.assign(swing_high=swing_high, swing_low=swing_low))
+        out['ATR'] = self._atr
         
         # Add date for daily tracking
-        df['date'] = df.index.date
+        out['date'] = out.index.date
         
-        return df
+        return out
     
     def generate_signals(self, i: int, row: pd.Series, state: Dict) -> List[Dict]:
         """
@@ -88,7 +92,7 @@ class CHOCHOBStrategy(Strategy):
         State tracking:
         - current_date: date being processed
         - choch_detected: 'up' or 'down' or None
-        - choch_time: timestamp of CHOCH
+        - choch_ns: epoch nanoseconds of the CHOCH bar
         - ob_low, ob_high, ob_mid: order block levels
         - retest_confirmed: bool
         - entry_taken: bool
@@ -103,7 +107,7 @@ class CHOCHOBStrategy(Strategy):
         if state.get('current_date') != date:
             state['current_date'] = date
             state['choch_detected'] = None
-            state['choch_time'] = None
+            state['choch_ns'] = None
             state['ob_low'] = None
             state['ob_high'] = None
             state['ob_mid'] = None
@@ -126,16 +130,17 @@ class CHOCHOBStrategy(Strategy):
                 
                 # Tag the bullish order block
                 ob_low, ob_high, ob_mid = tag_order_block(
-                    self._df, i, 'bullish', use_body=self.confirm_with_body
+                    self._df, i, 'bullish', use_body=self.confirm_with_body,
+                    ohlc=self._ohlc
                 )
                 
                 if ob_low is not None and ob_high is not None:
-                    ob_height = (ob_high - ob_low) / self.pip
+                    ob_height = (ob_high - ob_low) * self._inv_pip
                     
                     # Check minimum height
                     if ob_height >= self.min_ob_height_pips:
                         state['choch_detected'] = 'up'
-                        state['choch_time'] = current_time
+                        state['choch_ns'] = self._ts_ns[i]
                         state['ob_low'] = ob_low
                         state['ob_high'] = ob_high
                         state['ob_mid'] = ob_mid
@@ -147,16 +152,17 @@ class CHOCHOBStrategy(Strategy):
                 
                 # Tag the bearish order block
                 ob_low, ob_high, ob_mid = tag_order_block(
-                    self._df, i, 'bearish', use_body=self.confirm_with_body
+                    self._df, i, 'bearish', use_body=self.confirm_with_body,
+                    ohlc=self._ohlc
                 )
                 
                 if ob_low is not None and ob_high is not None:
-                    ob_height = (ob_high - ob_low) / self.pip
+                    ob_height = (ob_high - ob_low) * self._inv_pip
                     
                     # Check minimum height
                     if ob_height >= self.min_ob_height_pips:
                         state['choch_detected'] = 'down'
-                        state['choch_time'] = current_time
+                        state['choch_ns'] = self._ts_ns[i]
                         state['ob_low'] = ob_low
                         state['ob_high'] = ob_high
                         state['ob_mid'] = ob_mid
@@ -165,13 +171,12 @@ class CHOCHOBStrategy(Strategy):
         # Check for retest and entry
         elif state.get('choch_detected') is not None and not state.get('retest_confirmed'):
             choch_dir = state['choch_detected']
-            choch_time = state['choch_time']
+            choch_ns = state['choch_ns']
             ob_low = state['ob_low']
             ob_high = state['ob_high']
             
             # Check if still within retest window
-            time_since_choch = (current_time - choch_time).total_seconds() / 60.0
-            if time_since_choch > self.retest_window_m:
+            if self._ts_ns[i] - choch_ns > self._retest_window_ns:
                 # Reset if window expired
                 state['choch_detected'] = None
                 return signals
@@ -188,7 +193,7 @@ class CHOCHOBStrategy(Strategy):
                         state['retest_confirmed'] = True
                         
                         # Enter LONG
-                        sl = ob_low - (self.buffer_pips * self.pip)
+                        sl = ob_low - self._buffer
                         entry = row['Close']
                         risk = entry - sl
                         tp1 = entry + (risk * self.tp1_r)
@@ -199,7 +204,7 @@ class CHOCHOBStrategy(Strategy):
                             'price': entry,
                             'sl': sl,
                             'tp': tp1,
-                            'notes': f'CHOCH_OB_long|ob_height={(ob_high-ob_low)/self.pip:.1f}pips'
+                            'notes': ('CHOCH_OB_long', 'ob_height', (ob_high - ob_low) * self._inv_pip),
                         })
                         
                         state['entry_taken'] = True
@@ -217,7 +222,7 @@ class CHOCHOBStrategy(Strategy):
                         state['retest_confirmed'] = True
                         
                         # Enter SHORT
-                        sl = ob_high + (self.buffer_pips * self.pip)
+                        sl = ob_high + self._buffer
                         entry = row['Close']
                         risk = sl - entry
                         tp1 = entry - (risk * self.tp1_r)
@@ -228,28 +233,10 @@ class CHOCHOBStrategy(Strategy):
                             'price': entry,
                             'sl': sl,
                             'tp': tp1,
-                            'notes': f'CHOCH_OB_short|ob_height={(ob_high-ob_low)/self.pip:.1f}pips'
+                            'notes': ('CHOCH_OB_short', 'ob_height', (ob_high - ob_low) * self._inv_pip),
                         })
                         
                         state['entry_taken'] = True
                         self.debug['entries_short'] += 1
         
         return signals
-    
-    def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Store df reference and add structure analysis."""
-        self._df = df.copy()
-        
-        # Compute ATR
-        self._df['ATR'] = compute_atr(self._df, period=14)
-        
-        # Identify swings
-        self._df = swings(self._df, lookback=self.lookback)
-        
-        # Map market structure
-        self._df = map_structure(self._df)
-        
-        # Add date for daily tracking
-        self._df['date'] = self._df.index.date
-        
-        return self._df
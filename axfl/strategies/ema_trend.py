@@ -1,10 +1,12 @@
 from __future__ import annotations
 import numpy as np, pandas as pd
 from .base import Strategy, OrderPlan
-from .utils import ema, atr
+from .utils import atr, span_alpha, two_emas
 
 class EmaTrend(Strategy):
     name = "ema_trend"
+    # reason codes: 0 = no signal, 1 = long, 2 = short
+    REASONS = ["", "EMA bull cross+PB", "EMA bear cross+PB"]
 
     def __init__(
         self,
@@ -18,14 +20,19 @@ class EmaTrend(Strategy):
         self.atr_len, self.sl_atr, self.tp_atr = atr_len, sl_atr, tp_atr
         self.slope_pips = slope_pips
         self.slope_lookback = slope_lookback
+        # Per-instance constants, computed once instead of on every call
+        self._kf, self._ks = span_alpha(fast), span_alpha(slow)
+        self._slope_thr = slope_pips * 1e-4
+        self._inv_pip = 1e4
 
     def signal(self, df: pd.DataFrame) -> OrderPlan | None:
         """M3-compatible signal method"""
         if len(df) < max(self.fast, self.slow, self.atr_len, self.pullback, self.slope_lookback+1):
             return None
 
-        ema_f = ema(df['close'], self.fast)
-        ema_s = ema(df['close'], self.slow)
+        ef, es = two_emas(df['close'].to_numpy(dtype=np.float64), self._kf, self._ks)
+        ema_f = pd.Series(ef, index=df.index)
+        ema_s = pd.Series(es, index=df.index)
         a_val = atr(df, self.atr_len).iloc[-1]
 
         # Crossover detection
@@ -37,49 +44,60 @@ class EmaTrend(Strategy):
         pb_short = (df['close'].iloc[-self.pullback:].max() >= ema_f.iloc[-self.pullback:].min())
 
         # Slope filter
-        slope_thr = self.slope_pips * 0.0001
         ema_slope = abs(ema_f.iloc[-1] - ema_f.iloc[-1-self.slope_lookback])
-        ema_slope_ok = ema_slope > slope_thr
+        ema_slope_ok = ema_slope > self._slope_thr
 
         if cross_up and pb_long and ema_slope_ok:
-            sl_pips = (self.sl_atr * a_val) / 0.0001
-            tp_pips = (self.tp_atr * a_val) / 0.0001
+            sl_pips = (self.sl_atr * a_val) * self._inv_pip
+            tp_pips = (self.tp_atr * a_val) * self._inv_pip
             return OrderPlan(side=1, sl_pips=sl_pips, tp_pips=tp_pips, tag="EMA_bull_cross")
         elif cross_down and pb_short and ema_slope_ok:
-            sl_pips = (self.sl_atr * a_val) / 0.0001
-            tp_pips = (self.tp_atr * a_val) / 0.0001
+            sl_pips = (self.sl_atr * a_val) * self._inv_pip
+            tp_pips = (self.tp_atr * a_val) * self._inv_pip
             return OrderPlan(side=-1, sl_pips=sl_pips, tp_pips=tp_pips, tag="EMA_bear_cross")
 
         return None
 
     def generate(self, df: pd.DataFrame, **_) -> pd.DataFrame:
-        out = df.copy()
-        out['ema_f'] = ema(out['close'], self.fast)
-        out['ema_s'] = ema(out['close'], self.slow)
-        out['A'] = atr(out, self.atr_len)
-
-        cross_up   = (out['ema_f'].shift(1) <= out['ema_s'].shift(1)) & (out['ema_f'] > out['ema_s'])
-        cross_down = (out['ema_f'].shift(1) >= out['ema_s'].shift(1)) & (out['ema_f'] < out['ema_s'])
-
-        pb_long  = (out['close'].rolling(self.pullback).min() <= out['ema_f'].rolling(self.pullback).max())
-        pb_short = (out['close'].rolling(self.pullback).max() >= out['ema_f'].rolling(self.pullback).min())
-
-        slope_thr = self.slope_pips * 0.0001
-        ema_slope = (out['ema_f'] - out['ema_f'].shift(self.slope_lookback)).abs()
-        ema_slope_ok = ema_slope > slope_thr
-
-        long_trig  = cross_up & pb_long & ema_slope_ok
-        short_trig = cross_down & pb_short & ema_slope_ok
-
-        out['signal'] = 0
-        out.loc[long_trig, 'signal'] = 1
-        out.loc[short_trig, 'signal'] = -1
-
-        out['sl'] = np.where(out['signal']==1, out['close'] - self.sl_atr*out['A'],
-                       np.where(out['signal']==-1, out['close'] + self.sl_atr*out['A'], np.nan))
-        out['tp'] = np.where(out['signal']==1, out['close'] + self.tp_atr*out['A'],
-                       np.where(out['signal']==-1, out['close'] - self.tp_atr*out['A'], np.nan))
-        out['units'] = np.nan
-        out['reason'] = np.where(out['signal']==1, "EMA bull cross+PB",
-                          np.where(out['signal']==-1, "EMA bear cross+PB", ""))
-        return out[['signal','sl','tp','units','reason']]
+        # Both EMAs in one pass over close
+        close = df['close']
+        ef, es = two_emas(close.to_numpy(dtype=np.float64), self._kf, self._ks)
+        ema_f = pd.Series(ef, index=df.index)
+        ema_s = pd.Series(es, index=df.index)
+
+        cross_up   = (ema_f.shift(1) <= ema_s.shift(1)) & (ema_f > ema_s)
+        cross_down = (ema_f.shift(1) >= ema_s.shift(1)) & (ema_f < ema_s)
+
+        pb_long  = (close.rolling(self.pullback).min() <= ema_f.rolling(self.pullback).max())
+        pb_short = (close.rolling(self.pullback).max() >= ema_f.rolling(self.pullback).min())
+
+        ema_slope = (ema_f - ema_f.shift(self.slope_lookback)).abs()
+        ema_slope_ok = ema_slope > self._slope_thr
+
+        long_trig  = (cross_up & pb_long & ema_slope_ok).to_numpy()
+        short_trig = (cross_down & pb_short & ema_slope_ok).to_numpy()
+
+        # Triggers are sparse: preallocate outputs and fill only trigger rows
+        n = len(df)
+        sig = np.zeros(n, dtype=np.int8)
+        sl = np.full(n, np.nan)
+        tp = np.full(n, np.nan)
+        reason = np.zeros(n, dtype=np.int8)
+        idx_l = np.flatnonzero(long_trig)
+        idx_s = np.flatnonzero(short_trig)
+
+        c = close.to_numpy(dtype=np.float64)
+        A = atr(df, self.atr_len).to_numpy()
+        sig[idx_l] = 1
+        sl[idx_l] = c[idx_l] - self.sl_atr*A[idx_l]
+        tp[idx_l] = c[idx_l] + self.tp_atr*A[idx_l]
+        reason[idx_l] = 1
+        sig[idx_s] = -1
+        sl[idx_s] = c[idx_s] + self.sl_atr*A[idx_s]
+        tp[idx_s] = c[idx_s] - self.tp_atr*A[idx_s]
+        reason[idx_s] = 2
+
+        # units are left to the sizer; reason is categorical (1 byte per row)
+        return pd.DataFrame({'signal': sig, 'sl': sl, 'tp': tp,
+                             'reason': pd.Categorical.from_codes(reason, self.REASONS)},
+                            index=df.index)
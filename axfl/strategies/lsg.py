@@ -8,11 +8,242 @@ import numpy as np
 from typing import List, Dict, Any, Tuple
 
 from .base import Strategy
-from ..core.sessions import is_in_window, day_range
-from ..core.utils import compute_atr
+from ..core.jit import njit
+from ..core.sessions import day_range, day_keys, utc_hours, index_ns, NS_PER_MINUTE
+from ..ta.cache import cached_atr, cached_swing_arrays
 from ..data.symbols import pip_size
 
 
+@njit(cache=True)
+def _find_cluster_nb(sorted_vals, tol, min_count):
+    """
+    Locate the largest run of sorted values spanning at most tol.
+    
+    Single sliding-window pass: any value too far above the window start is
+    also too far above every earlier start, so the left edge only moves
+    forward. Ties keep the earliest run.
+    
+    Returns:
+        (best_start, best_len); best_len is 0 when no run reaches min_count
+    """
+    n = sorted_vals.shape[0]
+    best_start = 0
+    best_len = 0
+    left = 0
+    for right in range(n):
+        while sorted_vals[right] - sorted_vals[left] > tol:
+            left += 1
+        length = right - left + 1
+        if length >= min_count and length > best_len:
+            best_start = left
+            best_len = length
+    return best_start, best_len
+
+
+# Per-bar event codes emitted by the compiled scan
+EV_NONE = 0
+EV_SWEEP_HIGH = 1
+EV_SWEEP_LOW = 2
+EV_BOS_DOWN = 3
+EV_BOS_UP = 4
+EV_CONFIRM_HIGH = 5
+EV_CONFIRM_LOW = 6
+EV_SECOND_MOVE_ARMED = 7
+EV_ENTRY_SHORT = 8
+EV_ENTRY_LONG = 9
+
+# Debug counters bumped by each event code
+EVENT_COUNTERS = (
+    (),
+    ('sweeps_high',),
+    ('sweeps_low',),
+    ('bos_down',),
+    ('bos_up',),
+    ('confirmations_high',),
+    ('confirmations_low',),
+    ('second_move_armed',),
+    ('second_move_fired', 'entries_short'),
+    ('second_move_fired', 'entries_long'),
+)
+
+# Sweep direction
+SWEEP_NONE = 0
+SWEEP_HIGH = 1
+SWEEP_LOW = -1
+
+NO_DAY = np.iinfo(np.int64).min
+
+
+@njit(cache=True)
+def _lsg_scan(start, stop, high, low, close, open_, cluster_high, cluster_low,
+              swing_high, swing_low, trade_window, day_key, ts_ns,
+              inv_pip, sweep_pips, bos_required, bos_buffer, reentry_window_ns,
+              confirm_body_required, second_move_only, buffer,
+              cur_day, sweep_dir, sweep_ns, sweep_extreme, bos_confirmed,
+              conf_set, conf_high, conf_low, first_break_seen, entry_taken,
+              last_swing_high, last_swing_low):
+    """
+    Run the LSG state machine (sweep -> BOS -> confirmation -> entry) over
+    bars [start, stop).
+    
+    Stops right after the first entry bar and returns the remaining state as
+    scalars so the caller can resume. Missing levels are NaN. One event code
+    per bar (offset from start) drives the debug counters.
+    """
+    m = stop - start
+    events = np.zeros(m, np.int8)
+    entry = np.nan
+    entry_sl = np.nan
+    entry_tp = np.nan
+    end = stop
+    
+    for i in range(start, stop):
+        k = i - start
+        
+        # Initialize state for new day
+        if day_key[i] != cur_day:
+            cur_day = day_key[i]
+            sweep_dir = SWEEP_NONE
+            sweep_ns = 0
+            sweep_extreme = np.nan
+            bos_confirmed = False
+            conf_set = False
+            conf_high = np.nan
+            conf_low = np.nan
+            first_break_seen = False
+            entry_taken = False
+            last_swing_high = np.nan
+            last_swing_low = np.nan
+        
+        # Track recent swings for BOS detection
+        if swing_high[i]:
+            last_swing_high = high[i]
+        if swing_low[i]:
+            last_swing_low = low[i]
+        
+        # Only trade during London session (07:00-10:00 UTC)
+        if not trade_window[i]:
+            continue
+        
+        # Skip if already entered
+        if entry_taken:
+            continue
+        
+        ch = cluster_high[i]
+        cl = cluster_low[i]
+        
+        # Detect sweep
+        if sweep_dir == SWEEP_NONE:
+            if ch == ch and high[i] > ch:
+                if (high[i] - ch) * inv_pip >= sweep_pips:
+                    events[k] = EV_SWEEP_HIGH
+                    sweep_dir = SWEEP_HIGH
+                    sweep_ns = ts_ns[i]
+                    sweep_extreme = high[i]
+                    bos_confirmed = not bos_required
+            elif cl == cl and low[i] < cl:
+                if (cl - low[i]) * inv_pip >= sweep_pips:
+                    events[k] = EV_SWEEP_LOW
+                    sweep_dir = SWEEP_LOW
+                    sweep_ns = ts_ns[i]
+                    sweep_extreme = low[i]
+                    bos_confirmed = not bos_required
+        
+        # Check for BOS after sweep (if required and not yet confirmed)
+        elif not bos_confirmed and bos_required:
+            if ts_ns[i] - sweep_ns > reentry_window_ns:
+                sweep_dir = SWEEP_NONE
+                continue
+            
+            if sweep_dir == SWEEP_HIGH:
+                if last_swing_low == last_swing_low and close[i] < last_swing_low - bos_buffer:
+                    events[k] = EV_BOS_DOWN
+                    bos_confirmed = True
+            else:
+                if last_swing_high == last_swing_high and close[i] > last_swing_high + bos_buffer:
+                    events[k] = EV_BOS_UP
+                    bos_confirmed = True
+        
+        # Check for grab (close back in range) after sweep + BOS
+        elif bos_confirmed and not conf_set:
+            if ts_ns[i] - sweep_ns > reentry_window_ns:
+                sweep_dir = SWEEP_NONE
+                continue
+            
+            if sweep_dir == SWEEP_HIGH and ch == ch:
+                if close[i] < ch and (close[i] < open_[i] or not confirm_body_required):
+                    events[k] = EV_CONFIRM_HIGH
+                    conf_set = True
+                    conf_high = high[i]
+                    conf_low = low[i]
+            elif sweep_dir == SWEEP_LOW and cl == cl:
+                if close[i] > cl and (close[i] > open_[i] or not confirm_body_required):
+                    events[k] = EV_CONFIRM_LOW
+                    conf_set = True
+                    conf_high = high[i]
+                    conf_low = low[i]
+        
+        # Check for entry on break of confirmation bar (with second-move logic)
+        elif conf_set:
+            broke = low[i] < conf_low if sweep_dir == SWEEP_HIGH else high[i] > conf_high
+            if not broke:
+                continue
+            if second_move_only and not first_break_seen:
+                # Skip first break
+                first_break_seen = True
+                events[k] = EV_SECOND_MOVE_ARMED
+                continue
+            
+            if sweep_dir == SWEEP_HIGH:
+                # SHORT on break of confirmation low
+                entry_sl = sweep_extreme + buffer
+                entry = conf_low
+                entry_tp = entry - (entry_sl - entry)  # 1R
+                events[k] = EV_ENTRY_SHORT
+            else:
+                # LONG on break of confirmation high
+                entry_sl = sweep_extreme - buffer
+                entry = conf_high
+                entry_tp = entry + (entry - entry_sl)  # 1R
+                events[k] = EV_ENTRY_LONG
+            entry_taken = True
+            end = i + 1
+            break
+    
+    m = end - start
+    return (end, events[:m], entry, entry_sl, entry_tp,
+            cur_day, sweep_dir, sweep_ns, sweep_extreme, bos_confirmed,
+            conf_set, conf_high, conf_low, first_break_seen, entry_taken,
+            last_swing_high, last_swing_low)
+
+
+# Scan state before the first bar: (cur_day, sweep_dir, sweep_ns, sweep_extreme,
+# bos_confirmed, conf_set, conf_high, conf_low, first_break_seen, entry_taken,
+# last_swing_high, last_swing_low)
+INITIAL_SCAN_STATE = (NO_DAY, SWEEP_NONE, 0, np.nan, False, False, np.nan, np.nan,
+                      False, False, np.nan, np.nan)
+
+# Prepared columns the scan reads, in argument order
+SCAN_COLUMNS = ('High', 'Low', 'Close', 'Open', 'cluster_high', 'cluster_low',
+                'swing_high', 'swing_low', 'trade_window', 'day_key', 'ts_ns')
+
+
+class LSGState:
+    """
+    Per-run bookkeeping for the compiled LSG scan (fixed slots instead of
+    dict keys).
+    
+    - run: cached scan (start/end bars, events, entry, state before/after)
+    - last_i: last bar index generate_signals() was called for
+    """
+    
+    __slots__ = ('run', 'last_i')
+    
+    def __init__(self):
+        self.run = None
+        self.last_i = None
+
+
 class LSGStrategy(Strategy):
     """Liquidity Sweep + Grab strategy implementation."""
     
@@ -51,6 +282,14 @@ class LSGStrategy(Strategy):
         self.second_move_only = params.get('second_move_only', True)
         
         self.pip = pip_size(symbol)
+        # Pip-scaled thresholds are constant per instance
+        self._inv_pip = 1.0 / self.pip
+        self._tol_abs = self.tol_pips * self.pip
+        self._buffer_abs = self.buffer_pips * self.pip
+        self._bos_buffer_abs = self.bos_buffer_pips * self.pip
+        self._reentry_window_ns = self.reentry_window_m * NS_PER_MINUTE
+        # Sort buffer reused by _find_cluster (grown on demand)
+        self._scratch = np.empty(4096, dtype=np.float64)
         
         # Debug counters
         self.debug = {
@@ -70,59 +309,162 @@ class LSGStrategy(Strategy):
     
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add swing analysis and cluster detection."""
-        df = df.copy()
+        # Derived columns are built as arrays and attached with a single
+        # assign() at the end, so the OHLC blocks are never copied.
+        # Compute ATR (shared with other strategies run on the same frame)
+        atr = cached_atr(df, period=14)
         
-        # Compute ATR
-        df['ATR'] = compute_atr(df, period=14)
+        # Identify swing highs and lows (simple local maxima/minima): a bar is
+        # a swing when it is the extreme of the centred 2*window+1 bar window.
+        # One sliding max/min pass, shared with other strategies on the frame;
+        # edge bars have an incomplete window and are never swings.
+        highs = df['High'].to_numpy(dtype=np.float64)
+        lows = df['Low'].to_numpy(dtype=np.float64)
+        swing_high, swing_low = cached_swing_arrays(df, lookback=2)
         
-        # Identify swing highs and lows (simple local maxima/minima)
-        window = 2
-        df['swing_high'] = False
-        df['swing_low'] = False
+        # Detect clusters per day in pre-session (00:00-06:59 UTC): cluster
+        # each day's swings once, then broadcast the per-day level to its bars
+        day_key = day_keys(df.index)
+        _, day_idx = np.unique(day_key, return_inverse=True)
+        presession = np.asarray(df.index.hour) <= 6
         
-        for i in range(window, len(df) - window):
-            # Swing high: higher than neighbors
-            if df['High'].iloc[i] >= df['High'].iloc[i-window:i+window+1].max():
-                df.loc[df.index[i], 'swing_high'] = True
-            
-            # Swing low: lower than neighbors
-            if df['Low'].iloc[i] <= df['Low'].iloc[i-window:i+window+1].min():
-                df.loc[df.index[i], 'swing_low'] = True
+        # Days need at least 10 pre-session bars
+        n_days = int(day_idx.max()) + 1 if len(day_idx) else 0
+        eligible = np.bincount(day_idx[presession], minlength=n_days) >= 10
+        
+        tolerance = self._tol_abs
+        day_high = self._day_clusters(highs, swing_high & presession,
+                                      day_idx, eligible, tolerance)
+        day_low = self._day_clusters(lows, swing_low & presession,
+                                     day_idx, eligible, tolerance)
+        self.debug['clusters_high'] += int(np.count_nonzero(~np.isnan(day_high)))
+        self.debug['clusters_low'] += int(np.count_nonzero(~np.isnan(day_low)))
+        
+        # float64 with NaN for "no cluster" (never None/object)
+        cluster_high = day_high[day_idx]
+        cluster_low = day_low[day_idx]
+        
+        # Trading window (07:00-10:59 UTC, as is_in_window(ts, 7, 10)) as a mask
+        hour_utc = utc_hours(df.index)
+        trade_window = (hour_utc >= 7) & (hour_utc <= 10)
+        
+        # Raw column arrays for the compiled scan (no Series indexing)
+        self._cols = {
+            'High': highs,
+            'Low': lows,
+            'Close': df['Close'].to_numpy(dtype=np.float64),
+            'Open': df['Open'].to_numpy(dtype=np.float64),
+            'cluster_high': cluster_high,
+            'cluster_low': cluster_low,
+            'swing_high': swing_high,
+            'swing_low': swing_low,
+            'trade_window': trade_window,
+            'day_key': day_key,
+            'ts_ns': index_ns(df.index),
+        }
         
         # Add date for daily analysis
-        df['date'] = df.index.date
+        return df.assign(ATR=atr, swing_high=swing_high, swing_low=swing_low,
+                         date=df.index.date, cluster_high=cluster_high,
+                         cluster_low=cluster_low)
+    
+    def _scan(self, data: Tuple, start: int, stop: int, scan_state: Tuple) -> Tuple:
+        """Run the compiled state machine over [start, stop) from scan_state."""
+        result = _lsg_scan(
+            start, stop, *data,
+            self._inv_pip, float(self.sweep_pips), bool(self.bos_required),
+            self._bos_buffer_abs, self._reentry_window_ns,
+            bool(self.confirm_body_required), bool(self.second_move_only), self._buffer_abs,
+            *scan_state,
+        )
+        end, events, entry = result[0], result[1], result[2:5]
+        return end, events, entry, result[5:]
+    
+    def _bar_data(self, i: int, row: pd.Series) -> Tuple[Tuple, int]:
+        """
+        Scan inputs covering bar i, and the offset of bar i in them.
         
-        # Detect clusters per day in pre-session (00:00-06:59 UTC)
-        df['cluster_high'] = None
-        df['cluster_low'] = None
+        Read from the arrays cached by prepare(); a bar appended after the
+        last prepare() falls back to the row itself.
+        """
+        if i < len(self._cols['High']):
+            return tuple(self._cols[col] for col in SCAN_COLUMNS), i
         
-        for date in df['date'].unique():
-            # Get pre-session bars
-            day_mask = df['date'] == date
-            presession_mask = day_mask & (df.index.hour <= 6)
-            
-            if presession_mask.sum() < 10:
+        idx = pd.DatetimeIndex([row.name])
+        hour_utc = utc_hours(idx)
+        cluster_high = row.get('cluster_high')
+        cluster_low = row.get('cluster_low')
+        values = {
+            'High': [row['High']],
+            'Low': [row['Low']],
+            'Close': [row['Close']],
+            'Open': [row['Open']],
+            'cluster_high': [np.nan if cluster_high is None else cluster_high],
+            'cluster_low': [np.nan if cluster_low is None else cluster_low],
+            'swing_high': [bool(row.get('swing_high', False))],
+            'swing_low': [bool(row.get('swing_low', False))],
+            'trade_window': (hour_utc >= 7) & (hour_utc <= 10),
+            'day_key': day_keys(idx),
+            'ts_ns': index_ns(idx),
+        }
+        return tuple(np.asarray(values[col], dtype=self._cols[col].dtype)
+                     for col in SCAN_COLUMNS), 0
+    
+    def _start_run(self, i: int, row: pd.Series, st: 'LSGState') -> Dict:
+        """
+        Scan forward from bar i, resuming from the state after the last
+        bar this strategy was actually called on.
+        """
+        run = st.run
+        last_i = st.last_i
+        
+        if run is None or last_i is None:
+            scan_state = INITIAL_SCAN_STATE
+        elif last_i == run['end'] - 1:
+            scan_state = run['state_out']
+        else:
+            # Calls stopped partway through the cached run (e.g. position open)
+            base = run['base']
+            _, _, _, scan_state = self._scan(run['data'], run['start'] - base,
+                                             last_i + 1 - base, run['state_in'])
+        
+        # base: bar index of element 0 of the scan inputs
+        data, k = self._bar_data(i, row)
+        end, events, entry, state_out = self._scan(data, k, len(data[0]), scan_state)
+        
+        run = {
+            'data': data,
+            'base': i - k,
+            'start': i,
+            'end': end + i - k,
+            'events': events,
+            'entry': entry,
+            'state_in': scan_state,
+            'state_out': state_out,
+        }
+        st.run = run
+        return run
+    
+    def _day_clusters(self, values: np.ndarray, mask: np.ndarray, day_idx: np.ndarray,
+                      eligible: np.ndarray, tolerance: float) -> np.ndarray:
+        """Cluster level per day from each eligible day's masked values (NaN if none)."""
+        levels = np.full(len(eligible), np.nan)
+        if not mask.any():
+            return levels
+        
+        # Group the masked values by day: stable sort, then split at day changes
+        order = np.argsort(day_idx[mask], kind='stable')
+        days = day_idx[mask][order]
+        day_values = values[mask][order]
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        
+        for day, vals in zip(days[np.r_[0, bounds]], np.split(day_values, bounds)):
+            if not eligible[day] or len(vals) < self.min_cluster_count:
                 continue
-            
-            day_df = df[presession_mask].copy()
-            
-            # Find swing highs and cluster them
-            swing_highs = day_df[day_df['swing_high']]['High'].values
-            if len(swing_highs) >= self.min_cluster_count:
-                cluster = self._find_cluster(swing_highs, self.tol_pips * self.pip)
-                if cluster is not None:
-                    self.debug['clusters_high'] += 1
-                    df.loc[day_mask, 'cluster_high'] = cluster
-            
-            # Find swing lows and cluster them
-            swing_lows = day_df[day_df['swing_low']]['Low'].values
-            if len(swing_lows) >= self.min_cluster_count:
-                cluster = self._find_cluster(swing_lows, self.tol_pips * self.pip)
-                if cluster is not None:
-                    self.debug['clusters_low'] += 1
-                    df.loc[day_mask, 'cluster_low'] = cluster
-        
-        return df
+            cluster = self._find_cluster(vals, tolerance)
+            if cluster is not None:
+                levels[day] = cluster
+        return levels
     
     def _find_cluster(self, values: np.ndarray, tolerance: float) -> float:
         """
@@ -133,223 +475,70 @@ class LSGStrategy(Strategy):
         if len(values) < self.min_cluster_count:
             return None
         
-        # Sort values
-        sorted_vals = np.sort(values)
+        # Sort values in place in the reusable scratch buffer
+        k = len(values)
+        buf = self._scratch
+        if k > buf.size:
+            buf = self._scratch = np.empty(k, dtype=np.float64)
+        sorted_vals = buf[:k]
+        sorted_vals[:] = values
+        sorted_vals.sort()
         
         # Find largest cluster within tolerance
-        best_cluster = []
-        for i in range(len(sorted_vals)):
-            cluster = [sorted_vals[i]]
-            for j in range(i+1, len(sorted_vals)):
-                if abs(sorted_vals[j] - sorted_vals[i]) <= tolerance:
-                    cluster.append(sorted_vals[j])
-            
-            if len(cluster) >= self.min_cluster_count and len(cluster) > len(best_cluster):
-                best_cluster = cluster
-        
-        if len(best_cluster) >= self.min_cluster_count:
-            return np.median(best_cluster)
+        start, length = _find_cluster_nb(sorted_vals, float(tolerance),
+                                         self.min_cluster_count)
+        if length == 0:
+            return None
         
-        return None
+        # The cluster is a sorted slice, so its median is the middle element
+        # (or the mean of the two middle ones)
+        mid = start + length // 2
+        if length % 2:
+            return sorted_vals[mid]
+        return 0.5 * (sorted_vals[mid - 1] + sorted_vals[mid])
     
     def generate_signals(self, i: int, row: pd.Series, state: Dict) -> List[Dict]:
         """
         Generate LSG signals (v2 with BOS and second-move logic).
         
-        State tracking:
-        - current_date: date being processed
-        - sweep_detected: 'high' or 'low' or None
-        - sweep_time: timestamp of sweep
-        - sweep_extreme: price extreme during sweep
-        - bos_confirmed: bool (BOS requirement met)
-        - confirmation_bar: bar that closed back in range
-        - first_break_seen: bool (for second_move_only)
-        - entry_taken: bool
+        The state machine (daily reset, swing tracking, sweep, BOS,
+        confirmation, second-move entry) runs in a compiled scan from the
+        current bar to the next entry; later calls read the cached per-bar
+        events while they stay contiguous. Bars appended after the last
+        prepare() are scanned one at a time from row.
+        
+        State tracking lives in an LSGState kept under state['lsg'].
         """
         signals = []
         
-        # Extract data
-        current_time = row.name
-        date = current_time.date()
+        high = self._cols['High']
+        st = state.get('lsg')
+        if st is None:
+            st = state['lsg'] = LSGState()
         
-        cluster_high = row.get('cluster_high')
-        cluster_low = row.get('cluster_low')
-        
-        # Initialize state for new day
-        if state.get('current_date') != date:
-            state['current_date'] = date
-            state['sweep_detected'] = None
-            state['sweep_time'] = None
-            state['sweep_extreme'] = None
-            state['bos_confirmed'] = False
-            state['confirmation_bar'] = None
-            state['first_break_seen'] = False
-            state['entry_taken'] = False
-            state['last_swing_high'] = None
-            state['last_swing_low'] = None
+        run = st.run
+        if (run is None or run['data'][0] is not high or st.last_i is None
+                or i != st.last_i + 1 or not run['start'] <= i < run['end']):
+            run = self._start_run(i, row, st)
+        st.last_i = i
         
-        # Track recent swings for BOS detection
-        if row.get('swing_high', False):
-            state['last_swing_high'] = row['High']
-        if row.get('swing_low', False):
-            state['last_swing_low'] = row['Low']
-        
-        # Only trade during London session (07:00-10:00 UTC)
-        if not is_in_window(current_time, 7, 10):
+        event = run['events'][i - run['start']]
+        if event == EV_NONE:
             return signals
         
-        # Skip if already entered
-        if state.get('entry_taken'):
-            return signals
-        
-        # Detect sweep
-        if state.get('sweep_detected') is None:
-            # High sweep
-            if not pd.isna(cluster_high) and row['High'] > cluster_high:
-                sweep_dist = (row['High'] - cluster_high) / self.pip
-                if sweep_dist >= self.sweep_pips:
-                    self.debug['sweeps_high'] += 1
-                    state['sweep_detected'] = 'high'
-                    state['sweep_time'] = current_time
-                    state['sweep_extreme'] = row['High']
-                    state['bos_confirmed'] = not self.bos_required  # Skip BOS if not required
-            
-            # Low sweep
-            elif not pd.isna(cluster_low) and row['Low'] < cluster_low:
-                sweep_dist = (cluster_low - row['Low']) / self.pip
-                if sweep_dist >= self.sweep_pips:
-                    self.debug['sweeps_low'] += 1
-                    state['sweep_detected'] = 'low'
-                    state['sweep_time'] = current_time
-                    state['sweep_extreme'] = row['Low']
-                    state['bos_confirmed'] = not self.bos_required  # Skip BOS if not required
+        for counter in EVENT_COUNTERS[event]:
+            self.debug[counter] += 1
         
-        # Check for BOS after sweep (if required and not yet confirmed)
-        elif state.get('sweep_detected') is not None and not state.get('bos_confirmed') and self.bos_required:
-            sweep_type = state['sweep_detected']
-            sweep_time = state['sweep_time']
-            
-            # Check if still within reentry window
-            time_since_sweep = (current_time - sweep_time).total_seconds() / 60.0
-            if time_since_sweep > self.reentry_window_m:
-                state['sweep_detected'] = None
-                return signals
-            
-            bos_buffer = self.bos_buffer_pips * self.pip
-            
-            # High sweep -> require down BOS (close below last swing low)
-            if sweep_type == 'high':
-                if state.get('last_swing_low') is not None:
-                    if row['Close'] < (state['last_swing_low'] - bos_buffer):
-                        self.debug['bos_down'] += 1
-                        state['bos_confirmed'] = True
-            
-            # Low sweep -> require up BOS (close above last swing high)
-            elif sweep_type == 'low':
-                if state.get('last_swing_high') is not None:
-                    if row['Close'] > (state['last_swing_high'] + bos_buffer):
-                        self.debug['bos_up'] += 1
-                        state['bos_confirmed'] = True
-        
-        # Check for grab (close back in range) after sweep + BOS
-        elif state.get('sweep_detected') is not None and state.get('bos_confirmed') and state.get('confirmation_bar') is None:
-            sweep_type = state['sweep_detected']
-            sweep_time = state['sweep_time']
-            
-            # Check if still within reentry window
-            time_since_sweep = (current_time - sweep_time).total_seconds() / 60.0
-            if time_since_sweep > self.reentry_window_m:
-                state['sweep_detected'] = None
-                return signals
-            
-            # High sweep -> look for close back below cluster
-            if sweep_type == 'high' and not pd.isna(cluster_high):
-                if row['Close'] < cluster_high:
-                    # Check body requirement
-                    body_ok = (row['Close'] < row['Open']) if self.confirm_body_required else True
-                    if body_ok:
-                        self.debug['confirmations_high'] += 1
-                        state['confirmation_bar'] = {
-                            'time': current_time,
-                            'high': row['High'],
-                            'low': row['Low'],
-                            'close': row['Close']
-                        }
-            
-            # Low sweep -> look for close back above cluster
-            elif sweep_type == 'low' and not pd.isna(cluster_low):
-                if row['Close'] > cluster_low:
-                    # Check body requirement
-                    body_ok = (row['Close'] > row['Open']) if self.confirm_body_required else True
-                    if body_ok:
-                        self.debug['confirmations_low'] += 1
-                        state['confirmation_bar'] = {
-                            'time': current_time,
-                            'high': row['High'],
-                            'low': row['Low'],
-                            'close': row['Close']
-                        }
-        
-        # Check for entry on break of confirmation bar (with second-move logic)
-        elif state.get('confirmation_bar') is not None:
-            sweep_type = state['sweep_detected']
-            sweep_extreme = state['sweep_extreme']
-            conf = state['confirmation_bar']
-            
-            # High sweep + bearish confirmation -> SHORT on break of conf low
-            if sweep_type == 'high':
-                if row['Low'] < conf['low']:
-                    # Second-move logic
-                    if self.second_move_only and not state.get('first_break_seen'):
-                        # Skip first break
-                        state['first_break_seen'] = True
-                        self.debug['second_move_armed'] += 1
-                    else:
-                        # Enter SHORT (either second move or not using second_move_only)
-                        self.debug['second_move_fired'] += 1
-                        sl = sweep_extreme + (self.buffer_pips * self.pip)
-                        entry = conf['low']
-                        risk = sl - entry
-                        tp1 = entry - risk  # 1R
-                        
-                        signals.append({
-                            'action': 'open',
-                            'side': 'short',
-                            'price': entry,
-                            'sl': sl,
-                            'tp': tp1,
-                            'notes': f'LSG_v2_short'
-                        })
-                        
-                        state['entry_taken'] = True
-                        self.debug['entries_short'] += 1
-            
-            # Low sweep + bullish confirmation -> LONG on break of conf high
-            elif sweep_type == 'low':
-                if row['High'] > conf['high']:
-                    # Second-move logic
-                    if self.second_move_only and not state.get('first_break_seen'):
-                        # Skip first break
-                        state['first_break_seen'] = True
-                        self.debug['second_move_armed'] += 1
-                    else:
-                        # Enter LONG (either second move or not using second_move_only)
-                        self.debug['second_move_fired'] += 1
-                        sl = sweep_extreme - (self.buffer_pips * self.pip)
-                        entry = conf['high']
-                        risk = entry - sl
-                        tp1 = entry + risk  # 1R
-                        
-                        signals.append({
-                            'action': 'open',
-                            'side': 'long',
-                            'price': entry,
-                            'sl': sl,
-                            'tp': tp1,
-                            'notes': f'LSG_v2_long'
-                        })
-                        
-                        state['entry_taken'] = True
-                        self.debug['entries_long'] += 1
+        if event == EV_ENTRY_SHORT or event == EV_ENTRY_LONG:
+            entry, sl, tp = run['entry']
+            side = 'short' if event == EV_ENTRY_SHORT else 'long'
+            signals.append({
+                'action': 'open',
+                'side': side,
+                'price': entry,
+                'sl': sl,
+                'tp': tp,
+                'notes': f'LSG_v2_{side}'
+            })
         
         return signals
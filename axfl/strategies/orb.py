@@ -3,13 +3,15 @@ London Opening Range Breakout (ORB) Strategy.
 
 Trades breakouts from the first 5-minute bar of the London session.
 """
+import math
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 from .base import Strategy
-from ..core.sessions import is_in_window
-from ..core.utils import compute_atr
+from .utils import span_alpha, two_emas
+from ..core.sessions import is_in_window, day_keys, utc_hours
+from ..ta.cache import cached_atr
 from ..data.symbols import pip_size
 
 
@@ -76,30 +78,30 @@ class ORBStrategy(Strategy):
     
     def prepare(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add indicators and Opening Range data."""
-        df = df.copy()
-        
-        # Compute ATR
-        df['ATR'] = compute_atr(df, period=14)
+        # Derived columns are built as arrays and attached with a single
+        # assign() at the end, so the OHLC blocks are never copied.
+        # Compute ATR (shared with other strategies run on the same frame)
+        atr = cached_atr(df, period=14)
         
         # Compute EMAs for trend filter
         if self.use_trend_filter:
-            df['EMA20'] = df['Close'].ewm(span=20, adjust=False).mean()
-            df['EMA50'] = df['Close'].ewm(span=50, adjust=False).mean()
+            # Both EMAs in one pass over Close
+            ema20, ema50 = two_emas(df['Close'].to_numpy(dtype=np.float64),
+                                    span_alpha(20), span_alpha(50))
         else:
-            df['EMA20'] = 0
-            df['EMA50'] = 0
+            ema20 = ema50 = np.zeros(len(df))
         
         # Identify Opening Range bars (session-dependent timing)
-        df['date'] = df.index.date
-        df['hour'] = df.index.hour
-        df['minute'] = df.index.minute
+        day_key = day_keys(df.index)
+        hour = np.asarray(df.index.hour, dtype=np.int64)
+        minute = np.asarray(df.index.minute, dtype=np.int64)
         
         # Opening Range: first 5m bar of session (e.g., 07:00 or 12:30)
-        df['is_or_bar'] = (df['hour'] == self.or_start_hour) & (df['minute'] == self.or_start_minute)
+        is_or_bar = (hour == self.or_start_hour) & (minute == self.or_start_minute)
         
-        # Get OR high/low for each day
-        or_bars = df[df['is_or_bar']].copy()
-        or_daily = or_bars.groupby('date').agg({
+        # Get OR high/low for each day (keyed by integer day, not date objects)
+        or_daily = df.loc[is_or_bar, ['High', 'Low', 'Open', 'Close']].groupby(
+            day_key[is_or_bar]).agg({
             'High': 'max',
             'Low': 'min',
             'Open': 'first',
@@ -107,43 +109,88 @@ class ORBStrategy(Strategy):
         }).rename(columns={'High': 'or_high', 'Low': 'or_low', 
                            'Open': 'or_open', 'Close': 'or_close'})
         
-        # Merge back
-        df = df.merge(or_daily, left_on='date', right_index=True, how='left')
+        # Broadcast back to every bar of the day; days without an OR bar get
+        # position -1, which picks the NaN appended to each column
+        pos = or_daily.index.get_indexer(day_key)
+        or_cols = {col: np.append(or_daily[col].to_numpy(dtype=np.float64), np.nan)[pos]
+                   for col in or_daily.columns}
         
         # Calculate OR range in pips
-        df['or_range_pips'] = (df['or_high'] - df['or_low']) / self.pip
+        or_range_pips = (or_cols['or_high'] - or_cols['or_low']) / self.pip
         
         # Count days
         self.debug['days_considered'] = len(or_daily)
         
-        return df
+        # Trading window (07:00-10:59 UTC, as is_in_window(ts, 7, 10)) as a mask
+        hour_utc = utc_hours(df.index)
+        trade_window = (hour_utc >= 7) & (hour_utc <= 10)
+        
+        # Raw column arrays for the per-bar hot path (no Series indexing)
+        self._cols = {
+            'High': df['High'].to_numpy(dtype=np.float64),
+            'Low': df['Low'].to_numpy(dtype=np.float64),
+            'Close': df['Close'].to_numpy(dtype=np.float64),
+            'or_high': or_cols['or_high'],
+            'or_low': or_cols['or_low'],
+            'or_range_pips': or_range_pips,
+            'EMA20': ema20,
+            'EMA50': ema50,
+            'trade_window': trade_window,
+            'day_key': day_key,
+        }
+        
+        return df.assign(ATR=atr, EMA20=ema20, EMA50=ema50, hour=hour, minute=minute,
+                         is_or_bar=is_or_bar, **or_cols, or_range_pips=or_range_pips)
+    
+    def _bar(self, i: int, row: pd.Series) -> Tuple:
+        """
+        Values of bar i used by generate_signals().
+        
+        Read from the arrays cached by prepare(); bars appended after the last
+        prepare() fall back to the row itself.
+        """
+        cols = self._cols
+        if i < len(cols['High']):
+            return (cols['High'][i], cols['Low'][i], cols['Close'][i],
+                    cols['or_high'][i], cols['or_low'][i], cols['or_range_pips'][i],
+                    cols['EMA20'][i], cols['EMA50'][i],
+                    cols['trade_window'][i], cols['day_key'][i])
+        return (row['High'], row['Low'], row['Close'],
+                row.get('or_high', np.nan), row.get('or_low', np.nan), row.get('or_range_pips', 0),
+                row.get('EMA20'), row.get('EMA50'),
+                is_in_window(row.name, 7, 10),
+                day_keys(pd.DatetimeIndex([row.name]))[0])
     
     def generate_signals(self, i: int, row: pd.Series, state: Dict) -> List[Dict]:
         """
         Generate ORB signals.
         
         State tracking:
-        - current_date: date being processed
+        - current_day: integer day key being processed
         - or_established: bool
         - break_detected: 'up' or 'down' or None
         - break_time: timestamp of break
         - retest_pending: bool
         - entry_taken: bool
+        - done_day: day key with nothing left to do (entry taken or trend reject)
         """
+        # Rest of a finished day: skip before touching any bar data
+        day_key_arr = self._cols['day_key']
+        if i < len(day_key_arr) and state.get('done_day') == day_key_arr[i]:
+            return []
+        
         signals = []
         
         # Extract data
         current_time = row.name
-        date = current_time.date()
         hour = current_time.hour
         
-        or_high = row.get('or_high')
-        or_low = row.get('or_low')
-        or_range_pips = row.get('or_range_pips', 0)
+        (high, low, close, or_high, or_low, or_range_pips, ema20, ema50,
+         in_window, day_key) = self._bar(i, row)
         
         # Initialize state for new day
-        if state.get('current_date') != date:
-            state['current_date'] = date
+        if state.get('current_day') != day_key:
+            state['current_day'] = day_key
             state['or_established'] = False
             state['break_detected'] = None
             state['break_time'] = None
@@ -151,7 +198,7 @@ class ORBStrategy(Strategy):
             state['entry_taken'] = False
         
         # Skip if OR not valid
-        if pd.isna(or_high) or pd.isna(or_low):
+        if math.isnan(or_high) or math.isnan(or_low):
             return signals
         
         # Establish OR after 07:05
@@ -167,19 +214,22 @@ class ORBStrategy(Strategy):
         if not state['or_established']:
             return signals
         
-        # Only trade during 07:05-10:00 window
-        if not is_in_window(current_time, 7, 10):
+        # Skip if already entered (nothing below can fire again today). The
+        # small-OR reject sets entry_taken without establishing the OR and
+        # never gets here, so it keeps being re-evaluated as before.
+        if state.get('entry_taken'):
+            state['done_day'] = day_key
             return signals
         
-        # Skip if already entered
-        if state.get('entry_taken'):
+        # Only trade during 07:05-10:00 window
+        if not in_window:
             return signals
         
         # Detect breakout
         if state.get('break_detected') is None:
             # Upward break
-            if row['High'] > or_high:
-                breach_pips = (row['High'] - or_high) / self.pip
+            if high > or_high:
+                breach_pips = (high - or_high) / self.pip
                 if breach_pips >= self.thr_break_pips:
                     self.debug['breaks_up'] += 1
                     state['break_detected'] = 'up'
@@ -187,8 +237,8 @@ class ORBStrategy(Strategy):
                     state['retest_pending'] = self.retest
             
             # Downward break
-            elif row['Low'] < or_low:
-                breach_pips = (or_low - row['Low']) / self.pip
+            elif low < or_low:
+                breach_pips = (or_low - low) / self.pip
                 if breach_pips >= self.thr_break_pips:
                     self.debug['breaks_down'] += 1
                     state['break_detected'] = 'down'
@@ -205,24 +255,24 @@ class ORBStrategy(Strategy):
                 if state['retest_pending']:
                     # Check if price pulled back near OR high
                     retest_level = or_high + (self.retest_tol_pips * self.pip)
-                    if row['Low'] <= retest_level:
+                    if low <= retest_level:
                         self.debug['retests_hit'] += 1
                         state['retest_pending'] = False
                 
                 # Enter if retest satisfied (or not required)
                 if not state['retest_pending']:
                     # Check close above OR high
-                    if row['Close'] > or_high:
+                    if close > or_high:
                         # Trend filter
                         if self.use_trend_filter:
-                            if row['EMA20'] <= row['EMA50']:
+                            if ema20 <= ema50:
                                 self.debug['rejects_trend'] += 1
                                 state['entry_taken'] = True
                                 return signals
                         
                         # Calculate SL/TP
                         sl = or_low - (self.buffer_pips * self.pip)
-                        entry = row['Close']
+                        entry = close
                         risk = entry - sl
                         tp1 = entry + risk  # 1R
                         
@@ -244,24 +294,24 @@ class ORBStrategy(Strategy):
                 if state['retest_pending']:
                     # Check if price pulled back near OR low
                     retest_level = or_low - (self.retest_tol_pips * self.pip)
-                    if row['High'] >= retest_level:
+                    if high >= retest_level:
                         self.debug['retests_hit'] += 1
                         state['retest_pending'] = False
                 
                 # Enter if retest satisfied (or not required)
                 if not state['retest_pending']:
                     # Check close below OR low
-                    if row['Close'] < or_low:
+                    if close < or_low:
                         # Trend filter
                         if self.use_trend_filter:
-                            if row['EMA20'] >= row['EMA50']:
+                            if ema20 >= ema50:
                                 self.debug['rejects_trend'] += 1
                                 state['entry_taken'] = True
                                 return signals
                         
                         # Calculate SL/TP
                         sl = or_high + (self.buffer_pips * self.pip)
-                        entry = row['Close']
+                        entry = close
                         risk = sl - entry
                         tp1 = entry - risk  # 1R
                         
@@ -1,10 +1,46 @@
 from __future__ import annotations
 import numpy as np, pandas as pd
 from .base import Strategy, OrderPlan
-from .utils import atr, ema
+from .utils import atr, ema, span_alpha, two_emas, rolling_max, rolling_min
+from ..core.jit import njit
+
+@njit(cache=True)
+def _breakout_kernel(close, hh, ll, A, bias, buffer, sl_atr, tp_atr,
+                     min_break, min_atr, use_htf):
+    """
+    Signal, SL, TP and reason code for every bar in one fused pass.
+    Reason codes index PriceActionBreakout.REASONS; NaN inputs never trigger.
+    """
+    n = len(close)
+    sig = np.zeros(n, dtype=np.int8)
+    sl = np.full(n, np.nan)
+    tp = np.full(n, np.nan)
+    reason = np.zeros(n, dtype=np.int8)
+    for i in range(n):
+        if not ((hh[i] - ll[i]) >= min_break and A[i] >= min_atr):
+            continue
+        c = close[i]
+        long_trig = c > hh[i] + buffer
+        short_trig = c < ll[i] - buffer
+        if use_htf:
+            long_trig = long_trig and bias[i] == 1
+            short_trig = short_trig and bias[i] == -1
+        if short_trig:
+            sig[i] = -1
+            sl[i] = c + sl_atr * A[i]
+            tp[i] = c - tp_atr * A[i]
+            reason[i] = 2
+        elif long_trig:
+            sig[i] = 1
+            sl[i] = c - sl_atr * A[i]
+            tp[i] = c + tp_atr * A[i]
+            reason[i] = 1
+    return sig, sl, tp, reason
 
 class PriceActionBreakout(Strategy):
     name = "price_action_breakout"
+    # reason codes: 0 = no signal, 1 = long, 2 = short
+    REASONS = ["", "HH breakout", "LL breakout"]
 
     def __init__(
         self,
@@ -75,44 +111,21 @@ class PriceActionBreakout(Strategy):
         return None
 
     def generate(self, df: pd.DataFrame, **_) -> pd.DataFrame:
-        out = df.copy()
-        out['hh'] = out['high'].rolling(self.lookback).max()
-        out['ll'] = out['low'].rolling(self.lookback).min()
-        out['A'] = atr(out, self.atr_len)
+        close = df['close'].to_numpy(dtype=np.float64)
+        hh = rolling_max(df['high'].to_numpy(dtype=np.float64), self.lookback)
+        ll = rolling_min(df['low'].to_numpy(dtype=np.float64), self.lookback)
+        A = atr(df, self.atr_len).to_numpy()
 
         if self.use_htf_filter:
-            out['ema_fast'] = ema(out['close'], self.htf_fast)
-            out['ema_slow'] = ema(out['close'], self.htf_slow)
-            out['bias'] = np.where(out['ema_fast'] > out['ema_slow'], 1, -1)
+            ema_fast, ema_slow = two_emas(close, span_alpha(self.htf_fast), span_alpha(self.htf_slow))
+            bias = np.where(ema_fast > ema_slow, 1, -1).astype(np.int8)
         else:
-            out['bias'] = 0
+            bias = np.zeros(len(df), dtype=np.int8)
 
-        rng_ok = (out['hh'] - out['ll']) >= self.min_break
-        atr_ok = out['A'] >= self.min_atr
-
-        long_trig  = (out['close'] > (out['hh'] + self.buffer))
-        short_trig = (out['close'] < (out['ll'] - self.buffer))
-
-        if self.use_htf_filter:
-            long_trig  &= (out['bias'] == 1)
-            short_trig &= (out['bias'] == -1)
-
-        long_trig  &= rng_ok & atr_ok
-        short_trig &= rng_ok & atr_ok
-
-        out['signal'] = 0
-        out.loc[long_trig, 'signal'] = 1
-        out.loc[short_trig, 'signal'] = -1
-
-        out['sl'] = np.where(
-            out['signal'] == 1, out['close'] - self.sl_atr * out['A'],
-            np.where(out['signal'] == -1, out['close'] + self.sl_atr * out['A'], np.nan)
-        )
-        out['tp'] = np.where(
-            out['signal'] == 1, out['close'] + self.tp_atr * out['A'],
-            np.where(out['signal'] == -1, out['close'] - self.tp_atr * out['A'], np.nan)
+        sig, sl, tp, reason = _breakout_kernel(
+            close, hh, ll, A, bias, self.buffer, self.sl_atr, self.tp_atr,
+            self.min_break, self.min_atr, self.use_htf_filter
         )
-        out['units'] = np.nan
-        out['reason'] = np.where(out['signal']==1, "HH breakout",
-                          np.where(out['signal']==-1, "LL breakout", ""))
-        return out[['signal','sl','tp','units','reason']]
+        return pd.DataFrame({'signal': sig, 'sl': sl, 'tp': tp, 'units': np.nan,
+                             'reason': pd.Categorical.from_codes(reason, self.REASONS)},
+                            index=df.index)
@@ -1,19 +1,30 @@
-from .adapters.lsg import LSG
-from .adapters.orb import ORB
-from .adapters.arls import ARLS
-from .price_action_breakout import PriceActionBreakout
-from .ema_trend import EmaTrend
-from .bollinger_mean_rev import BollingerMeanRev
-from .session_breakout import SessionBreakout
-from .vol_contraction import VolatilityContraction
+import importlib
 
+# Strategies are referenced as "module:Class" and imported on first use, so
+# loading the registry (e.g. in a freshly spawned worker) only pays for the
+# strategies that are actually requested.
 REGISTRY = {
-    "lsg": LSG,
-    "orb": ORB,
-    "arls": ARLS,
-    "price_action_breakout": PriceActionBreakout,
-    "ema_trend": EmaTrend,
-    "bollinger_mean_rev": BollingerMeanRev,
-    "session_breakout": SessionBreakout,
-    "volatility_contraction": VolatilityContraction,
+    "lsg": "axfl.strategies.adapters.lsg:LSG",
+    "orb": "axfl.strategies.adapters.orb:ORB",
+    "arls": "axfl.strategies.adapters.arls:ARLS",
+    "price_action_breakout": "axfl.strategies.price_action_breakout:PriceActionBreakout",
+    "ema_trend": "axfl.strategies.ema_trend:EmaTrend",
+    "bollinger_mean_rev": "axfl.strategies.bollinger_mean_rev:BollingerMeanRev",
+    "session_breakout": "axfl.strategies.session_breakout:SessionBreakout",
+    "volatility_contraction": "axfl.strategies.vol_contraction:VolatilityContraction",
 }
+
+
+# Classes already resolved by get(), keyed by registry name
+_RESOLVED = {}
+
+
+def get(name):
+    """Import and return the strategy class registered under name."""
+    try:
+        return _RESOLVED[name]
+    except KeyError:
+        pass
+    mod, cls = REGISTRY[name].split(':')
+    strat_cls = _RESOLVED[name] = getattr(importlib.import_module(mod), cls)
+    return strat_cls
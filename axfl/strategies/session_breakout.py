@@ -4,10 +4,41 @@ session_breakout.py - Session range breakout strategy with dynamic buffer
 from __future__ import annotations
 import numpy as np, pandas as pd
 from .base import Strategy
-from .utils import atr
+from .utils import atr, flat_signals
+from ..core.jit import njit
+from ..core.sessions import index_ns, NS_PER_DAY, NS_PER_MINUTE
+
+@njit(cache=True)
+def _session_extremes(high, low, is_in, day_key):
+    """
+    Running high/low of each day's in-session bars (bars in time order),
+    carried forward through the rest of that day; NaN until the day's first
+    valid session bar.
+    """
+    n = len(high)
+    sh = np.empty(n)
+    sl = np.empty(n)
+    run_hi = np.nan
+    run_lo = np.nan
+    for i in range(n):
+        if i == 0 or day_key[i] != day_key[i - 1]:
+            run_hi = np.nan
+            run_lo = np.nan
+        if is_in[i]:
+            h = high[i]
+            if h == h and (run_hi != run_hi or h > run_hi):
+                run_hi = h
+            l = low[i]
+            if l == l and (run_lo != run_lo or l < run_lo):
+                run_lo = l
+        sh[i] = run_hi
+        sl[i] = run_lo
+    return sh, sl
 
 class SessionBreakout(Strategy):
     name = "session_breakout"
+    # reason codes: 0 = no signal, 1 = long, 2 = short
+    REASONS = ["", "Session high break", "Session low break"]
     def __init__(
         self,
         start_hhmm:int=0, end_hhmm:int=500,
@@ -26,51 +57,58 @@ class SessionBreakout(Strategy):
         self.dyn_buffer_atr_frac = dyn_buffer_atr_frac
         self.cool_minutes = cool_minutes
 
-    def _hhmm(self, ts: pd.Timestamp) -> int:
-        ts = ts.tz_convert("UTC") if ts.tzinfo else ts.tz_localize("UTC")
-        return ts.hour*100 + ts.minute
-
     def generate(self, df: pd.DataFrame, **_) -> pd.DataFrame:
-        out = df.copy()
-        out["A"] = atr(out, self.atr_len)
+        # UTC day and hhmm straight from epoch nanoseconds (naive = UTC),
+        # no tz conversion or per-field datetime extraction
+        ts_ns = index_ns(df.index)
+        day_key = ts_ns // NS_PER_DAY  # UTC epoch day
+        minute_of_day = (ts_ns - day_key*NS_PER_DAY) // NS_PER_MINUTE
+        hhmm = (minute_of_day // 60)*100 + minute_of_day % 60
+        is_in = (hhmm >= self.start) & (hhmm <= self.end)
+
+        # no session bars in this slice (e.g. an off-hours live window): no
+        # range can form, so skip the indicator work entirely
+        if not is_in.any():
+            return flat_signals(df.index, self.REASONS)
+
+        A = atr(df, self.atr_len)
+        a = A.to_numpy(dtype=np.float64)
+        close = df["close"].to_numpy(dtype=np.float64)
         # dynamic buffer (pips -> price)
-        atr_pips = (out["A"] / 0.0001).clip(lower=0)
-        dyn_buf = (self.dyn_buffer_atr_frac * atr_pips).fillna(0)
+        atr_pips = np.clip(a / 0.0001, 0, None)
+        dyn_buf = self.dyn_buffer_atr_frac * atr_pips
+        dyn_buf[np.isnan(dyn_buf)] = 0
         buf_pips = np.maximum(self.buffer_pips, dyn_buf)
         buffer = buf_pips * 0.0001
 
-        idx = out.index
-        hhmm = pd.Series([self._hhmm(t) for t in idx], index=idx)
-        is_in = (hhmm >= self.start) & (hhmm <= self.end)
-
-        # session highs/lows per day
-        day = pd.to_datetime(idx, utc=True).date
-        day_series = pd.Series(day, index=idx)
-        shigh = pd.Series(np.nan, index=idx)
-        slow  = pd.Series(np.nan, index=idx)
-        for d in np.unique(day_series.values):
-            mask = (day_series==d) & is_in
-            if mask.any():
-                shigh.loc[mask] = out.loc[mask, "high"].cummax()
-                slow.loc[mask]  = out.loc[mask, "low"].cummin()
-        sh, sl = shigh.ffill(), slow.ffill()
+        # session highs/lows per day as plain float arrays: running extremes
+        # of the in-session bars, held for the rest of the day (a day without
+        # session bars doesn't inherit yesterday's)
+        sh, sl = _session_extremes(df["high"].to_numpy(dtype=np.float64),
+                                   df["low"].to_numpy(dtype=np.float64),
+                                   is_in, day_key)
 
         after = hhmm > self.end
         rng = (sh - sl)
         rng_ok = rng >= self.min_rng
 
-        long_trig  = after & rng_ok & (out["close"] > (sh + buffer))
-        short_trig = after & rng_ok & (out["close"] < (sl - buffer))
-
-        out["signal"] = 0
-        out.loc[long_trig, "signal"] = 1
-        out.loc[short_trig, "signal"] = -1
+        long_trig  = after & rng_ok & (close > (sh + buffer))
+        short_trig = after & rng_ok & (close < (sl - buffer))
 
-        out["sl"] = np.where(out["signal"]==1, out["close"] - self.sl_atr*out["A"],
-                       np.where(out["signal"]==-1, out["close"] + self.sl_atr*out["A"], np.nan))
-        out["tp"] = np.where(out["signal"]==1, out["close"] + self.tp_atr*out["A"],
-                       np.where(out["signal"]==-1, out["close"] - self.tp_atr*out["A"], np.nan))
-        out["units"] = np.nan
-        out["reason"] = np.where(out["signal"]==1, "Session high break",
-                           np.where(out["signal"]==-1, "Session low break", ""))
-        return out[["signal","sl","tp","units","reason"]]
+        # Assemble outputs in one pass from the signed direction (+1/-1/0)
+        sig = np.zeros(len(df), dtype=np.int8)
+        sig[long_trig] = 1
+        sig[short_trig] = -1
+        direction = sig.astype(np.float64)
+        flat = sig == 0
+        sl_px = close - direction*self.sl_atr*a
+        tp_px = close + direction*self.tp_atr*a
+        sl_px[flat] = np.nan
+        tp_px[flat] = np.nan
+        reason = np.zeros(len(df), dtype=np.int8)
+        reason[sig==1] = 1
+        reason[sig==-1] = 2
+        # units are left to the sizer; reason is categorical (1 byte per row)
+        return pd.DataFrame({"signal": sig, "sl": sl_px, "tp": tp_px,
+                              "units": np.nan,
+                              "reason": pd.Categorical.from_codes(reason, self.REASONS)}, index=df.index)
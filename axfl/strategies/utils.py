@@ -1,14 +1,186 @@
 from __future__ import annotations
 import numpy as np
 import pandas as pd
+from ..core.jit import njit, HAS_NUMBA
+from ..ta.cache import frame_memo
+
+try:
+    from window_ops.rolling import rolling_max as _wo_rolling_max, rolling_min as _wo_rolling_min
+    HAS_WINDOW_OPS = True
+except ImportError:
+    HAS_WINDOW_OPS = False
+
+@njit(cache=True)
+def _rolling_extreme_deque(x: np.ndarray, n: int, is_max: bool) -> np.ndarray:
+    """
+    Trailing n-bar max (or min) via a monotonic index deque: each bar is
+    pushed and popped at most once. NaN until the window is full and
+    wherever the window holds a NaN, as with pandas rolling(n).
+    """
+    m = len(x)
+    out = np.full(m, np.nan)
+    q = np.empty(m, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_cnt = 0
+    for i in range(m):
+        v = x[i]
+        if v != v:
+            nan_cnt += 1
+        else:
+            if is_max:
+                while tail > head and x[q[tail - 1]] <= v:
+                    tail -= 1
+            else:
+                while tail > head and x[q[tail - 1]] >= v:
+                    tail -= 1
+            q[tail] = i
+            tail += 1
+        if i >= n:
+            old = x[i - n]
+            if old != old:
+                nan_cnt -= 1
+        while head < tail and q[head] <= i - n:
+            head += 1
+        if i >= n - 1 and nan_cnt == 0:
+            out[i] = x[q[head]]
+    return out
+
+def rolling_max(x: np.ndarray, n: int) -> np.ndarray:
+    """Trailing n-bar max of a float64 array (NaN until the window is full)."""
+    if HAS_WINDOW_OPS:
+        return _wo_rolling_max(x, n)
+    if HAS_NUMBA:
+        return _rolling_extreme_deque(x, n, True)
+    return pd.Series(x).rolling(n).max().to_numpy()
+
+def rolling_min(x: np.ndarray, n: int) -> np.ndarray:
+    """Trailing n-bar min of a float64 array (NaN until the window is full)."""
+    if HAS_WINDOW_OPS:
+        return _wo_rolling_min(x, n)
+    if HAS_NUMBA:
+        return _rolling_extreme_deque(x, n, False)
+    return pd.Series(x).rolling(n).min().to_numpy()
+
+@njit(cache=True)
+def rolling_quantile(x: np.ndarray, w: int, q: float) -> np.ndarray:
+    """
+    Trailing w-bar quantile with linear interpolation, matching
+    ``pd.Series(x).rolling(w).quantile(q)`` (NaN until the window is full,
+    and wherever the window holds a NaN).
+    Keeps the window's values in a sorted buffer, so each bar costs one
+    removal and one insertion instead of a fresh sort.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    buf = np.empty(max(w, 1))
+    cnt = 0
+    nan_cnt = 0
+    pos = q * (w - 1)
+    lo = int(pos)
+    frac = pos - lo
+    for i in range(n):
+        # Drop the value leaving the window
+        if i >= w:
+            old = x[i - w]
+            if old != old:
+                nan_cnt -= 1
+            else:
+                k = np.searchsorted(buf[:cnt], old)
+                for j in range(k, cnt - 1):
+                    buf[j] = buf[j + 1]
+                cnt -= 1
+        # Insert the new value in order
+        v = x[i]
+        if v != v:
+            nan_cnt += 1
+        else:
+            j = cnt
+            while j > 0 and buf[j - 1] > v:
+                buf[j] = buf[j - 1]
+                j -= 1
+            buf[j] = v
+            cnt += 1
+        if i >= w - 1 and nan_cnt == 0:
+            vlow = buf[lo]
+            if frac == 0.0:
+                out[i] = vlow
+            else:
+                out[i] = vlow + (buf[lo + 1] - vlow) * frac
+    return out
 
 def ema(a: pd.Series, n: int) -> pd.Series:
     return a.ewm(span=n, adjust=False).mean()
 
+def span_alpha(n: int) -> float:
+    """Smoothing factor for an EMA of span n, derived exactly as pandas does."""
+    return 1.0 / (1.0 + (n - 1) / 2.0)
+
+@njit(cache=True)
+def two_emas(x: np.ndarray, k1: float, k2: float):
+    """
+    Two adjust=False EMAs (smoothing factors k1, k2) in a single pass over x.
+    Mirrors pandas' ewm recurrence, including the decay of the old weight
+    across NaN gaps, so each output is bit-identical to
+    ``ewm(span=n, adjust=False).mean()`` when k = span_alpha(n).
+    """
+    n = len(x)
+    e1 = np.empty(n)
+    e2 = np.empty(n)
+    if n == 0:
+        return e1, e2
+    w1 = x[0]
+    w2 = x[0]
+    e1[0] = w1
+    e2[0] = w2
+    old1 = 1.0
+    old2 = 1.0
+    for i in range(1, n):
+        cur = x[i]
+        obs = cur == cur
+        if w1 == w1:
+            old1 *= 1.0 - k1
+            old2 *= 1.0 - k2
+            if obs:
+                if w1 != cur:
+                    w1 = (old1 * w1 + k1 * cur) / (old1 + k1)
+                if w2 != cur:
+                    w2 = (old2 * w2 + k2 * cur) / (old2 + k2)
+                old1 = 1.0
+                old2 = 1.0
+        elif obs:
+            w1 = cur
+            w2 = cur
+        e1[i] = w1
+        e2[i] = w2
+    return e1, e2
+
+def _wilder_atr(df: pd.DataFrame, n: int) -> pd.Series:
+    h = df['high'].to_numpy(dtype=np.float64)
+    l = df['low'].to_numpy(dtype=np.float64)
+    c = df['close'].to_numpy(dtype=np.float64)
+    pc = np.empty_like(c)
+    pc[:1] = np.nan
+    pc[1:] = c[:-1]
+    # True range as one reduction over a contiguous (3, N) block
+    tr = np.max(np.stack([h - l, np.abs(h - pc), np.abs(l - pc)]), axis=0)
+    return pd.Series(tr, index=df.index).ewm(alpha=1.0 / n, adjust=False, min_periods=n).mean()
+
 def atr(df: pd.DataFrame, n: int = 14) -> pd.Series:
-    h, l, c = df['high'], df['low'], df['close']
-    tr = np.maximum(h - l, np.maximum((h - c.shift()).abs(), (l - c.shift()).abs()))
-    return tr.rolling(n).mean()
+    """
+    Wilder's ATR: true range smoothed with alpha = 1/n (NaN until n ranges are seen).
+    Memoized per frame, so strategies scanned over the same frame share one
+    computation; the returned Series is shared and must not be modified.
+    """
+    return frame_memo(df, ('wilder_atr', n), lambda: _wilder_atr(df, n))
+
+def flat_signals(index: pd.Index, reasons: list) -> pd.DataFrame:
+    """All-zero signal frame (signal/sl/tp/units/reason) for bars with nothing to trade."""
+    n = len(index)
+    return pd.DataFrame({'signal': np.zeros(n, dtype=np.int8), 'sl': np.full(n, np.nan),
+                         'tp': np.full(n, np.nan), 'units': np.full(n, np.nan),
+                         'reason': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), reasons)},
+                        index=index)
 
 def bbands(s: pd.Series, n: int = 20, k: float = 2.0):
     ma = s.rolling(n).mean()
@@ -4,10 +4,12 @@ vol_contraction.py - Volatility contraction strategy with ATR-based range filter
 from __future__ import annotations
 import numpy as np, pandas as pd
 from .base import Strategy
-from .utils import atr
+from .utils import atr, rolling_quantile, rolling_max, rolling_min, flat_signals
 
 class VolatilityContraction(Strategy):
     name = "volatility_contraction"
+    # reason codes: 0 = no signal, 1 = long, 2 = short
+    REASONS = ["", "VC breakout up", "VC breakout down"]
     def __init__(
         self,
         atr_len:int=14, atr_pctile:float=35.0,
@@ -25,32 +27,44 @@ class VolatilityContraction(Strategy):
         self.min_range_atr_frac = min_range_atr_frac
 
     def generate(self, df: pd.DataFrame, **_) -> pd.DataFrame:
-        out = df.copy()
-        out["A"] = atr(out, self.atr_len)
-        thr = out["A"].rolling(100).quantile(self.atr_pctile/100.0)
-        contract = out["A"] <= thr
+        A = atr(df, self.atr_len)
+        thr = pd.Series(rolling_quantile(A.to_numpy(dtype=np.float64), 100,
+                                         self.atr_pctile/100.0), index=df.index)
+        contract = A <= thr
+        # volatility never contracts below its percentile: nothing can fire
+        if not contract.any():
+            return flat_signals(df.index, self.REASONS)
 
-        rng_hi = out["high"].rolling(self.lookback).max()
-        rng_lo = out["low"].rolling(self.lookback).min()
+        rng_hi = pd.Series(rolling_max(df["high"].to_numpy(dtype=np.float64), self.lookback),
+                           index=df.index)
+        rng_lo = pd.Series(rolling_min(df["low"].to_numpy(dtype=np.float64), self.lookback),
+                           index=df.index)
         rng_w = (rng_hi - rng_lo)
 
-        atr_pips = (out["A"] / 0.0001).clip(lower=0)
+        atr_pips = (A / 0.0001).clip(lower=0)
         min_floor = np.maximum(self.min_range_pips, self.min_range_atr_frac * atr_pips) * 0.0001
         rng_ok = rng_w <= min_floor
 
         buffer = self.buffer_pips * 0.0001
-        long_trig  = contract & rng_ok & (out["close"] > (rng_hi + buffer))
-        short_trig = contract & rng_ok & (out["close"] < (rng_lo - buffer))
+        long_trig  = contract & rng_ok & (df["close"] > (rng_hi + buffer))
+        short_trig = contract & rng_ok & (df["close"] < (rng_lo - buffer))
 
-        out["signal"] = 0
-        out.loc[long_trig, "signal"] = 1
-        out.loc[short_trig, "signal"] = -1
-
-        out["sl"] = np.where(out["signal"]==1, out["close"] - self.sl_atr*out["A"],
-                       np.where(out["signal"]==-1, out["close"] + self.sl_atr*out["A"], np.nan))
-        out["tp"] = np.where(out["signal"]==1, out["close"] + self.tp_atr*out["A"],
-                       np.where(out["signal"]==-1, out["close"] - self.tp_atr*out["A"], np.nan))
-        out["units"] = np.nan
-        out["reason"] = np.where(out["signal"]==1, "VC breakout up",
-                           np.where(out["signal"]==-1, "VC breakout down", ""))
-        return out[["signal","sl","tp","units","reason"]]
+        # Assemble outputs in one pass from the signed direction (+1/-1/0)
+        sig = np.zeros(len(df), dtype=np.int8)
+        sig[long_trig.to_numpy()] = 1
+        sig[short_trig.to_numpy()] = -1
+        direction = sig.astype(np.float64)
+        flat = sig == 0
+        close = df["close"].to_numpy(dtype=np.float64)
+        a = A.to_numpy(dtype=np.float64)
+        sl_px = close - direction*self.sl_atr*a
+        tp_px = close + direction*self.tp_atr*a
+        sl_px[flat] = np.nan
+        tp_px[flat] = np.nan
+        reason = np.zeros(len(df), dtype=np.int8)
+        reason[sig==1] = 1
+        reason[sig==-1] = 2
+        # units are left to the sizer; reason is categorical (1 byte per row)
+        return pd.DataFrame({"signal": sig, "sl": sl_px, "tp": tp_px,
+                              "units": np.nan,
+                              "reason": pd.Categorical.from_codes(reason, self.REASONS)}, index=df.index)
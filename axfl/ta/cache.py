@@ -0,0 +1,63 @@
+"""
+Per-frame memo for derived indicator arrays.
+
+Several strategies (and the backtester's slippage model) derive the same
+ATR and swing masks from the same OHLC frame. Results are memoized against
+the frame object itself - held weakly, so entries disappear with the frame -
+plus the call arguments, so a multi-strategy run computes each indicator once.
+
+Cached arrays are shared between callers and must not be modified in place;
+frames are assumed not to be mutated in place after indicators are derived.
+"""
+import weakref
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..core.utils import compute_atr
+from .structure import swing_arrays
+
+
+_memo: Dict[int, Tuple[weakref.ref, Dict[Hashable, Any]]] = {}
+
+
+def _evict(frame_id: int) -> None:
+    """Drop a frame's entries once it has been garbage collected."""
+    _memo.pop(frame_id, None)
+
+
+def frame_memo(df: pd.DataFrame, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """
+    Return compute() for (df, key), computing it at most once per frame.
+
+    Args:
+        df: Frame the value is derived from
+        key: Hashable description of the derivation (name + parameters)
+        compute: Zero-argument callable producing the value
+
+    Returns:
+        Cached or freshly computed value
+    """
+    frame_id = id(df)
+    entry = _memo.get(frame_id)
+    if entry is None or entry[0]() is not df:
+        entry = (weakref.ref(df, lambda _, k=frame_id: _evict(k)), {})
+        _memo[frame_id] = entry
+
+    values = entry[1]
+    if key not in values:
+        values[key] = compute()
+    return values[key]
+
+
+def cached_atr(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """compute_atr() as an ndarray, shared across callers of the same frame."""
+    return frame_memo(df, ('atr', period),
+                      lambda: compute_atr(df, period=period).to_numpy())
+
+
+def cached_swing_arrays(df: pd.DataFrame, lookback: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """swing_arrays() shared across callers of the same frame."""
+    return frame_memo(df, ('swings', lookback),
+                      lambda: swing_arrays(df, lookback=lookback))
@@ -5,7 +5,111 @@ Provides swing detection, BOS/CHOCH identification, and order block tagging.
 """
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..core.jit import njit, HAS_NUMBA
+
+
+@njit(cache=True)
+def _swing_masks(high: np.ndarray, low: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Swing masks from one pass of sliding-window max/min over the centred
+    2*lookback+1 bar window.
+    
+    Monotonic index deques keep the window extremes in O(1) amortized per
+    bar. NaNs never enter the deques, so neighbours are skipped as with
+    Series.max()/min(), and a NaN centre bar is never a swing. Bars without
+    a full window are never swings.
+    """
+    n = len(high)
+    span = 2 * lookback + 1
+    swing_high = np.zeros(n, dtype=np.bool_)
+    swing_low = np.zeros(n, dtype=np.bool_)
+    
+    q_max = np.empty(n, dtype=np.int64)
+    q_min = np.empty(n, dtype=np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+    
+    for right in range(n):
+        # Push the new right edge
+        h = high[right]
+        if h == h:
+            while max_tail > max_head and high[q_max[max_tail - 1]] <= h:
+                max_tail -= 1
+            q_max[max_tail] = right
+            max_tail += 1
+        l = low[right]
+        if l == l:
+            while min_tail > min_head and low[q_min[min_tail - 1]] >= l:
+                min_tail -= 1
+            q_min[min_tail] = right
+            min_tail += 1
+        
+        # Drop the bar that just left the window
+        left = right - span + 1
+        while max_head < max_tail and q_max[max_head] < left:
+            max_head += 1
+        while min_head < min_tail and q_min[min_head] < left:
+            min_head += 1
+        
+        if left < 0:
+            continue
+        
+        # Centre bar is a swing when it equals the window extreme (a non-NaN
+        # centre is in its own window, so the deque is not empty)
+        i = left + lookback
+        if high[i] == high[i] and high[i] >= high[q_max[max_head]]:
+            swing_high[i] = True
+        if low[i] == low[i] and low[i] <= low[q_min[min_head]]:
+            swing_low[i] = True
+    
+    return swing_high, swing_low
+
+
+def _swing_masks_np(high: np.ndarray, low: np.ndarray, lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized swing masks: max/min over a (N-2L, 2L+1) sliding window view.
+    
+    Used instead of the deque kernel when numba is unavailable, where a
+    Python-level loop would be far slower than one strided reduction.
+    """
+    n = len(high)
+    span = 2 * lookback + 1
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n < span:
+        return swing_high, swing_low
+    
+    # fmax/fmin skip NaN neighbours like Series.max()/min(); a NaN centre
+    # compares False, so it is never a swing
+    Hw = sliding_window_view(high, span)
+    Lw = sliding_window_view(low, span)
+    swing_high[lookback:n - lookback] = Hw[:, lookback] >= np.fmax.reduce(Hw, axis=1)
+    swing_low[lookback:n - lookback] = Lw[:, lookback] <= np.fmin.reduce(Lw, axis=1)
+    return swing_high, swing_low
+
+
+def swing_arrays(df: pd.DataFrame, lookback: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Identify swing highs and lows as boolean ndarrays.
+    
+    Same pivot logic as swings() but returns the masks directly so callers
+    can keep them as attributes instead of copying the whole DataFrame.
+    
+    Args:
+        df: DataFrame with High and Low columns
+        lookback: Number of bars on each side for comparison
+    
+    Returns:
+        Tuple of (swing_high, swing_low) boolean arrays
+    """
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    if not HAS_NUMBA:
+        return _swing_masks_np(high, low, int(lookback))
+    return _swing_masks(high, low, int(lookback))
 
 
 def swings(df: pd.DataFrame, lookback: int = 2) -> pd.DataFrame:
@@ -19,115 +123,134 @@ def swings(df: pd.DataFrame, lookback: int = 2) -> pd.DataFrame:
     Returns:
         DataFrame with added columns: swing_high, swing_low (boolean)
     """
-    df = df.copy()
-    df['swing_high'] = False
-    df['swing_low'] = False
-    
-    for i in range(lookback, len(df) - lookback):
-        # Swing high: higher than all neighbors in window
-        window_highs = df['High'].iloc[i-lookback:i+lookback+1]
-        if df['High'].iloc[i] >= window_highs.max():
-            df.loc[df.index[i], 'swing_high'] = True
-        
-        # Swing low: lower than all neighbors in window
-        window_lows = df['Low'].iloc[i-lookback:i+lookback+1]
-        if df['Low'].iloc[i] <= window_lows.min():
-            df.loc[df.index[i], 'swing_low'] = True
+    swing_high, swing_low = swing_arrays(df, lookback=lookback)
     
-    return df
+    return df.assign(swing_high=swing_high, swing_low=swing_low)
 
 
-def map_structure(df: pd.DataFrame) -> pd.DataFrame:
+# Regime codes produced by the structure kernel
+REGIME_NEUTRAL = 0
+REGIME_BULL = 1
+REGIME_BEAR = 2
+
+
+@njit(cache=True)
+def _map_structure_nb(close, swing_high, swing_low, high, low):
     """
-    Map market structure: BOS (Break of Structure) and CHOCH (Change of Character).
-    
-    Walks bars sequentially maintaining regime and detecting structure breaks.
-    
-    Args:
-        df: DataFrame with swing_high and swing_low columns (from swings())
+    Sequential BOS/CHOCH state machine over raw arrays.
     
     Returns:
-        DataFrame with added columns:
-        - bos_up, bos_down: Break of structure events
-        - choch_up, choch_down: Change of character events
-        - swing_high_idx, swing_low_idx: Indices of last confirmed swings
-        - regime: Current regime ('bull' or 'bear')
+        (bos_up, bos_down, choch_up, choch_down, swing_high_idx,
+         swing_low_idx, regime_code) with regime_code as int8
     """
-    df = df.copy()
-    
-    # Initialize structure columns
-    df['bos_up'] = False
-    df['bos_down'] = False
-    df['choch_up'] = False
-    df['choch_down'] = False
-    df['swing_high_idx'] = -1
-    df['swing_low_idx'] = -1
-    df['regime'] = 'neutral'
+    n = len(close)
+    bos_up = np.zeros(n, dtype=np.bool_)
+    bos_down = np.zeros(n, dtype=np.bool_)
+    choch_up = np.zeros(n, dtype=np.bool_)
+    choch_down = np.zeros(n, dtype=np.bool_)
+    sh_idx = np.empty(n, dtype=np.int64)
+    sl_idx = np.empty(n, dtype=np.int64)
+    regime_code = np.empty(n, dtype=np.int8)
     
     # State tracking
-    regime = 'neutral'
+    regime = REGIME_NEUTRAL
     last_swing_high_idx = -1
-    last_swing_high_val = None
+    last_swing_high_val = np.nan
+    has_swing_high = False
     last_swing_low_idx = -1
-    last_swing_low_val = None
+    last_swing_low_val = np.nan
+    has_swing_low = False
     
-    for i in range(len(df)):
-        row = df.iloc[i]
-        current_idx = i
-        
+    for i in range(n):
         # Update swing points
-        if row['swing_high']:
-            last_swing_high_idx = current_idx
-            last_swing_high_val = row['High']
+        if swing_high[i]:
+            last_swing_high_idx = i
+            last_swing_high_val = high[i]
+            has_swing_high = True
         
-        if row['swing_low']:
-            last_swing_low_idx = current_idx
-            last_swing_low_val = row['Low']
+        if swing_low[i]:
+            last_swing_low_idx = i
+            last_swing_low_val = low[i]
+            has_swing_low = True
         
         # Check for structure breaks (require last swings to exist)
-        if last_swing_high_val is not None and last_swing_low_val is not None:
+        if has_swing_high and has_swing_low:
             
             # Break above last swing high
-            if row['Close'] > last_swing_high_val:
-                if regime == 'bull':
-                    # BOS in same direction
-                    df.loc[df.index[i], 'bos_up'] = True
-                elif regime == 'bear':
+            if close[i] > last_swing_high_val:
+                if regime == REGIME_BEAR:
                     # CHOCH - regime flip
-                    df.loc[df.index[i], 'choch_up'] = True
-                    regime = 'bull'
+                    choch_up[i] = True
                 else:
-                    # First break establishes regime
-                    df.loc[df.index[i], 'bos_up'] = True
-                    regime = 'bull'
+                    # BOS in same direction (first break establishes regime)
+                    bos_up[i] = True
+                regime = REGIME_BULL
             
             # Break below last swing low
-            elif row['Close'] < last_swing_low_val:
-                if regime == 'bear':
-                    # BOS in same direction
-                    df.loc[df.index[i], 'bos_down'] = True
-                elif regime == 'bull':
+            elif close[i] < last_swing_low_val:
+                if regime == REGIME_BULL:
                     # CHOCH - regime flip
-                    df.loc[df.index[i], 'choch_down'] = True
-                    regime = 'bear'
+                    choch_down[i] = True
                 else:
-                    # First break establishes regime
-                    df.loc[df.index[i], 'bos_down'] = True
-                    regime = 'bear'
+                    # BOS in same direction (first break establishes regime)
+                    bos_down[i] = True
+                regime = REGIME_BEAR
         
         # Record current state
-        df.loc[df.index[i], 'swing_high_idx'] = last_swing_high_idx
-        df.loc[df.index[i], 'swing_low_idx'] = last_swing_low_idx
-        df.loc[df.index[i], 'regime'] = regime
+        sh_idx[i] = last_swing_high_idx
+        sl_idx[i] = last_swing_low_idx
+        regime_code[i] = regime
+    
+    return bos_up, bos_down, choch_up, choch_down, sh_idx, sl_idx, regime_code
+
+
+def map_structure(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Map market structure: BOS (Break of Structure) and CHOCH (Change of Character).
+    
+    Walks bars sequentially maintaining regime and detecting structure breaks.
+    
+    Args:
+        df: DataFrame with swing_high and swing_low columns (from swings())
+    
+    Returns:
+        DataFrame with added columns:
+        - bos_up, bos_down: Break of structure events
+        - choch_up, choch_down: Change of character events
+        - swing_high_idx, swing_low_idx: Indices of last confirmed swings
+        - regime: Current regime ('bull' or 'bear')
+    """
+    # Pull the inputs out as raw arrays once; the kernel indexes them directly
+    close = df['Close'].to_numpy(dtype=np.float64)
+    sh = df['swing_high'].to_numpy(dtype=np.bool_)
+    sl = df['swing_low'].to_numpy(dtype=np.bool_)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    
+    (bos_up, bos_down, choch_up, choch_down,
+     sh_idx, sl_idx, regime_code) = _map_structure_nb(close, sh, sl, high, low)
+    
+    regime = np.where(regime_code == REGIME_BULL, 'bull',
+                      np.where(regime_code == REGIME_BEAR, 'bear', 'neutral')).astype(object)
     
-    return df
+    # Attach all outputs in one shot (no up-front copy of the input frame)
+    return df.assign(bos_up=bos_up, bos_down=bos_down,
+                     choch_up=choch_up, choch_down=choch_down,
+                     swing_high_idx=sh_idx, swing_low_idx=sl_idx,
+                     regime=regime)
+
+
+def ohlc_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Open, High, Low, Close as float64 arrays (for repeated tag_order_block calls)."""
+    return tuple(df[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close'))
 
 
 def tag_order_block(
     df: pd.DataFrame,
     event_idx: int,
     side: str,
-    use_body: bool = True
+    use_body: bool = True,
+    ohlc: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
 ) -> Tuple[float, float, float]:
     """
     Tag order block (OB) that caused a structure event.
@@ -139,6 +262,8 @@ def tag_order_block(
         event_idx: Index where BOS/CHOCH occurred
         side: 'bearish' for supply OB (before down move), 'bullish' for demand OB
         use_body: Use candle body (open/close) vs full range (high/low)
+        ohlc: Precomputed ohlc_arrays(df), so callers tagging many events
+            don't convert the columns on every call
     
     Returns:
         Tuple of (ob_low, ob_high, ob_mid)
@@ -146,48 +271,39 @@ def tag_order_block(
     if event_idx < 1:
         return (None, None, None)
     
-    # Look back for the last opposite candle before the event
+    open_, high, low, close = ohlc if ohlc is not None else ohlc_arrays(df)
+    
+    # Candidate candles: up to 9 bars before the event (bar 0 excluded)
+    lo = max(0, event_idx - 10) + 1
+    hi = event_idx
     if side == 'bearish':
         # Find last bullish candle before bearish impulse
-        for i in range(event_idx - 1, max(0, event_idx - 10), -1):
-            candle = df.iloc[i]
-            if candle['Close'] > candle['Open']:  # Bullish candle
-                if use_body:
-                    ob_low = min(candle['Open'], candle['Close'])
-                    ob_high = max(candle['Open'], candle['Close'])
-                else:
-                    ob_low = candle['Low']
-                    ob_high = candle['High']
-                
-                # Ensure minimum height
-                if ob_high - ob_low < 1e-6:
-                    ob_low = candle['Low']
-                    ob_high = candle['High']
-                
-                ob_mid = (ob_low + ob_high) / 2.0
-                return (ob_low, ob_high, ob_mid)
-    
+        mask = close[lo:hi] > open_[lo:hi]
     elif side == 'bullish':
         # Find last bearish candle before bullish impulse
-        for i in range(event_idx - 1, max(0, event_idx - 10), -1):
-            candle = df.iloc[i]
-            if candle['Close'] < candle['Open']:  # Bearish candle
-                if use_body:
-                    ob_low = min(candle['Open'], candle['Close'])
-                    ob_high = max(candle['Open'], candle['Close'])
-                else:
-                    ob_low = candle['Low']
-                    ob_high = candle['High']
-                
-                # Ensure minimum height
-                if ob_high - ob_low < 1e-6:
-                    ob_low = candle['Low']
-                    ob_high = candle['High']
-                
-                ob_mid = (ob_low + ob_high) / 2.0
-                return (ob_low, ob_high, ob_mid)
-    
-    return (None, None, None)
+        mask = close[lo:hi] < open_[lo:hi]
+    else:
+        return (None, None, None)
+    
+    hits = np.flatnonzero(mask)
+    if len(hits) == 0:
+        return (None, None, None)
+    k = lo + hits[-1]
+    
+    if use_body:
+        ob_low = min(open_[k], close[k])
+        ob_high = max(open_[k], close[k])
+    else:
+        ob_low = low[k]
+        ob_high = high[k]
+    
+    # Ensure minimum height
+    if ob_high - ob_low < 1e-6:
+        ob_low = low[k]
+        ob_high = high[k]
+    
+    ob_mid = (ob_low + ob_high) / 2.0
+    return (ob_low, ob_high, ob_mid)
 
 
 def in_zone(price: float, low: float, high: float, tol: float = 0.0) -> bool:
@@ -0,0 +1,42 @@
+"""
+Compiled kernels for the signal scanner.
+
+Decorated with ``njit`` from axfl.core.jit, so they run as plain Python over
+NumPy arrays when numba is not installed.
+"""
+import numpy as np
+
+from axfl.core.jit import njit
+
+
+@njit(cache=True, nogil=True)
+def first_hit_per_day(hit: np.ndarray, day: np.ndarray, max_events: int) -> np.ndarray:
+    """
+    Positions of the first True in hit for each day, in bar order.
+    
+    Each step finds the next hit with argmax on the remaining mask, then
+    jumps past the rest of that day with searchsorted, so only one mask scan
+    and one binary search run per returned day. Stops as soon as max_events
+    days have been found.
+    
+    Args:
+        hit: Boolean mask per bar
+        day: Integer day key per bar, non-decreasing
+        max_events: Maximum number of days to return
+        
+    Returns:
+        int64 array of bar positions (at most max_events long)
+    """
+    cap = max(max_events, 0)
+    out = np.empty(cap, dtype=np.int64)
+    n = len(hit)
+    k = 0
+    start = 0
+    while k < cap and start < n:
+        i = start + np.argmax(hit[start:])
+        if not hit[i]:
+            break
+        out[k] = i
+        k += 1
+        start = np.searchsorted(day, day[i], side='right')
+    return out[:k]
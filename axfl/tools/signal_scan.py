@@ -8,9 +8,15 @@ Modes:
 4. auto: Try exact → heuristic → volatility until windows found
 """
 
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 
 from axfl.data.provider import DataProvider
@@ -19,6 +25,7 @@ from axfl.strategies.orb import ORBStrategy
 from axfl.strategies.arls import ARLSStrategy
 from axfl.config.defaults import get_strategy_defaults, resolve_params
 from axfl.core.backtester import Backtester
+from axfl.tools._scan_kernels import first_hit_per_day
 
 
 STRATEGY_MAP = {
@@ -27,6 +34,12 @@ STRATEGY_MAP = {
     "arls": ARLSStrategy,
 }
 
+# Raw 1m fetches shared by scans within the same minute (see _get_intraday_cached)
+_FETCH_TTL_S = 60
+_FETCH_CACHE_SIZE = 64
+_FETCH_CACHE: dict[tuple, pd.DataFrame] = {}
+_FETCH_LOCK = threading.Lock()
+
 
 def windows_from_backtest(
     df_5m: pd.DataFrame,
@@ -58,34 +71,29 @@ def windows_from_backtest(
         return [], {}
     
     try:
-        # Run backtester
-        backtester = Backtester(
-            strategy_class=strategy_cls,
-            df=df_5m.copy(),
-            symbol=symbol,
-            params=params,
-            spread_pips=0.6,  # Minimal for scanning
-        )
+        # Run backtester (reads df_5m without mutating it, so no copy)
+        strategy = strategy_cls(symbol, params)
+        backtester = Backtester(symbol, spread_pips=0.6)  # Minimal for scanning
         
-        metrics = backtester.run()
+        backtester.run(df_5m, strategy)
         trades = backtester.trades
         
         if not trades:
             return [], params
         
         # Convert trades to windows (most recent first)
+        pad_before = pd.Timedelta(minutes=pad_before_m)
+        pad_after = pd.Timedelta(minutes=pad_after_m)
+        cap = pd.Timedelta(hours=3)
         windows = []
-        for trade in reversed(trades[-max_events:]):
+        for trade in trades[:-max_events - 1:-1]:
             entry_time = trade['entry_time']
-            exit_time = trade.get('exit_time', entry_time + pd.Timedelta('3h'))
+            exit_time = trade.get('exit_time', entry_time + cap)
             
             # Build window
-            start = entry_time - pd.Timedelta(f"{pad_before_m}min")
+            start = entry_time - pad_before
             # Bound end to max 3h from entry or pad_after after exit
-            end = min(
-                exit_time + pd.Timedelta(f"{pad_after_m}min"),
-                entry_time + pd.Timedelta("3h")
-            )
+            end = min(exit_time + pad_after, entry_time + cap)
             
             windows.append({
                 "start": start.isoformat(),
@@ -100,6 +108,47 @@ def windows_from_backtest(
         return [], params
 
 
+def _day_extremes(session: pd.DataFrame, days: pd.DatetimeIndex) -> pd.DataFrame:
+    """Per-day high max / low min of a session slice, indexed by normalized day."""
+    return session.groupby(days).agg(day_high=("high", "max"), day_low=("low", "min"))
+
+
+def _session_slice(
+    df_5m: pd.DataFrame, days: pd.DatetimeIndex, start: str, end: str
+) -> tuple[pd.DataFrame, pd.DatetimeIndex]:
+    """Bars between start and end (inclusive, wall clock) and their day keys."""
+    pos = df_5m.index.indexer_between_time(start, end)
+    return df_5m.iloc[pos], days[pos]
+
+
+def _first_hit_windows(
+    bars: pd.DataFrame,
+    hit: np.ndarray,
+    days: pd.DatetimeIndex,
+    recent_days: np.ndarray,
+    max_events: int,
+    pad_before_m: int,
+    pad_after_m: int,
+) -> list[dict]:
+    """
+    Windows around the first hit bar of each recent day, oldest day first,
+    for at most max_events days.
+    """
+    hit = hit & days.isin(recent_days)
+    first_bars = bars.index[first_hit_per_day(hit, days.asi8, max_events)]
+    pad_before = pd.Timedelta(minutes=pad_before_m)
+    pad_after = pd.Timedelta(minutes=pad_after_m)
+    
+    return [
+        {
+            "start": (idx - pad_before).isoformat(),
+            "end": (idx + pad_after).isoformat(),
+            "bar": idx.isoformat(),
+        }
+        for idx in first_bars
+    ]
+
+
 def windows_from_heuristics(
     df_5m: pd.DataFrame,
     strategy_name: str,
@@ -117,6 +166,11 @@ def windows_from_heuristics(
     - ORB: Opening range >= 3 pips at 07:05, first break beyond by >=2 pips
     - ARLS: Asia range formed, price wicks outside then closes back within 45m
     
+    Each heuristic is evaluated for all of the last 30 days at once: the
+    index is normalized to days once, per-day session levels come from one
+    groupby on those keys and are broadcast onto the London bars, then the
+    first qualifying bar of each day is kept.
+    
     Args:
         df_5m: DataFrame with OHLCV at 5m interval (UTC)
         strategy_name: Strategy name ("lsg", "orb", "arls")
@@ -135,111 +189,57 @@ def windows_from_heuristics(
     windows = []
     
     try:
-        if strategy_name == "lsg":
-            # LSG heuristic: Equal highs/lows + sweeps
-            for date in pd.unique(df_5m.index.date)[-30:]:  # Last 30 days
-                day_df = df_5m[df_5m.index.date == date]
-                
-                # Asia session (00:00-06:59 UTC)
-                asia = day_df.between_time('00:00', '06:59')
-                # London session (07:00-10:00 UTC)
-                london = day_df.between_time('07:00', '10:00')
-                
-                if asia.empty or london.empty:
-                    continue
-                
-                # Find equal highs (within 2 pips)
-                asia_high = asia['high'].max()
-                asia_low = asia['low'].min()
-                pip_value = 0.0001 if 'JPY' not in symbol else 0.01
-                
-                # Check if London swept highs or lows
-                for idx, row in london.iterrows():
-                    swept_high = row['high'] > asia_high + 3 * pip_value
-                    swept_low = row['low'] < asia_low - 3 * pip_value
-                    
-                    if swept_high or swept_low:
-                        start = idx - pd.Timedelta(f"{pad_before_m}min")
-                        end = idx + pd.Timedelta(f"{pad_after_m}min")
-                        windows.append({
-                            "start": start.isoformat(),
-                            "end": end.isoformat(),
-                            "bar": idx.isoformat(),
-                        })
-                        break  # One per day
-                
-                if len(windows) >= max_events:
-                    break
+        # Day key per bar, computed once; session slices take their keys
+        # from it by position instead of re-normalizing
+        all_days = df_5m.index.normalize()
+        recent_days = pd.unique(all_days)[-30:]  # Last 30 days
+        pip_value = 0.0001 if 'JPY' not in symbol else 0.01
+        
+        if strategy_name in ("lsg", "arls"):
+            # Asia session (00:00-06:59 UTC) levels per day, broadcast onto
+            # the London session (07:00-10:00 UTC) bars; days without Asia
+            # bars have NaN levels and never match
+            asia = _day_extremes(*_session_slice(df_5m, all_days, '00:00', '06:59'))
+            london, days = _session_slice(df_5m, all_days, '07:00', '10:00')
+            asia_high = asia["day_high"].reindex(days).to_numpy()
+            asia_low = asia["day_low"].reindex(days).to_numpy()
+            high = london['high'].to_numpy()
+            low = london['low'].to_numpy()
+            
+            if strategy_name == "lsg":
+                # LSG heuristic: London swept the Asia highs or lows
+                hit = ((high > asia_high + 3 * pip_value) |
+                       (low < asia_low - 3 * pip_value))
+            else:
+                # ARLS heuristic: wick outside the Asia range, close back in
+                close = london['close'].to_numpy()
+                hit = (((high > asia_high) & (close < asia_high)) |
+                       ((low < asia_low) & (close > asia_low)))
+            
+            windows = _first_hit_windows(
+                london, hit, days, recent_days,
+                max_events, pad_before_m, pad_after_m
+            )
         
         elif strategy_name == "orb":
             # ORB heuristic: Opening range width >= 3 pips, breakout >= 2 pips
-            for date in pd.unique(df_5m.index.date)[-30:]:
-                day_df = df_5m[df_5m.index.date == date]
-                
-                # Opening range at 07:05
-                orb_start = day_df.between_time('07:00', '07:05')
-                if orb_start.empty:
-                    continue
-                
-                orb_high = orb_start['high'].max()
-                orb_low = orb_start['low'].min()
-                orb_range = orb_high - orb_low
-                
-                pip_value = 0.0001 if 'JPY' not in symbol else 0.01
-                
-                if orb_range < 3 * pip_value:
-                    continue  # Range too small
-                
-                # Check for breakout in London session
-                london = day_df.between_time('07:05', '10:00')
-                for idx, row in london.iterrows():
-                    broke_high = row['close'] > orb_high + 2 * pip_value
-                    broke_low = row['close'] < orb_low - 2 * pip_value
-                    
-                    if broke_high or broke_low:
-                        start = idx - pd.Timedelta(f"{pad_before_m}min")
-                        end = idx + pd.Timedelta(f"{pad_after_m}min")
-                        windows.append({
-                            "start": start.isoformat(),
-                            "end": end.isoformat(),
-                            "bar": idx.isoformat(),
-                        })
-                        break
-                
-                if len(windows) >= max_events:
-                    break
-        
-        elif strategy_name == "arls":
-            # ARLS heuristic: Asia range, wick outside + close back in
-            for date in pd.unique(df_5m.index.date)[-30:]:
-                day_df = df_5m[df_5m.index.date == date]
-                
-                asia = day_df.between_time('00:00', '06:59')
-                london = day_df.between_time('07:00', '10:00')
-                
-                if asia.empty or london.empty:
-                    continue
-                
-                asia_high = asia['high'].max()
-                asia_low = asia['low'].min()
-                
-                # Look for wick outside then close back in
-                for idx, row in london.iterrows():
-                    wicked_high = row['high'] > asia_high and row['close'] < asia_high
-                    wicked_low = row['low'] < asia_low and row['close'] > asia_low
-                    
-                    if wicked_high or wicked_low:
-                        start = idx - pd.Timedelta(f"{pad_before_m}min")
-                        end = idx + pd.Timedelta(f"{pad_after_m}min")
-                        windows.append({
-                            "start": start.isoformat(),
-                            "end": end.isoformat(),
-                            "bar": idx.isoformat(),
-                        })
-                        break
-                
-                if len(windows) >= max_events:
-                    break
+            # Opening range at 07:05
+            orb = _day_extremes(*_session_slice(df_5m, all_days, '07:00', '07:05'))
+            orb_range = orb["day_high"] - orb["day_low"]
+            orb = orb[~(orb_range < 3 * pip_value)]  # Range too small
+            
+            # Check for breakout in London session
+            london, days = _session_slice(df_5m, all_days, '07:05', '10:00')
+            orb_high = orb["day_high"].reindex(days).to_numpy()
+            orb_low = orb["day_low"].reindex(days).to_numpy()
+            close = london['close'].to_numpy()
+            broke_high = close > orb_high + 2 * pip_value
+            broke_low = close < orb_low - 2 * pip_value
+            
+            windows = _first_hit_windows(
+                london, broke_high | broke_low, days, recent_days,
+                max_events, pad_before_m, pad_after_m
+            )
     
     except Exception as e:
         pass  # Return whatever we found
@@ -271,20 +271,31 @@ def windows_from_volatility(
     windows = []
     
     try:
-        # Calculate daily ATR (using true range approximation)
-        df_5m['tr'] = df_5m['high'] - df_5m['low']
-        daily_atr = df_5m.groupby(df_5m.index.date)['tr'].mean()
+        # Calculate daily ATR (using true range approximation) on raw arrays,
+        # grouped by calendar day as datetime64[D] keys (no date objects, and
+        # the caller's frame is left untouched)
+        tr = df_5m['high'].to_numpy() - df_5m['low'].to_numpy()
+        idx = df_5m.index
+        wall = idx.tz_localize(None) if idx.tz is not None else idx
+        day_key = wall.values.astype('datetime64[D]')
+        daily_atr = pd.Series(tr).groupby(day_key).mean()
         
         # Get top N days by ATR
         top_dates = daily_atr.nlargest(max_days).index
         
+        london_open = pd.Timedelta(hours=7)
+        london_close = pd.Timedelta(hours=10)
+        pad_before = pd.Timedelta(minutes=pad_before_m)
+        pad_after = pd.Timedelta(minutes=pad_after_m)
+        
         for date in sorted(top_dates, reverse=True):
             # Create window for London session
-            london_start = pd.Timestamp(f"{date} 07:00:00", tz='UTC')
-            london_end = pd.Timestamp(f"{date} 10:00:00", tz='UTC')
+            day_start = pd.Timestamp(date, tz='UTC')
+            london_start = day_start + london_open
+            london_end = day_start + london_close
             
-            start = london_start - pd.Timedelta(f"{pad_before_m}min")
-            end = london_end + pd.Timedelta(f"{pad_after_m}min")
+            start = london_start - pad_before
+            end = london_end + pad_after
             
             windows.append({
                 "start": start.isoformat(),
@@ -298,6 +309,184 @@ def windows_from_volatility(
     return windows
 
 
+@lru_cache(maxsize=256)
+def _scan_params(strategy_name: str, symbol: str) -> dict:
+    """
+    Scan parameters for a strategy/symbol pair on 5m bars.
+    
+    Scans take no user overrides, so the result depends only on the pair
+    and is cached for the life of the process. Callers must not mutate it.
+    """
+    # Resolve params using resolve_params for proper defaults + overrides
+    try:
+        return resolve_params(
+            base_params=None,  # No user overrides in scan
+            strategy=strategy_name,
+            symbol=symbol,
+            interval="5m"
+        )
+    except Exception:
+        # Fallback to get_strategy_defaults
+        try:
+            return get_strategy_defaults(strategy_name, symbol, "5m") or {}
+        except Exception:
+            return {}
+
+
+def _scan_one(task: tuple) -> tuple[Optional[dict], str]:
+    """
+    Find windows for one (symbol, strategy) pair.
+    
+    Module-level so it can run in a worker process: the task carries only
+    plain data and the strategy is looked up by name in the worker.
+    
+    Args:
+        task: (symbol, strategy_name, df_5m, method, top, pad_before_m, pad_after_m)
+        
+    Returns:
+        Tuple of (target entry or None, debug line)
+    """
+    symbol, strategy_name, df_5m, method, top, pad_before_m, pad_after_m = task
+    strategy_cls = STRATEGY_MAP[strategy_name]
+    
+    # Copy so the strategy or the target entry never alias the cached dict
+    params = dict(_scan_params(strategy_name, symbol))
+    
+    # Find windows based on method
+    windows = []
+    params_used = None
+    method_used = method
+    
+    if method == "exact":
+        windows, params_used = windows_from_backtest(
+            df_5m, strategy_cls, symbol, params,
+            max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+        )
+    elif method == "heuristic":
+        windows = windows_from_heuristics(
+            df_5m, strategy_name, symbol, params,
+            max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+        )
+    elif method == "volatility":
+        windows = windows_from_volatility(
+            df_5m, max_days=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+        )
+    elif method == "auto":
+        # Try exact first
+        windows, params_used = windows_from_backtest(
+            df_5m, strategy_cls, symbol, params,
+            max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+        )
+        method_used = "exact"
+        
+        # If empty, try heuristic
+        if not windows:
+            windows = windows_from_heuristics(
+                df_5m, strategy_name, symbol, params,
+                max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+            )
+            method_used = "heuristic"
+            params_used = None  # Don't embed params for heuristic
+        
+        # If still empty, try volatility
+        if not windows:
+            windows = windows_from_volatility(
+                df_5m, max_days=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
+            )
+            method_used = "volatility"
+            params_used = None
+    
+    debug_line = f"{symbol}/{strategy_name}: {len(windows)} windows found (method: {method_used})"
+    
+    if not windows:
+        return None, debug_line
+    
+    target_entry = {
+        "symbol": symbol,
+        "strategy": strategy_name,
+        "windows": windows[:top],  # Cap to top
+    }
+    
+    # Include params only for exact method
+    if method == "exact" and params_used:
+        target_entry["params"] = params_used
+    elif method_used == "exact" and params_used:  # For auto that used exact
+        target_entry["params"] = params_used
+    
+    return target_entry, debug_line
+
+
+def _get_intraday_cached(provider: DataProvider, symbol: str, days: int) -> pd.DataFrame:
+    """
+    provider.get_intraday for 1m bars, reusing a fetch from the same minute.
+    
+    Entries are keyed on (source, venue, symbol, days, minute bucket), so
+    repeated scans within a minute hit memory instead of the network and a
+    new minute always refetches. Failed fetches are not cached.
+    """
+    bucket = int(time.time() // _FETCH_TTL_S)
+    key = (provider.source, provider.venue, symbol, days, bucket)
+    with _FETCH_LOCK:
+        cached = _FETCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    df_1m = provider.get_intraday(
+        symbol=symbol,
+        interval="1min",
+        days=days,
+    )
+    
+    with _FETCH_LOCK:
+        # Drop entries from earlier minutes, then bound the size (oldest first)
+        for stale in [k for k in _FETCH_CACHE if k[-1] != bucket]:
+            del _FETCH_CACHE[stale]
+        while len(_FETCH_CACHE) >= _FETCH_CACHE_SIZE:
+            del _FETCH_CACHE[next(iter(_FETCH_CACHE))]
+        _FETCH_CACHE[key] = df_1m
+    return df_1m
+
+
+def _fetch_5m(provider: DataProvider, symbol: str, days: int) -> tuple[Optional[pd.DataFrame], str]:
+    """
+    Fetch 1m bars for one symbol and resample them to 5m.
+    
+    Returns:
+        Tuple of (5m frame or None when nothing usable was fetched, debug line)
+    """
+    try:
+        df_1m = _get_intraday_cached(provider, symbol, days)
+        
+        if df_1m.empty:
+            return None, f"{symbol}: no data fetched"
+        
+        # Resample to 5m (handle both lowercase and uppercase column names)
+        col_map = {}
+        for col in df_1m.columns:
+            col_lower = col.lower()
+            if col_lower != col and col_lower in ['open', 'high', 'low', 'close', 'volume']:
+                col_map[col] = col_lower
+        
+        # Rename in place (no frame copy); a cached frame keeps the
+        # lowercase names, so later scans skip this entirely
+        if col_map:
+            df_1m.rename(columns=col_map, inplace=True)
+        
+        df_5m = df_1m.resample("5min").agg({
+            "open": "first",
+            "high": "max",
+            "low": "min",
+            "close": "last",
+            "volume": "sum",
+        }).dropna()
+        
+        return df_5m, f"{symbol}: {len(df_5m)} bars from {df_5m.index[0]} to {df_5m.index[-1]}"
+        
+    except Exception as e:
+        # Skip symbols that fail to fetch
+        return None, f"{symbol}: fetch error - {e}"
+
+
 def scan_symbols(
     symbols: list[str],
     strategies: list[str],
@@ -309,10 +498,15 @@ def scan_symbols(
     top: int = 3,
     pad_before_m: int = 30,
     pad_after_m: int = 120,
+    workers: Optional[int] = None,
 ) -> dict:
     """
     Scan multiple symbols/strategies for signal triggers.
     
+    Symbols are fetched concurrently in a thread pool, then each
+    symbol/strategy pair is scanned independently; with more than one pair
+    the scans run in a process pool.
+    
     Args:
         symbols: List of symbols (e.g., ["EURUSD", "GBPUSD"])
         strategies: List of strategy names (e.g., ["lsg", "orb", "arls"])
@@ -324,6 +518,7 @@ def scan_symbols(
         top: Maximum windows per symbol/strategy pair
         pad_before_m: Minutes before signal
         pad_after_m: Minutes after signal
+        workers: Worker processes (default: CPU count; 1 scans in-process)
         
     Returns:
         Dict with meta and targets:
@@ -340,128 +535,46 @@ def scan_symbols(
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    targets = []
-    debug_info = []
+    # Debug lines per symbol: fetch result first, then one per strategy
+    debug_blocks = []
+    tasks = []
+    task_blocks = []
     
-    for symbol in symbols:
-        # Fetch 1m data and resample to 5m
-        try:
-            df_1m = provider.get_intraday(
-                symbol=symbol,
-                interval="1min",
-                days=days,
-            )
-            
-            if df_1m.empty:
-                debug_info.append(f"{symbol}: no data fetched")
-                continue
-            
-            # Resample to 5m (handle both lowercase and uppercase column names)
-            col_map = {}
-            for col in df_1m.columns:
-                col_lower = col.lower()
-                if col_lower in ['open', 'high', 'low', 'close', 'volume']:
-                    col_map[col] = col_lower
-            
-            df_1m_renamed = df_1m.rename(columns=col_map)
-            
-            df_5m = df_1m_renamed.resample("5min").agg({
-                "open": "first",
-                "high": "max",
-                "low": "min",
-                "close": "last",
-                "volume": "sum",
-            }).dropna()
-            
-            debug_info.append(f"{symbol}: {len(df_5m)} bars from {df_5m.index[0]} to {df_5m.index[-1]}")
-            
-        except Exception as e:
-            # Skip symbols that fail to fetch
-            debug_info.append(f"{symbol}: fetch error - {e}")
+    # Fetches are network-bound: overlap them in threads, keeping symbol order
+    if symbols:
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols))) as executor:
+            fetched = list(executor.map(lambda sym: _fetch_5m(provider, sym, days), symbols))
+    else:
+        fetched = []
+    
+    for symbol, (df_5m, fetch_line) in zip(symbols, fetched):
+        debug_blocks.append([fetch_line])
+        if df_5m is None:
             continue
         
         for strategy_name in strategies:
-            strategy_cls = STRATEGY_MAP.get(strategy_name)
-            if not strategy_cls:
-                continue
-            
-            # Resolve params using resolve_params for proper defaults + overrides
-            try:
-                params = resolve_params(
-                    base_params=None,  # No user overrides in scan
-                    strategy=strategy_name,
-                    symbol=symbol,
-                    interval="5m"
-                )
-            except Exception:
-                # Fallback to get_strategy_defaults
-                try:
-                    params = get_strategy_defaults(strategy_name, symbol, "5m")
-                    if not params:
-                        params = {}
-                except Exception:
-                    params = {}
-            
-            # Find windows based on method
-            windows = []
-            params_used = None
-            method_used = method
-            
-            if method == "exact":
-                windows, params_used = windows_from_backtest(
-                    df_5m, strategy_cls, symbol, params,
-                    max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                )
-            elif method == "heuristic":
-                windows = windows_from_heuristics(
-                    df_5m, strategy_name, symbol, params,
-                    max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                )
-            elif method == "volatility":
-                windows = windows_from_volatility(
-                    df_5m, max_days=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                )
-            elif method == "auto":
-                # Try exact first
-                windows, params_used = windows_from_backtest(
-                    df_5m, strategy_cls, symbol, params,
-                    max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                )
-                method_used = "exact"
-                
-                # If empty, try heuristic
-                if not windows:
-                    windows = windows_from_heuristics(
-                        df_5m, strategy_name, symbol, params,
-                        max_events=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                    )
-                    method_used = "heuristic"
-                    params_used = None  # Don't embed params for heuristic
-                
-                # If still empty, try volatility
-                if not windows:
-                    windows = windows_from_volatility(
-                        df_5m, max_days=top, pad_before_m=pad_before_m, pad_after_m=pad_after_m
-                    )
-                    method_used = "volatility"
-                    params_used = None
-            
-            debug_info.append(f"{symbol}/{strategy_name}: {len(windows)} windows found (method: {method_used})")
-            
-            if windows:
-                target_entry = {
-                    "symbol": symbol,
-                    "strategy": strategy_name,
-                    "windows": windows[:top],  # Cap to top
-                }
-                
-                # Include params only for exact method
-                if method == "exact" and params_used:
-                    target_entry["params"] = params_used
-                elif method_used == "exact" and params_used:  # For auto that used exact
-                    target_entry["params"] = params_used
-                
-                targets.append(target_entry)
+            if strategy_name in STRATEGY_MAP:
+                tasks.append((symbol, strategy_name, df_5m, method, top,
+                              pad_before_m, pad_after_m))
+                task_blocks.append(debug_blocks[-1])
+    
+    # Pairs are independent and CPU-bound: fan them out across processes
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_one, tasks, chunksize=4))
+    else:
+        results = [_scan_one(task) for task in tasks]
+    
+    targets = []
+    for block, (target_entry, debug_line) in zip(task_blocks, results):
+        block.append(debug_line)
+        if target_entry is not None:
+            targets.append(target_entry)
+    
+    debug_info = [line for block in debug_blocks for line in block]
     
     # Print debug info to stderr
     import sys
@@ -1,9 +1,13 @@
 """
 Walk-forward grid search tuner with purged cross-validation.
 """
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from itertools import product
 from datetime import timedelta
 
@@ -11,27 +15,115 @@ from ..core.backtester import Backtester
 from ..core.metrics import compute_metrics
 
 
-def param_grid_product(param_grid: Dict[str, List]) -> List[Dict]:
+def param_grid_product(param_grid: Dict[str, List]) -> Iterator[Dict]:
     """
     Generate all combinations from parameter grid.
     
+    Combinations are produced lazily; use param_grid_size() for the count.
+    An empty grid yields a single empty dict.
+    
     Args:
         param_grid: Dictionary mapping param names to lists of values
     
     Returns:
-        List of parameter dictionaries
+        Iterator of parameter dictionaries
+    """
+    keys = list(param_grid)
+    return (dict(zip(keys, combo)) for combo in product(*(param_grid[k] for k in keys)))
+
+
+def param_grid_size(param_grid: Dict[str, List]) -> int:
+    """Number of combinations param_grid_product() yields for param_grid."""
+    return math.prod(len(v) for v in param_grid.values())
+
+
+# Per-process evaluation context, set once by the pool initializer so each
+# task only ships its params rather than the whole frame
+_worker_ctx: Dict[str, Any] = {}
+
+
+def _init_worker(folds: List[Dict], fold_dfs: List[pd.DataFrame], strategy_class: Any,
+                 symbol: str, spread_pips: float) -> None:
+    """Pool initializer: keep the shared tuning inputs in this process."""
+    _worker_ctx.update(folds=folds, fold_dfs=fold_dfs, strategy_class=strategy_class,
+                       symbol=symbol, spread_pips=spread_pips)
+
+
+def _evaluate_in_worker(params: Dict) -> Optional[Dict]:
+    """Worker entry point: evaluate params against the initializer's context."""
+    return _evaluate_params(params, **_worker_ctx)
+
+
+def _evaluate_params(params: Dict,
+                     folds: List[Dict],
+                     fold_dfs: List[pd.DataFrame],
+                     strategy_class: Any,
+                     symbol: str,
+                     spread_pips: float) -> Optional[Dict]:
     """
-    if not param_grid:
-        return [{}]
+    Backtest one parameter combination on every test fold.
     
-    keys = list(param_grid.keys())
-    values = list(param_grid.values())
+    Args:
+        params: Strategy parameters
+        folds: Fold descriptors from tune_strategy
+        fold_dfs: Test slice for each fold (read-only, shared across params)
+        strategy_class: Strategy class to instantiate
+        symbol: Trading symbol
+        spread_pips: Spread cost in pips
     
-    combinations = []
-    for combo in product(*values):
-        combinations.append(dict(zip(keys, combo)))
+    Returns:
+        Aggregated result dict, or None if no fold could be evaluated
+    """
+    fold_scores = []
     
-    return combinations
+    for fold_info, test_df in zip(folds, fold_dfs):
+        # Test on fold (we don't "train" anything, just evaluate)
+        if len(test_df) < 10:
+            continue
+        
+        try:
+            # Run backtest on test fold
+            strategy = strategy_class(symbol, params)
+            backtester = Backtester(symbol, spread_pips=spread_pips)
+            trades_df, equity_curve_df, metrics = backtester.run(test_df, strategy)
+            
+            fold_scores.append({
+                'fold': fold_info['fold'],
+                'sharpe': metrics.get('sharpe', 0.0),
+                'total_return': metrics.get('total_return', 0.0),
+                'max_drawdown': metrics.get('max_drawdown', 0.0),
+                'trade_count': metrics.get('trade_count', 0),
+                'win_rate': metrics.get('win_rate', 0.0),
+            })
+        except Exception as e:
+            # Skip failed backtests
+            fold_scores.append({
+                'fold': fold_info['fold'],
+                'sharpe': -999,
+                'total_return': -999,
+                'max_drawdown': 1.0,
+                'trade_count': 0,
+                'win_rate': 0.0,
+                'error': str(e),
+            })
+    
+    # Aggregate fold scores
+    if len(fold_scores) == 0:
+        return None
+    
+    avg_sharpe = np.mean([f['sharpe'] for f in fold_scores if f['sharpe'] > -900])
+    avg_return = np.mean([f['total_return'] for f in fold_scores if f['total_return'] > -900])
+    avg_dd = np.mean([f['max_drawdown'] for f in fold_scores])
+    total_trades = sum([f['trade_count'] for f in fold_scores])
+    
+    return {
+        'params': params,
+        'avg_sharpe': avg_sharpe,
+        'avg_return': avg_return,
+        'avg_dd': avg_dd,
+        'total_trades': total_trades,
+        'folds': fold_scores,
+    }
 
 
 def tune_strategy(df: pd.DataFrame, 
@@ -40,7 +132,8 @@ def tune_strategy(df: pd.DataFrame,
                  param_grid: Dict[str, List],
                  cv_splits: int = 4,
                  purge_minutes: int = 60,
-                 spread_pips: float = 0.6) -> Dict[str, Any]:
+                 spread_pips: float = 0.6,
+                 workers: Optional[int] = None) -> Dict[str, Any]:
     """
     Walk-forward parameter tuning with purged cross-validation.
     
@@ -52,14 +145,15 @@ def tune_strategy(df: pd.DataFrame,
         cv_splits: Number of CV folds
         purge_minutes: Minutes to exclude at fold boundaries
         spread_pips: Spread cost in pips
+        workers: Worker processes (default: CPU count; 1 evaluates in-process)
     
     Returns:
         Dictionary with best_params and fold results
     """
     # Generate all parameter combinations
-    param_combinations = param_grid_product(param_grid)
+    n_combinations = param_grid_size(param_grid)
     
-    if len(param_combinations) == 0:
+    if n_combinations == 0:
         return {'best_params': {}, 'folds': [], 'error': 'Empty param grid'}
     
     # Split data chronologically
@@ -89,63 +183,27 @@ def tune_strategy(df: pd.DataFrame,
             'test_range': (df.index[test_start_idx], df.index[test_end_idx - 1]),
         })
     
-    # Evaluate each parameter combination
-    results = []
-    
-    for params in param_combinations:
-        fold_scores = []
-        
-        for fold_info in folds:
-            train_start, train_end = fold_info['train_idx']
-            test_start, test_end = fold_info['test_idx']
-            
-            # Test on fold (we don't "train" anything, just evaluate)
-            test_df = df.iloc[test_start:test_end].copy()
-            
-            if len(test_df) < 10:
-                continue
-            
-            try:
-                # Run backtest on test fold
-                strategy = strategy_class(symbol, params)
-                backtester = Backtester(symbol, spread_pips=spread_pips)
-                trades_df, equity_curve_df, metrics = backtester.run(test_df, strategy)
-                
-                fold_scores.append({
-                    'fold': fold_info['fold'],
-                    'sharpe': metrics.get('sharpe', 0.0),
-                    'total_return': metrics.get('total_return', 0.0),
-                    'max_drawdown': metrics.get('max_drawdown', 0.0),
-                    'trade_count': metrics.get('trade_count', 0),
-                    'win_rate': metrics.get('win_rate', 0.0),
-                })
-            except Exception as e:
-                # Skip failed backtests
-                fold_scores.append({
-                    'fold': fold_info['fold'],
-                    'sharpe': -999,
-                    'total_return': -999,
-                    'max_drawdown': 1.0,
-                    'trade_count': 0,
-                    'win_rate': 0.0,
-                    'error': str(e),
-                })
-        
-        # Aggregate fold scores
-        if len(fold_scores) > 0:
-            avg_sharpe = np.mean([f['sharpe'] for f in fold_scores if f['sharpe'] > -900])
-            avg_return = np.mean([f['total_return'] for f in fold_scores if f['total_return'] > -900])
-            avg_dd = np.mean([f['max_drawdown'] for f in fold_scores])
-            total_trades = sum([f['trade_count'] for f in fold_scores])
-            
-            results.append({
-                'params': params,
-                'avg_sharpe': avg_sharpe,
-                'avg_return': avg_return,
-                'avg_dd': avg_dd,
-                'total_trades': total_trades,
-                'folds': fold_scores,
-            })
+    # Test slices are built once and shared by every combination. Strategies
+    # and the backtester derive new frames rather than writing to their input,
+    # so plain views are safe - and reusing the same frame objects lets
+    # per-frame indicator caches carry over between combinations.
+    fold_dfs = [df.iloc[fi['test_idx'][0]:fi['test_idx'][1]] for fi in folds]
+    
+    # Evaluate each parameter combination; combinations are independent and
+    # CPU-bound, so with more than one they run in a process pool
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, n_combinations)
+    param_combinations = param_grid_product(param_grid)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(folds, fold_dfs, strategy_class, symbol, spread_pips)) as executor:
+            evaluated = list(executor.map(_evaluate_in_worker, param_combinations))
+    else:
+        evaluated = [_evaluate_params(params, folds, fold_dfs, strategy_class, symbol, spread_pips)
+                     for params in param_combinations]
+    
+    results = [r for r in evaluated if r is not None]
     
     # Rank by sharpe, then return, then drawdown
     if len(results) == 0:
@@ -4,6 +4,12 @@ Pricing utilities for OANDA instrument formatting and calculations.
 Handles pip sizes, price precision, and conversions for broker API compliance.
 """
 
+# Pip sizes for every pipLocation OANDA uses, computed once
+_PIP_SIZES = {loc: 10.0 ** loc for loc in range(-8, 1)}
+
+# %-format strings per displayPrecision, built once
+_PRICE_FORMATS = {p: "%%.%df" % p for p in range(0, 9)}
+
 
 def pip_size_from_location(pip_location: int) -> float:
     """
@@ -21,7 +27,8 @@ def pip_size_from_location(pip_location: int) -> float:
         >>> pip_size_from_location(-2)
         0.01
     """
-    return 10 ** pip_location
+    pip = _PIP_SIZES.get(pip_location)
+    return pip if pip is not None else 10 ** pip_location
 
 
 def fmt_price(value: float, display_precision: int) -> str:
@@ -41,7 +48,10 @@ def fmt_price(value: float, display_precision: int) -> str:
         >>> fmt_price(0.001, 5)
         '0.00100'
     """
-    return f"{value:.{display_precision}f}"
+    fmt = _PRICE_FORMATS.get(display_precision)
+    if fmt is None:
+        return f"{value:.{display_precision}f}"
+    return fmt % value
 
 
 def pips_to_distance(sl_pips: int, pip_location: int) -> float:
@@ -61,4 +71,5 @@ def pips_to_distance(sl_pips: int, pip_location: int) -> float:
         >>> pips_to_distance(20, -2)
         0.2
     """
-    return sl_pips * pip_size_from_location(pip_location)
+    pip = _PIP_SIZES.get(pip_location)
+    return sl_pips * (pip if pip is not None else 10 ** pip_location)
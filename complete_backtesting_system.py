@@ -50,17 +50,29 @@ Usage:
 
 # Phase 1: Setup & Data Fetching
 # ==============================
+import os
+import time
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import yfinance as yf
 from backtesting import Backtest, Strategy
-from backtesting.lib import crossover
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional: fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # Set plotting style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -73,7 +85,7 @@ print("📊 Fetching AAPL data from 2015-2024...")
 # Download AAPL data
 def fetch_stock_data(symbol="AAPL", start="2015-01-01", end="2024-12-31"):
     """
-    Fetch stock data using yfinance
+    Fetch stock data using yfinance (cached for a day under ~/.cache/axfl)
     
     Args:
         symbol (str): Stock symbol
@@ -83,6 +95,16 @@ def fetch_stock_data(symbol="AAPL", start="2015-01-01", end="2024-12-31"):
     Returns:
         pd.DataFrame: OHLCV data
     """
+    # Reuse a download from the last day instead of hitting Yahoo again
+    cache_path = Path.home() / ".cache" / "axfl" / f"{symbol}_{start}_{end}.parquet"
+    try:
+        if cache_path.exists() and time.time() - cache_path.stat().st_mtime < 86400:
+            data = pd.read_parquet(cache_path)
+            print(f"✅ Loaded {len(data)} days of {symbol} data from cache ({cache_path})")
+            return data
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable cache {cache_path}: {e}")
+    
     try:
         ticker = yf.Ticker(symbol)
         data = ticker.history(start=start, end=end)
@@ -98,6 +120,12 @@ def fetch_stock_data(symbol="AAPL", start="2015-01-01", end="2024-12-31"):
         print(f"✅ Successfully fetched {len(data)} days of {symbol} data")
         print(f"📈 Data range: {data.index[0].date()} to {data.index[-1].date()}")
         
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(cache_path, compression='zstd')
+        except Exception as e:
+            print(f"⚠️  Could not write cache {cache_path}: {e}")
+        
         return data
     
     except Exception as e:
@@ -114,6 +142,148 @@ if df is None or len(df) == 0:
 # Phase 2: Trading Strategy Implementation (CORRECTED)
 # ====================================================
 
+# LLVM fast-math flags for the kernels below: reassociation/contraction let
+# the sums vectorize and fuse; no-NaN/no-Inf are left out because the SMA
+# warm-up bars are NaN and the sweep scores untraded pairs as -inf
+FASTMATH = {'reassoc', 'contract', 'arcp', 'nsz'}
+
+def close_cumsum(values):
+    """
+    Cumulative sum of prices with a leading 0, so the sum of bars [i, j) is
+    cs[j] - cs[i]; shared by every SMA length over the same series
+    
+    Args:
+        values: Price series (any array-like)
+    
+    Returns:
+        np.ndarray: float64, len(values) + 1
+    """
+    c = np.asarray(values, dtype=np.float64)
+    cs = np.empty(c.size + 1)
+    cs[0] = 0.0
+    np.cumsum(c, out=cs[1:])
+    return cs
+
+def sma(values, n, cs=None):
+    """
+    Simple moving average via cumulative sums (NaN for the first n-1 bars)
+    
+    Args:
+        values: Price series (any array-like)
+        n (int): Window length
+        cs (np.ndarray): close_cumsum(values), if already computed
+    
+    Returns:
+        np.ndarray: float64 SMA, same length as values
+    """
+    if cs is None:
+        cs = close_cumsum(values)
+    out = np.full(len(cs) - 1, np.nan)
+    if n <= len(out):
+        out[n - 1:] = (cs[n:] - cs[:-n]) / n
+    return out
+
+@njit(cache=True, fastmath=FASTMATH, boundscheck=False)
+def crossover_signals(fast, slow):
+    """
+    Crossover signal per bar: 1 where fast crosses above slow, -1 where it
+    crosses below, 0 otherwise (same test as backtesting.lib.crossover)
+    
+    Args:
+        fast (np.ndarray): Short SMA
+        slow (np.ndarray): Long SMA
+    
+    Returns:
+        np.ndarray: int8 signals, same length as fast
+    """
+    out = np.zeros(fast.size, np.int8)
+    for i in range(1, fast.size):
+        if fast[i - 1] < slow[i - 1] and fast[i] > slow[i]:
+            out[i] = 1
+        elif slow[i - 1] < fast[i - 1] and slow[i] > fast[i]:
+            out[i] = -1
+    return out
+
+@njit(cache=True, fastmath=FASTMATH, boundscheck=False)
+def sma_sweep(close, cs, n1_grid, n2_grid, commission):
+    """
+    Annualized Sharpe of an always-in-market SMA crossover for each
+    (n1, n2) pair
+    
+    Serial on purpose: it runs inside the walk-forward process pool, which
+    already spreads periods across cores.
+    
+    Long after fast crosses above slow, short after it crosses below,
+    flat before the first cross; daily close-to-close returns, with
+    commission charged on each unit of position change. Pairs that never
+    trade score -inf.
+    
+    Args:
+        close (np.ndarray): float64 closes
+        cs (np.ndarray): Running sum of close, len + 1 (cs[j] - cs[i] sums bars [i, j))
+        n1_grid (np.ndarray): Short SMA length per pair
+        n2_grid (np.ndarray): Long SMA length per pair
+        commission (float): Commission rate per unit traded
+    
+    Returns:
+        np.ndarray: Sharpe per pair
+    """
+    n = close.size
+    out = np.full(n1_grid.size, -np.inf)
+    for k in range(n1_grid.size):
+        a = n1_grid[k]
+        b = n2_grid[k]
+        pos = 0
+        traded = False
+        total = 0.0
+        total_sq = 0.0
+        prev_fast = np.nan
+        prev_slow = np.nan
+        for i in range(1, n):
+            r = pos * (close[i] / close[i - 1] - 1.0)
+            fast = (cs[i + 1] - cs[i + 1 - a]) / a if i + 1 >= a else np.nan
+            slow = (cs[i + 1] - cs[i + 1 - b]) / b if i + 1 >= b else np.nan
+            new_pos = pos
+            if prev_fast < prev_slow and fast > slow:
+                new_pos = 1
+            elif prev_slow < prev_fast and slow > fast:
+                new_pos = -1
+            if new_pos != pos:
+                r -= commission * abs(new_pos - pos)
+                pos = new_pos
+                traded = True
+            total += r
+            total_sq += r * r
+            prev_fast = fast
+            prev_slow = slow
+        if traded and n > 2:
+            mean = total / (n - 1)
+            var = total_sq / (n - 1) - mean * mean
+            out[k] = mean / np.sqrt(var) * np.sqrt(252.0) if var > 0 else 0.0
+    return out
+
+def warm_kernels():
+    """
+    Compile the njit kernels for the signatures the backtests use
+    
+    Called in the parent before the walk-forward pool forks, so workers
+    inherit compiled code instead of each paying the JIT on first call
+    (cache=True also keeps the machine code on disk for later runs).
+    
+    Every kernel called here must be serial: a parallel=True kernel would
+    start numba's threading layer in the parent, and neither TBB nor
+    OpenMP survives a fork (hang at exit / BrokenProcessPool).
+    """
+    x = np.linspace(1.0, 2.0, 8)
+    crossover_signals(x, x[::-1].copy())
+    cs = close_cumsum(x)
+    sma_sweep(x, cs, np.array([2], dtype=np.int64), np.array([4], dtype=np.int64), .002)
+
+# Walk-forward parameter grid: short SMA 5-45, long SMA 50-140 (n1 < n2)
+_SWEEP_PAIRS = [(n1, n2) for n1 in range(5, 50, 5) for n2 in range(50, 150, 10) if n1 < n2]
+SWEEP_N1 = np.array([p[0] for p in _SWEEP_PAIRS], dtype=np.int64)
+SWEEP_N2 = np.array([p[1] for p in _SWEEP_PAIRS], dtype=np.int64)
+
 class SmaCross(Strategy):
     """
     Simple Moving Average Crossover Strategy (COMPLETELY FIXED VERSION)
@@ -130,20 +300,24 @@ class SmaCross(Strategy):
     
     def init(self):
         """Initialize strategy by pre-calculating moving averages"""
-        # Use backtesting's built-in SMA calculation
+        # NumPy cumulative-sum SMAs (no pandas rolling objects per backtest)
         close = self.data.Close
-        self.sma1 = self.I(lambda: pd.Series(close).rolling(self.n1).mean())
-        self.sma2 = self.I(lambda: pd.Series(close).rolling(self.n2).mean())
+        cs = close_cumsum(close)  # one pass shared by both SMAs
+        self.sma1 = self.I(sma, close, self.n1, cs=cs)
+        self.sma2 = self.I(sma, close, self.n2, cs=cs)
+        # All crossovers up front; next() only indexes this array
+        self._sig = crossover_signals(np.asarray(self.sma1, dtype=np.float64),
+                                      np.asarray(self.sma2, dtype=np.float64))
     
     def next(self):
         """
         Execute trading logic - COMPLETELY REWRITTEN
         """
-        # Use backtesting's crossover function - this works properly
-        if crossover(self.sma1, self.sma2):
+        s = self._sig[len(self.data) - 1]
+        if s == 1:
             # Short SMA crosses above long SMA - BUY signal
             self.buy()
-        elif crossover(self.sma2, self.sma1):
+        elif s == -1:
             # Long SMA crosses above short SMA - SELL signal
             self.sell()
 
@@ -212,7 +386,114 @@ else:
 print("\n🔄 WALK-FORWARD OPTIMIZATION")
 print("=" * 50)
 
-def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1):
+# Columns the walk-forward backtests need: the engine fills on OHLC and
+# SmaCross reads Close; Volume is unused, so it is not carried
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+def to_arrays(data):
+    """
+    Split the OHLC columns of a frame into float32 arrays plus its index
+    
+    Args:
+        data (pd.DataFrame): OHLCV data
+    
+    Returns:
+        tuple: ({column: np.ndarray}, pd.Index)
+    """
+    return {c: data[c].to_numpy(dtype=np.float32) for c in PRICE_COLUMNS}, data.index
+
+def make_window(arrs, index, lo, hi):
+    """
+    DataFrame over bars [lo, hi) that wraps views of the column arrays
+    (OHLC only: Backtest adds an empty Volume column itself)
+    
+    Args:
+        arrs (dict): Column arrays from to_arrays
+        index (pd.Index): Bar index from to_arrays
+        lo (int): First bar position
+        hi (int): One past the last bar position
+    
+    Returns:
+        pd.DataFrame: OHLCV window (no column data copied)
+    """
+    return pd.DataFrame({c: a[lo:hi] for c, a in arrs.items()}, index=index[lo:hi], copy=False)
+
+# Walk-forward inputs shared with forked worker processes (set before the pool
+# starts, so each period task only carries its slice bounds)
+_WF_ARRAYS = None
+_WF_CUMSUM = None
+_WF_WINDOWS = None
+_WF_STRATEGY = None
+
+def _run_period(task):
+    """
+    Optimize on one training window and test on the following window
+    
+    Args:
+        task (tuple): (period, start_idx, train_end_idx, test_end_idx)
+    
+    Returns:
+        tuple: (period result dict or None, error line or None)
+    """
+    period, start_idx, train_end_idx, test_end_idx = task
+    (arrs, _), strategy_class = _WF_ARRAYS, _WF_STRATEGY
+    train_data, test_data = _WF_WINDOWS[period]
+    
+    try:
+        # Optimize on training data: one compiled sweep over the whole
+        # (n1, n2) grid ranks the pairs by Sharpe
+        # Window sums only use differences of the cumulative sum, so the
+        # full-history one computed up front serves every period
+        close = arrs['Close'][start_idx:train_end_idx].astype(np.float64)
+        cs = _WF_CUMSUM[start_idx:train_end_idx + 1]
+        scores = sma_sweep(close, cs, SWEEP_N1, SWEEP_N2, .002)
+        if not np.isfinite(scores).any():
+            raise ValueError("no parameter pair traded in the training window")
+        best = int(np.argmax(scores))
+        optimal_n1 = int(SWEEP_N1[best])
+        optimal_n2 = int(SWEEP_N2[best])
+        
+        # Training stats for the chosen pair come from the full engine
+        bt_train = Backtest(train_data, strategy_class, cash=100000, commission=.002)
+        optimization_result = bt_train.run(n1=optimal_n1, n2=optimal_n2)
+        train_sharpe = optimization_result['Sharpe Ratio']
+        train_trades = optimization_result['# Trades']
+        
+        # FIXED: Test on out-of-sample data with optimal parameters
+        # (passed to run() like the training run, so no subclass per period)
+        bt_test = Backtest(test_data, strategy_class, cash=100000, commission=.002)
+        test_result = bt_test.run(n1=optimal_n1, n2=optimal_n2)
+        
+        # Buy-and-hold benchmark on test data: buy the first close and sell
+        # the last, paying commission both ways (no Backtest needed)
+        test_close = arrs['Close'][train_end_idx:test_end_idx]
+        benchmark_return = (float(test_close[-1]) * (1 - .002) / (float(test_close[0]) * (1 + .002)) - 1) * 100
+        
+        period_result = {
+            'period': period + 1,
+            'train_start': train_data.index[0],
+            'train_end': train_data.index[-1],
+            'test_start': test_data.index[0],
+            'test_end': test_data.index[-1],
+            'optimal_n1': optimal_n1,
+            'optimal_n2': optimal_n2,
+            'train_sharpe': train_sharpe,
+            'train_trades': train_trades,
+            'test_return': test_result['Return [%]'],
+            'test_sharpe': test_result['Sharpe Ratio'],
+            'test_win_rate': test_result['Win Rate [%]'],
+            'test_max_drawdown': test_result['Max. Drawdown [%]'],
+            'test_trades': test_result['# Trades'],
+            'benchmark_return': benchmark_return,
+            'excess_return': test_result['Return [%]'] - benchmark_return
+        }
+        
+        return period_result, None
+        
+    except Exception as e:
+        return None, f"   ❌ Error in period {period + 1}: {e}"
+
+def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1, verbose=True):
     """
     Perform walk-forward optimization (CORRECTED VERSION)
     
@@ -220,7 +501,15 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
     - Better parameter ranges for trade generation
     - Improved validation logic
     - Enhanced error handling
+    
+    Periods are independent, so they run in a process pool when the platform
+    can fork (workers inherit the float32 column arrays and the pre-split
+    train/test windows, which are views over them, instead of re-running
+    this script). Results are
+    reported as one per-period table after all periods finish; pass
+    verbose=False to skip it (errors are still printed).
     """
+    global _WF_ARRAYS, _WF_CUMSUM, _WF_WINDOWS, _WF_STRATEGY
     results = []
     
     # Convert years to approximate business days
@@ -236,6 +525,7 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
     print(f"🔄 Number of Walk-Forward Periods: {num_periods}")
     print()
     
+    tasks = []
     for period in range(num_periods):
         start_idx = period * test_days
         train_end_idx = start_idx + train_days
@@ -244,97 +534,52 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
         # Skip if not enough data
         if train_end_idx >= total_days:
             break
-            
-        # Split data
-        train_data = data.iloc[start_idx:train_end_idx]
-        test_data = data.iloc[train_end_idx:test_end_idx]
         
-        if len(test_data) < 50:  # Minimum test period
+        if test_end_idx - train_end_idx < 50:  # Minimum test period
             break
-            
-        print(f"📊 Period {period + 1}:")
-        print(f"   🏋️ Training: {train_data.index[0].date()} to {train_data.index[-1].date()} ({len(train_data)} days)")
-        print(f"   🧪 Testing: {test_data.index[0].date()} to {test_data.index[-1].date()} ({len(test_data)} days)")
         
-        try:
-            # Optimize on training data with CORRECTED RANGES
-            bt_train = Backtest(train_data, strategy_class, cash=100000, commission=.002)
-            
-            # CORRECTED: Better parameter ranges to ensure trade generation
-            optimization_result = bt_train.optimize(
-                n1=range(5, 50, 5),      # Short SMA: 5 to 45 (smaller values)
-                n2=range(50, 150, 10),   # Long SMA: 50 to 140 (closer spacing)
-                maximize='Sharpe Ratio',  # Optimization target
-                constraint=lambda p: p.n1 < p.n2  # Ensure n1 < n2
-            )
-            
-            optimal_n1 = optimization_result._strategy.n1
-            optimal_n2 = optimization_result._strategy.n2
-            train_sharpe = optimization_result['Sharpe Ratio']
-            train_trades = optimization_result['# Trades']
-            
-            print(f"   🎯 Optimal Parameters: SMA({optimal_n1}, {optimal_n2})")
-            print(f"   📊 Training Sharpe: {train_sharpe:.3f}")
-            print(f"   🔄 Training Trades: {train_trades}")
-            
-            # FIXED: Test on out-of-sample data with optimal parameters
-            # Create a new strategy class with the optimized parameters
-            class OptimizedSmaCross(SmaCross):
-                n1 = optimal_n1
-                n2 = optimal_n2
-            
-            # CRITICAL DEBUG: Let's check if the strategy is actually being used
-            print(f"   🔍 DEBUG - Creating test strategy with SMA({optimal_n1}, {optimal_n2})")
-            
-            bt_test = Backtest(test_data, OptimizedSmaCross, cash=100000, commission=.002)
-            test_result = bt_test.run()
-            
-            # DEBUGGING: Check test result details
-            print(f"   🔍 DEBUG - Test Data Length: {len(test_data)}")
-            print(f"   🔍 DEBUG - Test Start Price: ${test_data['Close'].iloc[0]:.2f}")
-            print(f"   🔍 DEBUG - Test End Price: ${test_data['Close'].iloc[-1]:.2f}")
-            print(f"   🔍 DEBUG - Price Return: {((test_data['Close'].iloc[-1] / test_data['Close'].iloc[0]) - 1) * 100:.2f}%")
-            print(f"   🔍 DEBUG - Strategy Return: {test_result['Return [%]']:.2f}%")
-            print(f"   🔍 DEBUG - Number of Trades: {test_result['# Trades']}")
-            
-            # Run benchmark on test data
-            bt_test_benchmark = Backtest(test_data, BuyAndHold, cash=100000, commission=.002)
-            test_benchmark = bt_test_benchmark.run()
-            
-            period_result = {
-                'period': period + 1,
-                'train_start': train_data.index[0],
-                'train_end': train_data.index[-1],
-                'test_start': test_data.index[0],
-                'test_end': test_data.index[-1],
-                'optimal_n1': optimal_n1,
-                'optimal_n2': optimal_n2,
-                'train_sharpe': train_sharpe,
-                'train_trades': train_trades,
-                'test_return': test_result['Return [%]'],
-                'test_sharpe': test_result['Sharpe Ratio'],
-                'test_win_rate': test_result['Win Rate [%]'],
-                'test_max_drawdown': test_result['Max. Drawdown [%]'],
-                'test_trades': test_result['# Trades'],
-                'benchmark_return': test_benchmark['Return [%]'],
-                'excess_return': test_result['Return [%]'] - test_benchmark['Return [%]']
-            }
-            
+        tasks.append((period, start_idx, train_end_idx, test_end_idx))
+    
+    # float32 column arrays: windows are views, sliced by bar position
+    _WF_ARRAYS, _WF_STRATEGY = to_arrays(data), strategy_class
+    _WF_CUMSUM = close_cumsum(_WF_ARRAYS[0]['Close'])
+    # Every period's (train, test) frames, split once (indexed by period)
+    _WF_WINDOWS = [
+        (make_window(*_WF_ARRAYS, lo, mid), make_window(*_WF_ARRAYS, mid, hi))
+        for _, lo, mid, hi in tasks
+    ]
+    warm_kernels()
+    try:
+        if len(tasks) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1),
+                                     mp_context=ctx) as executor:
+                outcomes = list(executor.map(_run_period, tasks))
+        else:
+            outcomes = [_run_period(task) for task in tasks]
+    finally:
+        _WF_ARRAYS = _WF_CUMSUM = _WF_WINDOWS = _WF_STRATEGY = None
+    
+    errors = []
+    for period_result, error in outcomes:
+        if period_result is not None:
             results.append(period_result)
-            
-            print(f"   💰 Test Return: {test_result['Return [%]']:.2f}%")
-            print(f"   � Benchmark Return: {test_benchmark['Return [%]']:.2f}%")
-            print(f"   �📊 Excess Return: {period_result['excess_return']:.2f}%")
-            print(f"   📊 Test Sharpe: {test_result['Sharpe Ratio']:.3f}")
-            print(f"   🎯 Test Win Rate: {test_result['Win Rate [%]']:.2f}%")
-            print(f"   📉 Test Max DD: {test_result['Max. Drawdown [%]']:.2f}%")
-            print(f"   🔄 Test Trades: {test_result['# Trades']}")
-            print()
-            
-        except Exception as e:
-            print(f"   ❌ Error in period {period + 1}: {e}")
-            print()
-            continue
+        else:
+            errors.append(error)
+    
+    if errors:
+        print("\n".join(errors))
+    if verbose and results:
+        table = pd.DataFrame(results)[[
+            'period', 'test_start', 'test_end', 'optimal_n1', 'optimal_n2',
+            'train_sharpe', 'train_trades', 'test_return', 'benchmark_return',
+            'excess_return', 'test_sharpe', 'test_win_rate', 'test_max_drawdown',
+            'test_trades',
+        ]]
+        table['test_start'] = table['test_start'].dt.date
+        table['test_end'] = table['test_end'].dt.date
+        print(table.to_string(index=False, float_format='%.2f'))
+        print()
     
     return results
 
@@ -15,17 +15,27 @@ Usage:
 
 # Phase 1: Setup & Data Fetching
 # ==============================
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 import yfinance as yf
 from backtesting import Backtest, Strategy
-from backtesting.lib import crossover
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional: fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 # Set plotting style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -79,6 +89,31 @@ if df is None or len(df) == 0:
 # Phase 2: Trading Strategy Implementation (FINAL FIXED VERSION)
 # ==============================================================
 
+@njit(cache=True)
+def move_mean(x, n):
+    """
+    Simple moving average in one pass (NaN for the first n-1 bars)
+    
+    Keeps a running window sum: add the new bar, subtract the one that
+    dropped out.
+    
+    Args:
+        x (np.ndarray): float64 prices
+        n (int): Window length
+    
+    Returns:
+        np.ndarray: SMA, same length as x
+    """
+    out = np.full(x.size, np.nan)
+    total = 0.0
+    for i in range(x.size):
+        total += x[i]
+        if i >= n:
+            total -= x[i - n]
+        if i >= n - 1:
+            out[i] = total / n
+    return out
+
 class SmaCross(Strategy):
     """
     Simple Moving Average Crossover Strategy (FINAL FIXED VERSION)
@@ -96,25 +131,95 @@ class SmaCross(Strategy):
     def init(self):
         """Initialize strategy with guaranteed signal generation"""
         # Simple moving averages
-        self.sma_short = self.I(lambda: pd.Series(self.data.Close).rolling(self.n1).mean())
-        self.sma_long = self.I(lambda: pd.Series(self.data.Close).rolling(self.n2).mean())
+        close = np.asarray(self.data.Close, dtype=np.float64)
+        self.sma_short = self.I(move_mean, close, self.n1)
+        self.sma_long = self.I(move_mean, close, self.n2)
     
     def next(self):
         """Execute trading logic with guaranteed trade generation"""
+        # Crossover tests on the last two bars, read straight off the
+        # indicator arrays (same test as backtesting.lib.crossover)
+        a, b = self.sma_short, self.sma_long
+        
         # Buy when short SMA crosses above long SMA
-        if crossover(self.sma_short, self.sma_long):
+        if a[-2] < b[-2] and a[-1] > b[-1]:
             # Close any short position and go long
             if self.position.is_short:
                 self.position.close()
             self.buy()
         
         # Sell when long SMA crosses above short SMA
-        elif crossover(self.sma_long, self.sma_short):
+        elif b[-2] < a[-2] and b[-1] > a[-1]:
             # Close any long position and go short
             if self.position.is_long:
                 self.position.close()
             self.sell()
 
+# Walk-forward parameter grid: short SMA 5-20, long SMA 25-65 (always n1 < n2)
+SWEEP_N1 = (5, 10, 15, 20)
+SWEEP_N2 = (25, 35, 45, 55, 65)
+
+def window_sma(full_sma, n, start, end):
+    """
+    Slice a full-history SMA to [start, end) as if it were computed on the slice
+    
+    The first n-1 bars of the window are reset to NaN so the warm-up matches
+    a rolling mean taken over the window alone.
+    """
+    out = full_sma[start:end].copy()
+    out[:n - 1] = np.nan
+    return out
+
+def sma_crossover_sweep(close, n1_grid=SWEEP_N1, n2_grid=SWEEP_N2, commission=.002, smas=None):
+    """
+    Score every (n1, n2) SmaCross pair on one price window with array ops
+    
+    Mirrors SmaCross: long from a close where the short SMA crosses above
+    the long one, short from a cross below, flat before the first cross.
+    Daily returns are position times the next close-to-close return, minus
+    commission per unit of position change.
+    
+    Args:
+        close (np.ndarray): float64 prices
+        n1_grid (tuple): Short SMA lengths
+        n2_grid (tuple): Long SMA lengths
+        commission (float): Commission rate per unit traded
+        smas (dict): Optional precomputed {length: SMA} for this window
+    
+    Returns:
+        np.ndarray: Annualized Sharpe shaped (len(n1_grid), len(n2_grid)),
+        NaN for pairs that never trade
+    """
+    if smas is None:
+        smas = {w: move_mean(close, w) for w in set(n1_grid) | set(n2_grid)}
+    fast = np.stack([smas[w] for w in n1_grid])[:, None, :]
+    slow = np.stack([smas[w] for w in n2_grid])[None, :, :]
+    d = fast - slow
+    
+    # Cross events on bars 1..T-1 (NaN warm-up compares False, as in next())
+    with np.errstate(invalid='ignore'):
+        up = (d[..., :-1] < 0) & (d[..., 1:] > 0)
+        down = (d[..., :-1] > 0) & (d[..., 1:] < 0)
+    events = np.zeros(d.shape)
+    events[..., 1:] = np.where(up, 1.0, np.where(down, -1.0, 0.0))
+    
+    # Position = most recent event, carried forward
+    t = np.arange(close.size)
+    last = np.maximum.accumulate(np.where(events != 0, t, 0), axis=-1)
+    pos = np.take_along_axis(events, last, axis=-1)
+    
+    # Commission is charged on the bar a position is taken or flipped
+    turnover = np.abs(np.diff(pos, axis=-1, prepend=0.0))
+    step = close[1:] / close[:-1] - 1.0
+    rets = pos[..., :-1] * step - commission * turnover[..., :-1]
+    
+    trades = ((pos != 0) & (turnover > 0)).sum(axis=-1)
+    std = rets.std(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = rets.mean(axis=-1) / std * np.sqrt(252.0)
+    sharpe[(trades == 0) | (std == 0)] = np.nan
+    return sharpe
+
 class BuyAndHold(Strategy):
     """Buy and Hold Benchmark Strategy"""
     def init(self):
@@ -168,6 +273,116 @@ else:
 print("\n🔄 WALK-FORWARD OPTIMIZATION")
 print("=" * 50)
 
+# Walk-forward inputs shared with forked worker processes (set before the pool
+# starts, so each period task only carries its slice bounds)
+_WF_DATA = None
+_WF_CLOSE = None
+_WF_SMAS = None
+_WF_STRATEGY = None
+
+def _run_period(task):
+    """
+    Optimize on one training window and test on the following window
+    
+    Args:
+        task (tuple): (period, start_idx, train_end_idx, test_end_idx)
+    
+    Returns:
+        tuple: (period result dict or None, report lines for this period)
+    """
+    period, start_idx, train_end_idx, test_end_idx = task
+    data, close, strategy_class = _WF_DATA, _WF_CLOSE, _WF_STRATEGY
+    
+    # Split data
+    train_data = data.iloc[start_idx:train_end_idx]
+    test_data = data.iloc[train_end_idx:test_end_idx]
+    
+    lines = [
+        f"📊 Period {period + 1}:",
+        f"   🏋️ Training: {train_data.index[0].date()} to {train_data.index[-1].date()} ({len(train_data)} days)",
+        f"   🧪 Testing: {test_data.index[0].date()} to {test_data.index[-1].date()} ({len(test_data)} days)",
+    ]
+    
+    try:
+        # Optimize on training data with AGGRESSIVE RANGES for trade
+        # generation: the whole grid is scored at once with array ops
+        train_smas = {w: window_sma(sma, w, start_idx, train_end_idx) for w, sma in _WF_SMAS.items()}
+        sharpe = sma_crossover_sweep(close[start_idx:train_end_idx], smas=train_smas)
+        if np.isnan(sharpe).all():
+            raise ValueError("no parameter pair traded in the training window")
+        i, j = np.unravel_index(np.nanargmax(sharpe), sharpe.shape)
+        
+        optimal_n1 = SWEEP_N1[i]
+        optimal_n2 = SWEEP_N2[j]
+        
+        class OptimizedSmaCross(strategy_class):
+            n1 = optimal_n1
+            n2 = optimal_n2
+        
+        # Training stats for the chosen pair come from the full engine, as
+        # Backtest.optimize reported them (closed trades, engine Sharpe)
+        bt_train = Backtest(train_data, OptimizedSmaCross, cash=100000, commission=.002)
+        train_result = bt_train.run()
+        train_sharpe = train_result['Sharpe Ratio']
+        train_trades = train_result['# Trades']
+        
+        lines += [
+            f"   🎯 Optimal Parameters: SMA({optimal_n1}, {optimal_n2})",
+            f"   📊 Training Sharpe: {train_sharpe:.3f}",
+            f"   🔄 Training Trades: {train_trades}",
+        ]
+        
+        # FINAL FIX: Test with the optimized parameters
+        bt_test = Backtest(test_data, OptimizedSmaCross, cash=100000, commission=.002)
+        test_result = bt_test.run()
+        
+        # Buy-and-hold benchmark on test data: buy the first close, sell
+        # the last, commission both ways
+        test_close = close[train_end_idx:test_end_idx]
+        benchmark_return = (test_close[-1] * (1 - .002) / (test_close[0] * (1 + .002)) - 1) * 100
+        
+        lines += [
+            f"   🔍 DEBUG - Test Period Analysis:",
+            f"      📊 Test Trades: {test_result['# Trades']}",
+            f"      💰 Test Return: {test_result['Return [%]']:.2f}%",
+            f"      💰 Benchmark Return: {benchmark_return:.2f}%",
+        ]
+        
+        period_result = {
+            'period': period + 1,
+            'train_start': train_data.index[0],
+            'train_end': train_data.index[-1],
+            'test_start': test_data.index[0],
+            'test_end': test_data.index[-1],
+            'optimal_n1': optimal_n1,
+            'optimal_n2': optimal_n2,
+            'train_sharpe': train_sharpe,
+            'train_trades': train_trades,
+            'test_return': test_result['Return [%]'],
+            'test_sharpe': test_result['Sharpe Ratio'],
+            'test_win_rate': test_result['Win Rate [%]'],
+            'test_max_drawdown': test_result['Max. Drawdown [%]'],
+            'test_trades': test_result['# Trades'],  # FINAL FIX: This should now work
+            'benchmark_return': benchmark_return,
+            'excess_return': test_result['Return [%]'] - benchmark_return
+        }
+        
+        lines += [
+            f"   💰 Test Return: {test_result['Return [%]']:.2f}%",
+            f"   💰 Benchmark Return: {benchmark_return:.2f}%",
+            f"   📊 Excess Return: {period_result['excess_return']:.2f}%",
+            f"   📊 Test Sharpe: {test_result['Sharpe Ratio']:.3f}",
+            f"   🎯 Test Win Rate: {test_result['Win Rate [%]']:.2f}%",
+            f"   📉 Test Max DD: {test_result['Max. Drawdown [%]']:.2f}%",
+            f"   🔄 Test Trades: {test_result['# Trades']}",  # FINAL FIX: Should show actual trades
+            "",
+        ]
+        return period_result, lines
+        
+    except Exception as e:
+        lines += [f"   ❌ Error in period {period + 1}: {e}", ""]
+        return None, lines
+
 def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1):
     """
     Perform walk-forward optimization (FINAL FIXED VERSION)
@@ -176,7 +391,13 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
     - Ensures trades are actually executed in test periods
     - Proper cumulative return calculation
     - Enhanced debugging and validation
+    
+    Periods are independent, so they run in a process pool when the platform
+    can fork (workers inherit the data, close array and SMA cache instead of
+    re-running this script). Each period's report is printed in order as it
+    completes.
     """
+    global _WF_DATA, _WF_CLOSE, _WF_SMAS, _WF_STRATEGY
     results = []
     
     # Convert years to approximate business days
@@ -192,6 +413,7 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
     print(f"🔄 Number of Walk-Forward Periods: {num_periods}")
     print()
     
+    tasks = []
     for period in range(num_periods):
         start_idx = period * test_days
         train_end_idx = start_idx + train_days
@@ -200,90 +422,33 @@ def walk_forward_optimization(data, strategy_class, train_years=3, test_years=1)
         # Skip if not enough data
         if train_end_idx >= total_days:
             break
-            
-        # Split data
-        train_data = data.iloc[start_idx:train_end_idx]
-        test_data = data.iloc[train_end_idx:test_end_idx]
         
-        if len(test_data) < 50:  # Minimum test period
+        if test_end_idx - train_end_idx < 50:  # Minimum test period
             break
-            
-        print(f"📊 Period {period + 1}:")
-        print(f"   🏋️ Training: {train_data.index[0].date()} to {train_data.index[-1].date()} ({len(train_data)} days)")
-        print(f"   🧪 Testing: {test_data.index[0].date()} to {test_data.index[-1].date()} ({len(test_data)} days)")
         
-        try:
-            # Optimize on training data with AGGRESSIVE RANGES for trade generation
-            bt_train = Backtest(train_data, strategy_class, cash=100000, commission=.002)
-            
-            # FINAL FIX: Use smaller, more aggressive parameter ranges
-            optimization_result = bt_train.optimize(
-                n1=range(5, 25, 5),      # Short SMA: 5, 10, 15, 20
-                n2=range(25, 75, 10),    # Long SMA: 25, 35, 45, 55, 65
-                maximize='Sharpe Ratio',  
-                constraint=lambda p: p.n1 < p.n2  
-            )
-            
-            optimal_n1 = optimization_result._strategy.n1
-            optimal_n2 = optimization_result._strategy.n2
-            train_sharpe = optimization_result['Sharpe Ratio']
-            train_trades = optimization_result['# Trades']
-            
-            print(f"   🎯 Optimal Parameters: SMA({optimal_n1}, {optimal_n2})")
-            print(f"   📊 Training Sharpe: {train_sharpe:.3f}")
-            print(f"   🔄 Training Trades: {train_trades}")
-            
-            # FINAL FIX: Test with the optimized parameters
-            class OptimizedSmaCross(SmaCross):
-                n1 = optimal_n1
-                n2 = optimal_n2
-            
-            bt_test = Backtest(test_data, OptimizedSmaCross, cash=100000, commission=.002)
-            test_result = bt_test.run()
-            
-            # Run benchmark on test data
-            bt_test_benchmark = Backtest(test_data, BuyAndHold, cash=100000, commission=.002)
-            test_benchmark = bt_test_benchmark.run()
-            
-            print(f"   🔍 DEBUG - Test Period Analysis:")
-            print(f"      📊 Test Trades: {test_result['# Trades']}")
-            print(f"      💰 Test Return: {test_result['Return [%]']:.2f}%")
-            print(f"      💰 Benchmark Return: {test_benchmark['Return [%]']:.2f}%")
-            
-            period_result = {
-                'period': period + 1,
-                'train_start': train_data.index[0],
-                'train_end': train_data.index[-1],
-                'test_start': test_data.index[0],
-                'test_end': test_data.index[-1],
-                'optimal_n1': optimal_n1,
-                'optimal_n2': optimal_n2,
-                'train_sharpe': train_sharpe,
-                'train_trades': train_trades,
-                'test_return': test_result['Return [%]'],
-                'test_sharpe': test_result['Sharpe Ratio'],
-                'test_win_rate': test_result['Win Rate [%]'],
-                'test_max_drawdown': test_result['Max. Drawdown [%]'],
-                'test_trades': test_result['# Trades'],  # FINAL FIX: This should now work
-                'benchmark_return': test_benchmark['Return [%]'],
-                'excess_return': test_result['Return [%]'] - test_benchmark['Return [%]']
-            }
-            
-            results.append(period_result)
-            
-            print(f"   💰 Test Return: {test_result['Return [%]']:.2f}%")
-            print(f"   💰 Benchmark Return: {test_benchmark['Return [%]']:.2f}%")
-            print(f"   📊 Excess Return: {period_result['excess_return']:.2f}%")
-            print(f"   📊 Test Sharpe: {test_result['Sharpe Ratio']:.3f}")
-            print(f"   🎯 Test Win Rate: {test_result['Win Rate [%]']:.2f}%")
-            print(f"   📉 Test Max DD: {test_result['Max. Drawdown [%]']:.2f}%")
-            print(f"   🔄 Test Trades: {test_result['# Trades']}")  # FINAL FIX: Should show actual trades
-            print()
-            
-        except Exception as e:
-            print(f"   ❌ Error in period {period + 1}: {e}")
-            print()
-            continue
+        tasks.append((period, start_idx, train_end_idx, test_end_idx))
+    
+    _WF_DATA, _WF_STRATEGY = data, strategy_class
+    _WF_CLOSE = data['Close'].to_numpy(dtype=np.float64)
+    # Every grid SMA over the full history, computed once and sliced per period
+    _WF_SMAS = {w: move_mean(_WF_CLOSE, w) for w in set(SWEEP_N1) | set(SWEEP_N2)}
+    try:
+        if len(tasks) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1),
+                                     mp_context=ctx) as executor:
+                for period_result, lines in executor.map(_run_period, tasks):
+                    print("\n".join(lines))
+                    if period_result is not None:
+                        results.append(period_result)
+        else:
+            for task in tasks:
+                period_result, lines = _run_period(task)
+                print("\n".join(lines))
+                if period_result is not None:
+                    results.append(period_result)
+    finally:
+        _WF_DATA = _WF_CLOSE = _WF_SMAS = _WF_STRATEGY = None
     
     # Calculate cumulative return
     if results:
@@ -394,7 +559,7 @@ print(f"⚡ Script execution completed successfully!")
 print(f"\n🔧 FINAL FIXES IMPLEMENTED:")
 print("=" * 50)
 print("1. ✅ COMPLETELY FIXED SMA Crossover Logic:")
-print("   - Simplified strategy using backtesting.lib.crossover")
+print("   - Simplified strategy using direct last-two-bar crossover tests")
 print("   - Aggressive parameter ranges for guaranteed trade generation")
 print("   - Proper position management with close() and buy()/sell()")
 print()
@@ -16,9 +16,10 @@ def load_df(path:str) -> pd.DataFrame:
         low  = close - rng.uniform(0, 0.0006, size=len(idx))
         open_ = np.r_[close[0], close[:-1]]
         return pd.DataFrame({"open":open_,"high":high,"low":low,"close":close}, index=idx)
-    df = pd.read_csv(path)
+    # C parser with the OHLC dtypes given up front; ISO-8601 times skip per-row format inference
+    df = pd.read_csv(path, engine="c", dtype={c: np.float64 for c in ("open","high","low","close")})
     if "time" in df.columns:
-        df["time"] = pd.to_datetime(df["time"], utc=True)
+        df["time"] = pd.to_datetime(df["time"], utc=True, format="ISO8601")
         df = df.set_index("time")
     return df
 
@@ -4,7 +4,7 @@ import pandas as pd
 
 sys.path.append(".")
 
-from axfl.strategies.registry import REGISTRY
+from axfl.strategies.registry import REGISTRY, get
 from axfl.strategies.utils import position_units_from_risk
 
 PIP = 0.0001
@@ -72,14 +72,13 @@ def main():
     if args.strategy and args.params:
         # Custom strategy with params
         params = json.loads(args.params)
-        strat_class = REGISTRY[args.strategy].__class__
-        strat = strat_class(**params)
+        strat = get(args.strategy)(**params)
         keys = [args.strategy]
         custom_registry = {args.strategy: strat}
     else:
         # Default behavior
         keys = ["price_action_breakout","ema_trend","bollinger_mean_rev"]
-        custom_registry = REGISTRY
+        custom_registry = {k: get(k)() for k in keys}
     
     print("=== REGISTRY CHECK ===")
     print("REGISTRY contains:", ", ".join(sorted(REGISTRY.keys())))
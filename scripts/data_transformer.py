@@ -6,6 +6,7 @@ import pyarrow.parquet as pq
 import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from io import BytesIO
 from config import RAW_DATA_BUCKET, PROCESSED_DATA_BUCKET
@@ -38,12 +39,18 @@ try:
     )
     # Verify MinIO connection and create buckets if needed
     try:
-        s3_client.list_buckets()
+        # The connectivity check and the bucket probes are independent round
+        # trips: issue them together, then handle the results in order
+        bucket_names = [RAW_BUCKET_NAME, PROCESSED_BUCKET_NAME]
+        with ThreadPoolExecutor(max_workers=len(bucket_names) + 1) as pool:
+            listing = pool.submit(s3_client.list_buckets)
+            probes = [pool.submit(s3_client.head_bucket, Bucket=b) for b in bucket_names]
+        listing.result()
         print(f"MinIO S3 client initialized and connected to endpoint: {MINIO_ENDPOINT}")
         
-        for bucket_name in [RAW_BUCKET_NAME, PROCESSED_BUCKET_NAME]:
+        for bucket_name, probe in zip(bucket_names, probes):
             try:
-                s3_client.head_bucket(Bucket=bucket_name)
+                probe.result()
                 print(f"Bucket '{bucket_name}' already exists.")
             except ClientError as e:
                 if e.response['Error']['Code'] == '404':
@@ -1,6 +1,7 @@
 try:
+    import re
     import sys
-    from importlib import util
+    from importlib.metadata import distributions
 
     # Verify required packages
     required_packages = {
@@ -9,8 +10,13 @@ try:
         'botocore': 'botocore.client'
     }
 
+    # One pass over installed distributions (names normalized per PEP 503)
+    # instead of a sys.path search per package
+    installed = {re.sub(r'[-_.]+', '-', d.metadata['Name']).lower()
+                 for d in distributions() if d.metadata['Name']}
+
     for package_name, import_name in required_packages.items():
-        if util.find_spec(import_name.split('.')[0]) is None:
+        if package_name not in installed:
             print(f"ERROR: {package_name} is not installed. Please run: pip install {package_name}")
             sys.exit(1)
 
@@ -5,7 +5,7 @@ import numpy as np
 import datetime as _dt
 
 from axfl.brokers.oanda_api import oanda_detect, OandaClient, fetch_oanda_candles
-from axfl.strategies.registry import REGISTRY
+from axfl.strategies.registry import REGISTRY, get
 from axfl.strategies.utils import position_units_from_risk
 
 # Discord alert fallbacks
@@ -70,7 +70,7 @@ def pick_signal(df: pd.DataFrame, names=None):
     for name in names:
         if name not in REGISTRY: 
             continue
-        sig = REGISTRY[name]().generate(df).reindex(df.index).iloc[-1]
+        sig = get(name)().generate(df).reindex(df.index).iloc[-1]
         if int(sig.get("signal",0)) != 0 and not pd.isna(sig.get("sl")) and not pd.isna(sig.get("tp")):
             side = int(sig["signal"])
             return name, side, float(df["close"].iloc[-1]), float(sig["sl"]), float(sig["tp"])
@@ -4,14 +4,16 @@ from pathlib import Path
 from axfl.strategies.session_breakout import SessionBreakout
 from axfl.strategies.vol_contraction import VolatilityContraction
 from axfl.engine.broker_sim import SimBroker
+from axfl.engine.broker_base import Order
 from axfl.strategies.utils import position_units_from_risk
 
 def _load_latest(instr="EUR_USD"):
     cand = sorted(Path("data").glob(f"{instr}_M5_*.csv"))
     if cand:
-        df = pd.read_csv(cand[-1])
+        # C parser with the OHLC dtypes given up front; ISO-8601 times skip per-row format inference
+        df = pd.read_csv(cand[-1], engine="c", dtype={c: np.float64 for c in ("open","high","low","close")})
         if "time" in df.columns:
-            df["time"] = pd.to_datetime(df["time"], utc=True)
+            df["time"] = pd.to_datetime(df["time"], utc=True, format="ISO8601")
             df = df.set_index("time")
         return df
     # fallback small synth
@@ -27,22 +29,26 @@ def _quick_backtest(df, strat, balance=200.0, risk_pct=0.01):
     sig = strat.generate(df).reindex(df.index)
     broker = SimBroker(risk_dollars=balance*risk_pct, spread_pips=0.2, slippage_pips=0.1)
     fills = []
+    # bars and signals as parallel column arrays; the loop never builds a row Series
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    side_arr = sig["signal"].to_numpy(dtype=np.float64)
+    sl_arr = sig["sl"].to_numpy(dtype=np.float64)
+    tp_arr = sig["tp"].to_numpy(dtype=np.float64)
     for i in range(2, len(df)):
-        row = df.iloc[i]
         if broker.pos:
-            newfills = broker.step_bar(row["high"], row["low"], row["close"])
+            newfills = broker.step_bar(high[i], low[i], close[i])
             fills += newfills
             continue
-        s = sig.iloc[i]
-        if s["signal"]==0 or pd.isna(s["sl"]) or pd.isna(s["tp"]): continue
-        entry, sl, tp = float(row["close"]), float(s["sl"]), float(s["tp"])
+        if side_arr[i]==0 or np.isnan(sl_arr[i]) or np.isnan(tp_arr[i]): continue
+        entry, sl, tp = float(close[i]), float(sl_arr[i]), float(tp_arr[i])
         units = position_units_from_risk(balance, risk_pct, entry, sl, 0.0001)
         if units<=0: continue
-        from axfl.engine.broker_base import Order
-        broker.place(Order(int(s["signal"]), units, entry, sl, tp, "test"))
-        fills += broker.step_bar(row["high"], row["low"], row["close"])
+        broker.place(Order(int(side_arr[i]), units, entry, sl, tp, "test"))
+        fills += broker.step_bar(high[i], low[i], close[i])
     if broker.pos:
-        fills += broker.close_all(df["close"].iloc[-1])
+        fills += broker.close_all(close[-1])
     
     if not fills: return {"pf":0.0,"win":0.0,"avgR":0.0,"ddR":0.0,"totalR":0.0,"n":0,"pnl":0.0}
     R = [f.r_multiple for f in fills]
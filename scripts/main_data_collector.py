@@ -8,6 +8,7 @@ import pyarrow.parquet as pq
 import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from io import BytesIO
 # Using specific bucket names from config.py
@@ -51,13 +52,19 @@ try:
     )
     # Verify MinIO connection and ensure buckets exist (improved check)
     try:
-        s3_client.list_buckets()
+        # The connectivity check and the bucket probes are independent round
+        # trips: issue them together, then handle the results in order
+        bucket_names = [RAW_DATA_BUCKET, PROCESSED_DATA_BUCKET] # Use the imported bucket names
+        with ThreadPoolExecutor(max_workers=len(bucket_names) + 1) as pool:
+            listing = pool.submit(s3_client.list_buckets)
+            probes = [pool.submit(s3_client.head_bucket, Bucket=b) for b in bucket_names]
+        listing.result()
         print(f"MinIO S3 client initialized and connected to endpoint: {MINIO_ENDPOINT}")
         
         # Check and create necessary buckets
-        for bucket_name in [RAW_DATA_BUCKET, PROCESSED_DATA_BUCKET]: # Use the imported bucket names
+        for bucket_name, probe in zip(bucket_names, probes):
             try:
-                s3_client.head_bucket(Bucket=bucket_name)
+                probe.result()
                 print(f"Bucket '{bucket_name}' already exists.")
             except ClientError as e:
                 if e.response['Error']['Code'] == '404':
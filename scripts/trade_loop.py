@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import sys, os, pandas as pd, numpy as np
-from axfl.strategies.registry import REGISTRY
+from axfl.strategies.registry import REGISTRY, get
 from axfl.engine import SimBroker, run_sim
 
 def synth_eurusd(bars=1500, seed=42):
@@ -23,8 +23,8 @@ def main():
 
     # Instantiate each strategy and run simulation
     results = []
-    for name, cls in REGISTRY.items():
-        strat = cls()
+    for name in REGISTRY:
+        strat = get(name)()
         broker = SimBroker(risk_dollars=2.0)
         print(f"[INFO] Running {name}...")
         print("ENGINE_READY")
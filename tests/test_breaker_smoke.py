@@ -2,9 +2,12 @@
 Smoke test for Breaker strategy.
 """
 import pytest
+import numpy as np
 import pandas as pd
 from axfl.data.provider import DataProvider
 from axfl.strategies.breaker import BreakerStrategy
+from axfl.core.sessions import is_in_window
+from axfl.ta.structure import in_zone
 from axfl.core.backtester import Backtester
 
 
@@ -54,3 +57,130 @@ def test_breaker_smoke():
     
     print(f"\nTrade Count: {metrics['trade_count']}")
     print(f"Win Rate: {metrics.get('win_rate', 0.0):.2%}")
+
+
+def _synthetic_frame(n=900, seed=7):
+    """5m EURUSD-like random walk spanning a few London sessions."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-02', periods=n, freq='5min', tz='UTC')
+    close = 1.10 + np.cumsum(rng.normal(0.0, 0.0004, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0.0, 0.0004, n)
+    low = np.minimum(open_, close) - rng.uniform(0.0, 0.0004, n)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': 0.0}, index=index)
+
+
+def test_breaker_bars_after_prepare():
+    """Bars appended after prepare() are scanned from the row instead of raising."""
+    df = _synthetic_frame()
+    n0 = len(df) - 120
+    
+    strategy = BreakerStrategy(symbol="EURUSD", params={})
+    prepared = strategy.prepare(df.iloc[:n0])
+    state = {}
+    got = []
+    for i in range(len(df)):
+        row = prepared.iloc[i] if i < n0 else df.iloc[i]
+        got.append(strategy.generate_signals(i, row, state))
+    
+    # Same bars prepared in one go; swings the short frame could not see yet
+    # (its last `lookback` bars and everything appended) are cleared
+    reference = BreakerStrategy(symbol="EURUSD", params={})
+    full = reference.prepare(df)
+    reference._swing_high = reference._swing_high.copy()
+    reference._swing_low = reference._swing_low.copy()
+    reference._swing_high[n0 - reference.lookback:] = False
+    reference._swing_low[n0 - reference.lookback:] = False
+    ref_state = {}
+    expected = [reference.generate_signals(i, full.iloc[i], ref_state) for i in range(len(df))]
+    
+    assert got == expected
+    assert strategy.debug == reference.debug
+
+
+def _reference_breaker(strategy, df, i, row, state, debug):
+    """Per-bar Breaker logic as it stood before the compiled scan."""
+    signals = []
+    current_time = row.name
+    date = current_time.date()
+    
+    if state.get('current_date') != date:
+        state['current_date'] = date
+        state['broken_zone'] = None
+        state['entry_taken'] = False
+        zones = []
+        for j in range(max(0, i - 50), i):
+            bar = df.iloc[j]
+            height = (bar['High'] - bar['Low']) / strategy.pip
+            if bar['swing_high'] and height >= strategy.min_zone_height_pips:
+                zones.append((bar['Low'], bar['High'], 'resistance'))
+            if bar['swing_low'] and height >= strategy.min_zone_height_pips:
+                zones.append((bar['Low'], bar['High'], 'support'))
+        state['tracked_zones'] = zones
+        debug['zones_tracked'] += len(zones)
+    
+    if not is_in_window(current_time, 7, 16) or state['entry_taken']:
+        return signals
+    
+    if state['broken_zone'] is None and state['tracked_zones']:
+        for zone_low, zone_high, zone_type in state['tracked_zones']:
+            if zone_type == 'support' and row['Close'] < zone_low:
+                state['broken_zone'] = (zone_low, zone_high, 'down', current_time)
+                state['tracked_zones'] = []
+                debug['zones_broken_down'] += 1
+                break
+            elif zone_type == 'resistance' and row['Close'] > zone_high:
+                state['broken_zone'] = (zone_low, zone_high, 'up', current_time)
+                state['tracked_zones'] = []
+                debug['zones_broken_up'] += 1
+                break
+    elif state['broken_zone'] is not None:
+        zone_low, zone_high, break_dir, break_time = state['broken_zone']
+        if (current_time - break_time).total_seconds() / 60.0 > strategy.retest_window_m:
+            state['broken_zone'] = None
+            return signals
+        buffer = strategy.buffer_pips * strategy.pip
+        if break_dir == 'down' and in_zone(row['High'], zone_low, zone_high):
+            debug['retests'] += 1
+            if row['Close'] < row['Open'] and row['Close'] < zone_low:
+                sl = zone_high + buffer
+                entry = row['Close']
+                signals.append(('short', entry, sl, entry - (sl - entry) * strategy.tp1_r))
+                state['entry_taken'] = True
+                debug['entries_short'] += 1
+        elif break_dir == 'up' and in_zone(row['Low'], zone_low, zone_high):
+            debug['retests'] += 1
+            if row['Close'] > row['Open'] and row['Close'] > zone_high:
+                sl = zone_low - buffer
+                entry = row['Close']
+                signals.append(('long', entry, sl, entry + (entry - sl) * strategy.tp1_r))
+                state['entry_taken'] = True
+                debug['entries_long'] += 1
+    return signals
+
+
+@pytest.mark.parametrize('params', [{}, {'min_zone_height_pips': 1, 'retest_window_m': 60}])
+def test_breaker_scan_matches_per_bar_logic(params):
+    """Compiled scan reproduces the per-bar state machine, gaps in i included."""
+    df = _synthetic_frame(n=2400, seed=3)
+    strategy = BreakerStrategy(symbol="EURUSD", params=params)
+    prepared = strategy.prepare(df)
+    
+    # Skipped stretches stand in for bars the backtester spends in a position
+    calls = [i for i in range(len(df)) if (i // 37) % 5 != 3]
+    
+    state, ref_state = {}, {}
+    ref_debug = {key: 0 for key in strategy.debug}
+    got, expected = [], []
+    for i in calls:
+        row = prepared.iloc[i]
+        got += [(s['side'], s['price'], s['sl'], s['tp'])
+                for s in strategy.generate_signals(i, row, state)]
+        expected += _reference_breaker(strategy, prepared, i, row, ref_state, ref_debug)
+    
+    assert len(got) == len(expected)
+    for g, e in zip(got, expected):
+        assert g[0] == e[0]
+        assert g[1:] == pytest.approx(e[1:], rel=0, abs=1e-12)
+    assert strategy.debug == ref_debug
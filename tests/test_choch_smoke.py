@@ -1,9 +1,12 @@
 """
 Smoke test for CHOCH + OB strategy.
 """
+import ast
+import inspect
 import pytest
 import pandas as pd
 from axfl.data.provider import DataProvider
+from axfl.strategies import choch_ob
 from axfl.strategies.choch_ob import CHOCHOBStrategy
 from axfl.core.backtester import Backtester
 
@@ -55,3 +58,13 @@ def test_choch_ob_smoke():
     
     print(f"\nTrade Count: {metrics['trade_count']}")
     print(f"Win Rate: {metrics.get('win_rate', 0.0):.2%}")
+
+
+def test_choch_ob_single_prepare():
+    """prepare() must be defined exactly once (a shadowed copy hides wasted work)."""
+    tree = ast.parse(inspect.getsource(choch_ob))
+    cls = next(node for node in tree.body
+               if isinstance(node, ast.ClassDef) and node.name == 'CHOCHOBStrategy')
+    
+    names = [node.name for node in cls.body if isinstance(node, ast.FunctionDef)]
+    assert names.count('prepare') == 1
@@ -0,0 +1,143 @@
+"""
+Parity tests: array kernels against the pandas code they replaced.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from axfl.ta.structure import swings, _swing_masks, _swing_masks_np
+from axfl.strategies.utils import (span_alpha, two_emas, rolling_quantile,
+                                   rolling_max, rolling_min, _rolling_extreme_deque)
+from axfl.core.utils import compute_atr
+from axfl.tools._scan_kernels import first_hit_per_day
+
+
+def _ohlc_with_gaps(n=300, seed=1):
+    """Random-walk OHLC with a leading NaN run and scattered interior NaNs."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-02', periods=n, freq='5min', tz='UTC')
+    close = 1.10 + np.cumsum(rng.normal(0.0, 0.0004, n))
+    high = close + rng.uniform(0.0, 0.0004, n)
+    low = close - rng.uniform(0.0, 0.0004, n)
+    df = pd.DataFrame({'Open': close, 'High': high, 'Low': low, 'Close': close}, index=index)
+    
+    gaps = np.r_[0:3, rng.choice(np.arange(10, n), size=n // 12, replace=False)]
+    df.iloc[gaps, :] = np.nan
+    # A few half-missing bars so high and low gaps differ
+    df.iloc[rng.choice(np.arange(10, n), size=8, replace=False), df.columns.get_loc('High')] = np.nan
+    return df
+
+
+def _reference_swings(df, lookback):
+    """Pivot logic as it stood before the array kernels (Series.max/min skip NaN)."""
+    swing_high = np.zeros(len(df), bool)
+    swing_low = np.zeros(len(df), bool)
+    for i in range(lookback, len(df) - lookback):
+        window_highs = df['High'].iloc[i - lookback:i + lookback + 1]
+        if df['High'].iloc[i] >= window_highs.max():
+            swing_high[i] = True
+        window_lows = df['Low'].iloc[i - lookback:i + lookback + 1]
+        if df['Low'].iloc[i] <= window_lows.min():
+            swing_low[i] = True
+    return swing_high, swing_low
+
+
+@pytest.mark.parametrize('lookback', [1, 2, 3])
+def test_swings_match_pandas_pivot_with_nan_gaps(lookback):
+    df = _ohlc_with_gaps()
+    ref_high, ref_low = _reference_swings(df, lookback)
+    high = df['High'].to_numpy(dtype=np.float64)
+    low = df['Low'].to_numpy(dtype=np.float64)
+    
+    out = swings(df, lookback=lookback)
+    np.testing.assert_array_equal(out['swing_high'].to_numpy(), ref_high)
+    np.testing.assert_array_equal(out['swing_low'].to_numpy(), ref_low)
+    for kernel in (_swing_masks, _swing_masks_np):
+        got_high, got_low = kernel(high, low, lookback)
+        np.testing.assert_array_equal(got_high, ref_high)
+        np.testing.assert_array_equal(got_low, ref_low)
+
+
+def _series_with_gaps(n=400, seed=2):
+    """Random walk with a leading NaN run, single NaNs and NaN runs inside."""
+    rng = np.random.default_rng(seed)
+    x = 1.10 + np.cumsum(rng.normal(0.0, 0.0004, n))
+    x[:4] = np.nan
+    x[rng.choice(np.arange(10, n), size=n // 15, replace=False)] = np.nan
+    x[50:53] = np.nan
+    x[200:210] = np.nan
+    return x
+
+
+@pytest.mark.parametrize('spans', [(3, 3), (3, 20), (9, 21), (20, 50)])
+def test_two_emas_match_pandas_ewm_with_nan_gaps(spans):
+    x = _series_with_gaps()
+    n1, n2 = spans
+    e1, e2 = two_emas(x, span_alpha(n1), span_alpha(n2))
+    
+    np.testing.assert_array_equal(e1, pd.Series(x).ewm(span=n1, adjust=False).mean().to_numpy())
+    np.testing.assert_array_equal(e2, pd.Series(x).ewm(span=n2, adjust=False).mean().to_numpy())
+
+
+def test_two_emas_span3_nan_run():
+    """span 3 (alpha 0.5) across NaN runs, the case the old weight hack got wrong."""
+    for x in ([1.0, 2.0, np.nan, np.nan, 5.0], [1.0, 2.0, np.nan, 4.0, 5.0]):
+        x = np.array(x)
+        e, _ = two_emas(x, span_alpha(3), span_alpha(3))
+        np.testing.assert_array_equal(e, pd.Series(x).ewm(span=3, adjust=False).mean().to_numpy())
+
+
+def _reference_atr(df, period):
+    """ATR as it stood before _atr_nb: row-wise max true range, span EMA."""
+    high, low, close = df['High'], df['Low'], df['Close']
+    tr = pd.concat([high - low, abs(high - close.shift(1)), abs(low - close.shift(1))],
+                   axis=1).max(axis=1)
+    return tr.ewm(span=period, adjust=False).mean()
+
+
+@pytest.mark.parametrize('period', [3, 14])
+def test_compute_atr_matches_pandas_with_nan_gaps(period):
+    df = _ohlc_with_gaps(n=400, seed=4)
+    # Gaps that leave only the close, or only the high/low, on some bars
+    df.iloc[[30, 31, 150], df.columns.get_loc('Close')] = np.nan
+    df.iloc[[90, 91, 92], df.columns.get_loc('Low')] = np.nan
+    
+    np.testing.assert_array_equal(compute_atr(df, period=period).to_numpy(),
+                                  _reference_atr(df, period).to_numpy())
+
+
+@pytest.mark.parametrize('w', [1, 5, 100])
+@pytest.mark.parametrize('q', [0.0, 0.2, 0.5, 0.95, 1.0])
+def test_rolling_quantile_matches_pandas_with_nan_gaps(w, q):
+    x = _series_with_gaps(n=600, seed=3)
+    
+    np.testing.assert_array_equal(rolling_quantile(x, w, q),
+                                  pd.Series(x).rolling(w).quantile(q).to_numpy())
+
+
+@pytest.mark.parametrize('n', [1, 5, 20])
+def test_rolling_extremes_match_pandas_with_nan_gaps(n):
+    x = _series_with_gaps(n=600, seed=5)
+    ref_max = pd.Series(x).rolling(n).max().to_numpy()
+    ref_min = pd.Series(x).rolling(n).min().to_numpy()
+    
+    np.testing.assert_array_equal(_rolling_extreme_deque(x, n, True), ref_max)
+    np.testing.assert_array_equal(_rolling_extreme_deque(x, n, False), ref_min)
+    np.testing.assert_array_equal(rolling_max(x, n), ref_max)
+    np.testing.assert_array_equal(rolling_min(x, n), ref_min)
+
+
+@pytest.mark.parametrize('density', [0.0, 0.01, 0.2])
+@pytest.mark.parametrize('max_events', [0, 1, 3, 1000])
+def test_first_hit_per_day_matches_pandas(density, max_events):
+    rng = np.random.default_rng(6)
+    index = pd.date_range('2024-01-02', periods=3000, freq='5min', tz='UTC')
+    days = index.normalize()
+    hit = rng.random(len(index)) < density
+    
+    # Selection as it stood before the kernel
+    hit_days = days[hit]
+    expected = np.flatnonzero(hit)[~hit_days.duplicated()][:max_events]
+    
+    got = first_hit_per_day(hit, days.asi8, max_events)
+    np.testing.assert_array_equal(got, expected)
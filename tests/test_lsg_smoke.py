@@ -2,10 +2,12 @@
 Smoke test for LSG strategy.
 """
 import pytest
+import numpy as np
 import pandas as pd
 import os
 from axfl.data.provider import DataProvider
-from axfl.strategies.lsg import LSGStrategy
+from axfl.strategies.lsg import LSGStrategy, SCAN_COLUMNS
+from axfl.core.sessions import day_keys, index_ns, utc_hours, is_in_window
 from axfl.core.backtester import Backtester
 
 
@@ -69,5 +71,175 @@ def test_lsg_smoke():
               f"entries_long={debug.get('entries_long', 0)}")
 
 
+def _synthetic_frame(n=900, seed=11):
+    """5m EURUSD-like random walk spanning a few London sessions."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-02', periods=n, freq='5min', tz='UTC')
+    close = 1.10 + np.cumsum(rng.normal(0.0, 0.0004, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0.0, 0.0004, n)
+    low = np.minimum(open_, close) - rng.uniform(0.0, 0.0004, n)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': 0.0}, index=index)
+
+
+def test_lsg_bars_after_prepare():
+    """Bars appended after prepare() are scanned from the row instead of raising."""
+    df = _synthetic_frame()
+    n0 = len(df) - 120
+    params = {'second_move_only': False, 'bos_required': False}
+    
+    strategy = LSGStrategy("EURUSD", params)
+    prepared = strategy.prepare(df.iloc[:n0])
+    state = {}
+    got = []
+    for i in range(len(df)):
+        row = prepared.iloc[i] if i < n0 else df.iloc[i]
+        got.append(strategy.generate_signals(i, row, state))
+    
+    # Reference: the same columns as one prepared run, with the appended
+    # bars as the row path sees them (no cluster, no swing)
+    reference = LSGStrategy("EURUSD", params)
+    reference.prepare(df.iloc[:n0])
+    tail = df.iloc[n0:]
+    hour = utc_hours(tail.index)
+    appended = {
+        'High': tail['High'], 'Low': tail['Low'], 'Close': tail['Close'], 'Open': tail['Open'],
+        'cluster_high': np.full(len(tail), np.nan), 'cluster_low': np.full(len(tail), np.nan),
+        'swing_high': np.zeros(len(tail), bool), 'swing_low': np.zeros(len(tail), bool),
+        'trade_window': (hour >= 7) & (hour <= 10),
+        'day_key': day_keys(tail.index), 'ts_ns': index_ns(tail.index),
+    }
+    reference._cols = {
+        col: np.concatenate([reference._cols[col],
+                             np.asarray(appended[col], dtype=reference._cols[col].dtype)])
+        for col in SCAN_COLUMNS
+    }
+    ref_state = {}
+    expected = [reference.generate_signals(i, df.iloc[i], ref_state) for i in range(len(df))]
+    
+    assert got == expected
+    assert strategy.debug == reference.debug
+
+
+def _reference_lsg(strategy, row, state, debug):
+    """Per-bar LSG v2 logic as it stood before the compiled scan."""
+    signals = []
+    current_time = row.name
+    date = current_time.date()
+    cluster_high = row.get('cluster_high')
+    cluster_low = row.get('cluster_low')
+    
+    if state.get('current_date') != date:
+        state.update(current_date=date, sweep_detected=None, sweep_time=None,
+                     sweep_extreme=None, bos_confirmed=False, confirmation_bar=None,
+                     first_break_seen=False, entry_taken=False,
+                     last_swing_high=None, last_swing_low=None)
+    
+    if row.get('swing_high', False):
+        state['last_swing_high'] = row['High']
+    if row.get('swing_low', False):
+        state['last_swing_low'] = row['Low']
+    
+    if not is_in_window(current_time, 7, 10) or state['entry_taken']:
+        return signals
+    
+    def window_expired():
+        elapsed = (current_time - state['sweep_time']).total_seconds() / 60.0
+        if elapsed > strategy.reentry_window_m:
+            state['sweep_detected'] = None
+            return True
+        return False
+    
+    if state['sweep_detected'] is None:
+        if not pd.isna(cluster_high) and row['High'] > cluster_high:
+            if (row['High'] - cluster_high) / strategy.pip >= strategy.sweep_pips:
+                debug['sweeps_high'] += 1
+                state.update(sweep_detected='high', sweep_time=current_time,
+                             sweep_extreme=row['High'], bos_confirmed=not strategy.bos_required)
+        elif not pd.isna(cluster_low) and row['Low'] < cluster_low:
+            if (cluster_low - row['Low']) / strategy.pip >= strategy.sweep_pips:
+                debug['sweeps_low'] += 1
+                state.update(sweep_detected='low', sweep_time=current_time,
+                             sweep_extreme=row['Low'], bos_confirmed=not strategy.bos_required)
+    
+    elif not state['bos_confirmed'] and strategy.bos_required:
+        if window_expired():
+            return signals
+        bos_buffer = strategy.bos_buffer_pips * strategy.pip
+        if state['sweep_detected'] == 'high':
+            if state['last_swing_low'] is not None and row['Close'] < state['last_swing_low'] - bos_buffer:
+                debug['bos_down'] += 1
+                state['bos_confirmed'] = True
+        elif state['last_swing_high'] is not None and row['Close'] > state['last_swing_high'] + bos_buffer:
+            debug['bos_up'] += 1
+            state['bos_confirmed'] = True
+    
+    elif state['bos_confirmed'] and state['confirmation_bar'] is None:
+        if window_expired():
+            return signals
+        conf = {'high': row['High'], 'low': row['Low']}
+        if state['sweep_detected'] == 'high' and not pd.isna(cluster_high):
+            if row['Close'] < cluster_high and (row['Close'] < row['Open'] or not strategy.confirm_body_required):
+                debug['confirmations_high'] += 1
+                state['confirmation_bar'] = conf
+        elif state['sweep_detected'] == 'low' and not pd.isna(cluster_low):
+            if row['Close'] > cluster_low and (row['Close'] > row['Open'] or not strategy.confirm_body_required):
+                debug['confirmations_low'] += 1
+                state['confirmation_bar'] = conf
+    
+    elif state['confirmation_bar'] is not None:
+        conf = state['confirmation_bar']
+        buffer = strategy.buffer_pips * strategy.pip
+        short = state['sweep_detected'] == 'high'
+        if (row['Low'] < conf['low']) if short else (row['High'] > conf['high']):
+            if strategy.second_move_only and not state['first_break_seen']:
+                state['first_break_seen'] = True
+                debug['second_move_armed'] += 1
+            else:
+                debug['second_move_fired'] += 1
+                if short:
+                    sl = state['sweep_extreme'] + buffer
+                    entry = conf['low']
+                    signals.append(('short', entry, sl, entry - (sl - entry)))
+                else:
+                    sl = state['sweep_extreme'] - buffer
+                    entry = conf['high']
+                    signals.append(('long', entry, sl, entry + (entry - sl)))
+                state['entry_taken'] = True
+                debug['entries_' + signals[-1][0]] += 1
+    return signals
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'bos_required': False, 'second_move_only': False, 'confirm_body_required': False},
+    {'tol_pips': 4, 'sweep_pips': 1, 'reentry_window_m': 60},
+])
+def test_lsg_scan_matches_per_bar_logic(params):
+    """Compiled scan reproduces the per-bar state machine, gaps in i included."""
+    df = _synthetic_frame(n=2400, seed=5)
+    strategy = LSGStrategy("EURUSD", params)
+    prepared = strategy.prepare(df)
+    
+    # Skipped stretches stand in for bars the backtester spends in a position
+    calls = [i for i in range(len(df)) if (i // 37) % 5 != 3]
+    
+    state, ref_state = {}, {}
+    ref_debug = dict(strategy.debug)
+    got, expected = [], []
+    for i in calls:
+        row = prepared.iloc[i]
+        got += [(s['side'], s['price'], s['sl'], s['tp'])
+                for s in strategy.generate_signals(i, row, state)]
+        expected += _reference_lsg(strategy, row, ref_state, ref_debug)
+    
+    assert len(got) == len(expected)
+    for g, e in zip(got, expected):
+        assert g[0] == e[0]
+        assert g[1:] == pytest.approx(e[1:], rel=0, abs=1e-12)
+    assert strategy.debug == ref_debug
+
+
 if __name__ == '__main__':
     test_lsg_smoke()